@@ -0,0 +1,299 @@
+"""Benchmarks for the `uncertainty` module.
+
+Measures:
+- the cost of each operation of `CoherentUncertainty`,
+  `IncoherentUncertainty` and `GeneralUncertainty`
+- `FileHandler.load`/`save` throughput on synthetic .csv files
+- the cost of `GeneralUncertainty.estimateUncertainty` for increasing numbers
+  of inputs
+- the time to import the package and its submodules, in fresh interpreters
+
+Results are written as JSON, so that runs (e.g. before and after a change, or
+of two releases) can be compared with `--compare`.
+
+Examples
+--------
+Run from the repository root (the checked out `src` is benchmarked, rather
+than any installed copy):
+	python benchmarks/benchmarkUncertainty.py --output new.json
+	python benchmarks/benchmarkUncertainty.py --rows 1000 10000000 --only fileHandler
+	python benchmarks/benchmarkUncertainty.py --output new.json --compare old.json
+"""
+
+
+
+################################### MODULES ###################################
+import argparse
+import datetime
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+import warnings
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC)
+import numpy as np
+import pandas as pd
+from pythonutils import uncertainty as unc
+
+
+
+################################## CONSTANTS ##################################
+BENCHMARKS = ('operations', 'fileHandler', 'estimateUncertainty', 'importTime')
+IMPORTS = ('pythonutils', 'pythonutils.intmath', 'pythonutils.io', 'pythonutils.uncertainty',
+		   'pythonutils.uncertaintyPandas')
+OPERATIONS = {
+	'add': lambda x, y: x + y,
+	'sub': lambda x, y: x - y,
+	'mul': lambda x, y: x * y,
+	'truediv': lambda x, y: x / y,
+	'pow': lambda x, y: x ** y,
+	'neg': lambda x, y: -x,
+}
+
+
+
+################################## FUNCTIONS ##################################
+def _bestTime(f, repeat):
+	"""Return the best time of `repeat` single calls of `f`, in seconds."""
+	times = []
+	for _ in range(repeat):
+		start = time.perf_counter()
+		f()
+		times.append(time.perf_counter() - start)
+	return min(times)
+
+def _estimateFunction(*params):
+	"""Smooth, non-monotonic function of any number of parameters, for
+	`benchmarkEstimateUncertainty`."""
+	return math.sin(params[0]) + math.fsum(p * p for p in params[1:])
+
+def _perCallTime(f, repeat):
+	"""Return the best time per call of `f` over `repeat` runs, in seconds.
+	Each run calls `f` enough times to take at least 0.2s."""
+	timer = timeit.Timer(f)
+	number, _ = timer.autorange()
+	return min(timer.repeat(repeat, number)) / number
+
+def benchmarkEstimateUncertainty(inputCounts, repeat = 3, precision = 3):
+	"""Time `GeneralUncertainty.estimateUncertainty` for each number of
+	inputs.
+
+	Returns
+	-------
+	:obj:`list` of :obj:`dict`
+
+	"""
+	results = []
+	cache, unc.GeneralUncertainty.estimateCache = unc.GeneralUncertainty.estimateCache, None
+	try:
+		for n in inputCounts:
+			measurements = [unc.GeneralUncertainty(1 + i/10, (0.05, 0.1)) for i in range(n)]
+			for corners in (False, True):
+				seconds = _bestTime(lambda: unc.GeneralUncertainty.estimateUncertainty(
+					_estimateFunction, measurements, precision, test_domain_corners=corners), repeat)
+				results.append({'inputs': n, 'precision': precision, 'testDomainCorners': corners, 'seconds': seconds})
+	finally:
+		unc.GeneralUncertainty.estimateCache = cache
+	return results
+
+def benchmarkFileHandler(rowCounts, repeat = 3, nVariables = 3, directory = None):
+	"""Time `FileHandler.load` and `FileHandler.save` on synthetic files of
+	each number of rows.
+
+	Returns
+	-------
+	:obj:`list` of :obj:`dict`
+
+	"""
+	results = []
+	with tempfile.TemporaryDirectory(dir=directory) as tmp:
+		inFilePath = os.path.join(tmp, 'in.csv')
+		outFilePath = os.path.join(tmp, 'out.csv')
+		for nRows in rowCounts:
+			writeSyntheticCsv(inFilePath, nRows, nVariables)
+			size = os.path.getsize(inFilePath)
+			loadSeconds = _bestTime(lambda: unc.FileHandler.load(inFilePath, 1), repeat)
+			data, extra_info = unc.FileHandler.load(inFilePath, 1)
+			saveSeconds = _bestTime(lambda: unc.FileHandler.save(outFilePath, data, extra_info), repeat)
+			del data
+			results.append({
+				'rows': nRows, 'variables': nVariables, 'bytes': size,
+				'loadSeconds': loadSeconds, 'loadRowsPerSecond': nRows / loadSeconds,
+				'saveSeconds': saveSeconds, 'saveRowsPerSecond': nRows / saveSeconds,
+			})
+	return results
+
+def benchmarkImportTime(modules = IMPORTS, repeat = 5):
+	"""Time importing each of `modules` in a fresh interpreter (so nothing
+	is already imported).
+
+	Returns
+	-------
+	:obj:`dict` of :obj:`str` to :obj:`float`
+		`{module: bestSeconds}`
+
+	"""
+	env = dict(os.environ)
+	env['PYTHONPATH'] = os.pathsep.join([SRC] + ([env['PYTHONPATH']] if env.get('PYTHONPATH') else []))
+	code = "import time; t = time.perf_counter(); import {}; print(time.perf_counter() - t)"
+	results = {}
+	for module in modules:
+		times = []
+		for _ in range(repeat):
+			out = subprocess.run([sys.executable, '-c', code.format(module)], env=env, check=True,
+								 capture_output=True, text=True)
+			times.append(float(out.stdout))
+		results[module] = min(times)
+	return results
+
+def benchmarkOperations(repeat = 5):
+	"""Time each operation between two scalar measurements of each class.
+
+	Returns
+	-------
+	:obj:`dict` of :obj:`str` to :obj:`dict`
+		`{className: {operation: secondsPerCall}}`
+
+	"""
+	pairs = {
+		'CoherentUncertainty': (unc.CoherentUncertainty(2.5, 0.1), unc.CoherentUncertainty(1.5, 0.2)),
+		'IncoherentUncertainty': (unc.IncoherentUncertainty(2.5, 0.1), unc.IncoherentUncertainty(1.5, 0.2)),
+		'GeneralUncertainty': (unc.GeneralUncertainty(2.5, (0.1, 0.2)), unc.GeneralUncertainty(1.5, (0.2, 0.1))),
+	}
+	results = {}
+	with warnings.catch_warnings():
+		warnings.simplefilter('ignore')
+		for (name, (x, y)) in pairs.items():
+			results[name] = {op: _perCallTime(lambda: f(x, y), repeat) for (op, f) in OPERATIONS.items()}
+	return results
+
+def compareResults(old, new, threshold = 1.1):
+	"""Return a description of every timing in `new` that is more than
+	`threshold` times slower than in `old`.
+
+	Parameters
+	----------
+	old, new : dict
+		As written by `main`.
+	threshold : :obj:`float`, optional
+		Default `1.1`.
+
+	Returns
+	-------
+	:obj:`list` of :obj:`str`
+
+	"""
+	def timings(results):
+		flat = {}
+		for (name, ops) in results.get('operations', {}).items():
+			for (op, seconds) in ops.items():
+				flat['operations.{0}.{1}'.format(name, op)] = seconds
+		for r in results.get('fileHandler', []):
+			flat['fileHandler.load.{}'.format(r['rows'])] = r['loadSeconds']
+			flat['fileHandler.save.{}'.format(r['rows'])] = r['saveSeconds']
+		for r in results.get('estimateUncertainty', []):
+			flat['estimateUncertainty.{0}.{1}'.format(r['inputs'], 'corners' if r['testDomainCorners'] else 'centre')] = r['seconds']
+		for (module, seconds) in results.get('importTime', {}).items():
+			flat['importTime.{}'.format(module)] = seconds
+		return flat
+
+	oldTimings, newTimings = timings(old), timings(new)
+	regressions = []
+	for (key, seconds) in newTimings.items():
+		if key in oldTimings and seconds > threshold * oldTimings[key]:
+			regressions.append("{0}: {1:.3g}s -> {2:.3g}s ({3:.2f}x)".format(key, oldTimings[key], seconds, seconds / oldTimings[key]))
+	return regressions
+
+def environment():
+	"""Return a description of the versions and machine being benchmarked.
+
+	Returns
+	-------
+	dict
+
+	"""
+	return {
+		'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+		'uncertaintyVersion': unc.__version__,
+		'python': platform.python_version(),
+		'numpy': np.__version__,
+		'pandas': pd.__version__,
+		'platform': platform.platform(),
+		'processor': platform.processor(),
+		'cpuCount': os.cpu_count(),
+	}
+
+def main(argv = None):
+	parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+	parser.add_argument('--output', '-o', help="JSON file to write the results to (default: stdout)")
+	parser.add_argument('--only', nargs='+', choices=BENCHMARKS, default=BENCHMARKS,
+						help="benchmarks to run (default: all)")
+	parser.add_argument('--rows', nargs='+', type=int, default=[10**3, 10**4, 10**5],
+						help="row counts of the FileHandler benchmark (up to 10**7 is sensible)")
+	parser.add_argument('--inputs', nargs='+', type=int, default=[1, 2, 3, 4],
+						help="input counts of the estimateUncertainty benchmark")
+	parser.add_argument('--repeat', type=int, default=3,
+						help="repeats of each measurement, of which the best is kept (default: 3)")
+	parser.add_argument('--tmpdir', help="directory for the synthetic .csv files")
+	parser.add_argument('--compare', help="JSON results of an earlier run, to report regressions against")
+	parser.add_argument('--threshold', type=float, default=1.1,
+						help="slowdown ratio reported as a regression by --compare (default: 1.1)")
+	args = parser.parse_args(argv)
+
+	results = {'environment': environment()}
+	if 'operations' in args.only:
+		results['operations'] = benchmarkOperations(args.repeat)
+	if 'fileHandler' in args.only:
+		results['fileHandler'] = benchmarkFileHandler(args.rows, args.repeat, directory=args.tmpdir)
+	if 'estimateUncertainty' in args.only:
+		results['estimateUncertainty'] = benchmarkEstimateUncertainty(args.inputs, args.repeat)
+	if 'importTime' in args.only:
+		results['importTime'] = benchmarkImportTime(repeat=args.repeat)
+
+	text = json.dumps(results, indent=2)
+	if args.output is None:
+		print(text)
+	else:
+		with open(args.output, 'w') as f:
+			f.write(text + '\n')
+
+	if args.compare is not None:
+		with open(args.compare) as f:
+			regressions = compareResults(json.load(f), results, args.threshold)
+		for line in regressions:
+			print("REGRESSION " + line, file=sys.stderr)
+		return 1 if regressions else 0
+	return 0
+
+def writeSyntheticCsv(path, nRows, nVariables = 3, seed = 0):
+	"""Write a file in the `FileHandler` format, with a row number column
+	then `nVariables` measurement columns (load with `columnOffset=1`).
+
+	Written in blocks, so memory use is bounded for large `nRows`.
+
+	"""
+	rng = np.random.default_rng(seed)
+	header = ['row'] + [h for i in range(nVariables) for h in ('x{}'.format(i), '')]
+	with open(path, 'w', newline='') as f:
+		f.write(','.join(header) + '\n')
+		for start in range(0, nRows, 10**6):
+			m = min(10**6, nRows - start)
+			block = np.empty((m, 2*nVariables + 1))
+			block[:, 0] = np.arange(start, start + m)
+			block[:, 1::2] = rng.uniform(-100, 100, (m, nVariables))
+			block[:, 2::2] = rng.uniform(0, 1, (m, nVariables))
+			pd.DataFrame(block).to_csv(f, header=False, index=False, float_format='%.6g')
+	return
+
+
+
+##################################### MAIN ####################################
+if __name__ == '__main__':
+	sys.exit(main())
@@ -19,4 +19,26 @@ Not finished yet. I may need a setup.py or something to indicate dependencies.
 
 
 ################################### MODULES ###################################
-from pythonutils import builtinMethods, intmath, assorted, uncertainty
+# Submodules are imported on first access (PEP 562), so e.g. `pythonutils.io`
+# doesn't pay for importing numpy and pandas. The pandas extension dtypes
+# ('measurement[coherent]' and 'measurement[incoherent]') are registered when
+# `uncertaintyPandas` is imported, so `import pythonutils` alone doesn't make
+# them available as dtype strings: use `import pythonutils.uncertaintyPandas`
+# (or access `pythonutils.uncertaintyPandas`) first.
+import importlib
+
+__all__ = ['assorted', 'builtinMethods', 'intmath', 'io', 'uncertainty', 'uncertaintyPandas']
+
+
+
+################################## FUNCTIONS ##################################
+def __dir__():
+	names = sorted(set(globals()) | set(__all__))
+	return names
+
+def __getattr__(name):
+	if name not in __all__:
+		raise AttributeError("module '{0}' has no attribute '{1}'".format(__name__, name))
+	module = importlib.import_module('.' + name, __name__)
+	globals()[name] = module
+	return module
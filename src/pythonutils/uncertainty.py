@@ -5,8 +5,29 @@ Important classes:
   are coherent
 - IncoherentUncertainty : value+-uncertainty objects, not assuming the
   uncertainties are coherent
+- CorrelatedUncertainty : like IncoherentUncertainty, but tracks the
+  correlations between measurements that share sources (e.g. `x - x`)
+- CoherentUncertaintyArray, IncoherentUncertaintyArray : NumPy-backed arrays
+  of the above, for vectorised calculations over whole datasets
+- GeneralUncertainty, GeneralUncertaintyArray : measurements with asymmetric
+  uncertainties, propagated exactly by interval arithmetic
+- EstimateCache : opt-in cache of `GeneralUncertainty.estimateUncertainty`
+  results
+- IncoherenceWarning, IncoherenceReporter : aggregated, rate-limited warnings
+  of incoherent uncertainties in Coherent calculations
+- RunningStatistics : sums, means, weighted means, etc. of measurements that
+  arrive in chunks
+- Expression, CompiledExpression : record a calculation on placeholder
+  measurements once, then evaluate it over every row of a dataset at once
+- MonteCarloResult : result of propagating measurements through a function
+  by Monte Carlo sampling (see `monteCarlo`)
+- CovarianceResult : values and full covariance of the outputs of a vector
+  function, propagated to first order (see `propagateCovariance`)
 - FileHandler : load in .csv files with appropriate format to perform repeated
-  calculations for many trials
+  calculations for many trials (or a memory-mapped binary equivalent, see
+  `FileHandler.loadBinary`)
+- ChunkedFileReader, ChunkedFileWriter : stream such files in chunks of
+  UncertaintyArrays (see `FileHandler.loadChunks` and `.saveChunks`)
 
 General definitions (I really need to standardise these):
 - "measurement": value+-unc      (Sometimes represented by an uppercase and
@@ -49,12 +70,23 @@ __author__ = "Nathan O'Neill"
 
 
 ################################### MODULES ###################################
-from pythonutils import assorted as asd
+import bisect
+import collections
+import contextlib
 import csv
+import decimal
+import fractions
+import itertools
+import json
 import math
 import numpy as np
+import operator
 import os
-import pandas as pd
+import re
+import time
+import warnings
+# pandas is only imported by the FileHandler functions that need it, as it is
+# slow to import
 
 
 
@@ -79,9 +111,22 @@ class _Uncertainty_Prototype:
 	
 	"""
 
+	# Measurements are kept alive in large numbers, so avoid a per-instance
+	# `__dict__`. Subclasses must also define `__slots__`.
+	__slots__ = ('_val', '_unc')
+
+	# The (exact) types of plain numbers, which operations accept without the
+	# ducktyping of `_getOtherValueUnc`. As there, `nan` is rejected (by
+	# `other == other`).
+	_numberTypes = frozenset((int, float, np.float64))
+
 	## CLASSMETHODS ##
 	__prefixes = {'p':10**(-12), 'n':10**(-9), 'u':10**(-6), 'm':10**(-3),
 				  'c':10**(-2), '':1,'k':10**3, 'M':10**6, 'G':10**9, 'T':10**12}
+	# `(prefix, scale)` sorted by scale, and the log10 of each scale, so that
+	# the best prefix can be found by bisection
+	__prefixTable = tuple(sorted(__prefixes.items(), key=lambda x: x[1]))
+	__prefixExponents = tuple(math.log10(scale) for (_, scale) in __prefixTable)
 	
 	@classmethod
 	def prefixToScale(cls, prefix):
@@ -157,6 +202,51 @@ class _Uncertainty_Prototype:
 			raise ValueError("prefix '{}' cannot be one of the standard prefixes 'p', 'n', 'u', 'm', 'c', 'd', 'da', 'h', 'k', 'M', 'G', 'T'".format(prefix))
 		del cls.__prefixes[prefix]
 	
+	@classmethod
+	def findBestPrefixes(cls, vals):
+		"""Return the best prefix (as per `findBestPrefix`) of every value in
+		`vals` at once.
+
+		Parameters
+		----------
+		vals : array_like
+
+		Returns
+		-------
+		np.ndarray
+			`object` array of `str`, of the same shape as `vals`.
+
+		"""
+		vals = np.abs(np.asarray(vals, dtype=float))
+		prefixes = np.array([prefix for (prefix, _) in cls.__prefixTable], dtype=object)
+		scales = np.array([scale for (_, scale) in cls.__prefixTable], dtype=float)
+		with np.errstate(divide='ignore', invalid='ignore'):
+			# only the prefixes either side of the value can be the best
+			index = np.searchsorted(cls.__prefixExponents, np.log10(vals), side='right')
+			candidates = np.clip(index[..., None] + np.arange(-2, 2), 0, len(scales) - 1)
+			numDigits = np.floor(np.log10(vals[..., None] / scales[candidates]))
+			best = np.take_along_axis(candidates, np.argmin(np.abs(numDigits), axis=-1)[..., None], axis=-1)[..., 0]
+			valid = (np.isfinite(vals) & (vals != 0)
+					 & (np.floor(np.log10(vals / scales[0])) >= -2)
+					 & (np.floor(np.log10(vals / scales[-1])) <= 2))
+		return np.where(valid, prefixes[best], '')
+
+	@classmethod
+	def _bestPrefix(cls, val):
+		"""Return `findBestPrefix` of `val`, only trying the prefixes either
+		side of it in the sorted prefix table."""
+		if val == 0 or not math.isfinite(val):
+			return ''
+		table = cls.__prefixTable
+		val = abs(val)
+		def numDigits(i): # == number of digits above the decimal point - 1 if this prefix is applied
+			return math.floor(math.log10(val / table[i][1]))
+		if numDigits(0) < -2 or numDigits(-1) > 2:
+			return ''
+		i = bisect.bisect_right(cls.__prefixExponents, math.log10(val))
+		candidates = range(max(i-2, 0), min(i+2, len(table)))
+		return table[min(candidates, key=lambda j: abs(numDigits(j)))][0]
+
 	@classmethod
 	def isValidPrefix(cls, prefix):
 		"""Return if a prefix is valid.
@@ -230,15 +320,43 @@ class _Uncertainty_Prototype:
 		old isinstance(x, (int,float)).
 		
 		"""
-		if isinstance(other, cls): return (other.val, other.unc)
+		if isinstance(other, cls): return (other._val, other._unc)
+		if type(other) in cls._numberTypes and other == other: return (other, 0)
 		
-		# Ducktyping 'is number'
+		# Ducktyping 'is number'. Arrays (even of size 1) are left to NumPy
+		if isinstance(other, np.ndarray) and other.ndim > 0:
+			raise TypeError("'{}' cannot be interpreted as a measurement".format(type(other)))
 		try: floatOther = float(other)
-		except TypeError: 
-			raise NotImplementedError
+		except (TypeError, ValueError):
+			raise TypeError("'{}' cannot be interpreted as a measurement".format(type(other)))
 
-		if other == floatOther: return (other, 0)
-		raise NotImplementedError
+		# Results are built without validation, so store e.g. a `Fraction` or
+		# `np.int64` as the float it was checked as
+		if other == floatOther: return (other if isinstance(other, (int, float)) else floatOther, 0)
+		raise TypeError("'{}' cannot be interpreted as a measurement".format(type(other)))
+
+	@classmethod
+	def _fromValUnc(cls, val, unc):
+		"""Return a new `val+-unc` measurement without any validation.
+
+		This is the construction path for the results of operations, whose
+		`val` and `unc` are already known to be valid. It bypasses `__init__`
+		and the property setters entirely.
+
+		Parameters
+		----------
+		val : float
+		unc : float
+
+		Returns
+		-------
+		cls
+
+		"""
+		self = object.__new__(cls)
+		self._val = val
+		self._unc = unc
+		return self
 			
 
 	## PROPERTIES ##
@@ -328,23 +446,25 @@ class _Uncertainty_Prototype:
 
 
 	## OPERATIONS ##
-	def __abs__(self): return type(self)(abs(self.val), self.unc)
+	def __abs__(self): return self._fromValUnc(abs(self._val), self._unc)
 
 	def __pos__(self): return self
 	
-	def __neg__(self): return type(self)(-self.val, self.unc)
+	def __neg__(self): return self._fromValUnc(-self._val, self._unc)
 	
 	def __add__(self, b): raise NotImplementedError
 
-	def __radd__(self, b): return self + b
+	# Reflected operations call the forward method directly (not `self + b`)
+	# so that `NotImplemented` is returned rather than re-dispatching.
+	def __radd__(self, b): return self.__add__(b)
 
 	def __sub__(self, b): raise NotImplementedError
 	
-	def __rsub__(self, b): return -self + b
+	def __rsub__(self, b): return (-self).__add__(b)
 
 	def __mul__(self, b): raise NotImplementedError
 	
-	def __rmul__(self, b): return self * b
+	def __rmul__(self, b): return self.__mul__(b)
 
 	def __truediv__(self, b): raise NotImplementedError
 
@@ -370,7 +490,8 @@ class _Uncertainty_Prototype:
 		"""Find the best prefix to represent this measurement's value. 
 
 		That being the one gives the smallest number of significant figures
-		above the decimal point (so long as there is at least one).
+		above the decimal point (so long as there is at least one). Values
+		outside the range of the prefixes, zero and non-finite values get `""`.
 
 		Returns
 		-------
@@ -378,22 +499,7 @@ class _Uncertainty_Prototype:
 			The appropriate prefix
 
 		"""
-		prefixes = list(self.__prefixes.items())
-		prefixes.sort(key=lambda x: x[1])
-
-		differences = [] # == number of digits above the decimal point - 1 if this prefix is applied
-		for (i, prefixScale) in enumerate(prefixes):
-			numDigits = math.floor( math.log10(abs( self.val/prefixScale[1] )) )
-			differences.append( (prefixScale[0], numDigits) )
-		
-		if differences[0][1] < -2:
-			bestPrefix = ""
-		elif differences[-1][1] > 2:
-			bestPrefix = ""
-		else:
-			bestPrefix = min(differences, key=lambda x: abs(x[1]))[0]
-			
-		return bestPrefix
+		return self._bestPrefix(self.val)
 
 	def percent(self):
 		"""Return the percentage uncertainty of itself (uncertainty/value)
@@ -434,6 +540,104 @@ class _Uncertainty_Prototype:
 		return self.val - self.unc
 
 
+	## NUMPY PROTOCOLS ##
+	# `ufunc: derivative` of the supported elementwise functions of one
+	# argument (also used by `UncertaintyArray`)
+	_ufuncDerivatives = {
+		np.negative: lambda x: -1.0,
+		np.positive: lambda x: 1.0,
+		np.absolute: lambda x: 1.0, # of unit magnitude, also at 0, as `__abs__`
+		np.exp: np.exp,
+		np.exp2: lambda x: np.exp2(x) * math.log(2),
+		np.expm1: np.exp,
+		np.log: lambda x: 1 / x,
+		np.log2: lambda x: 1 / (x * math.log(2)),
+		np.log10: lambda x: 1 / (x * math.log(10)),
+		np.log1p: lambda x: 1 / (1 + x),
+		np.sqrt: lambda x: 0.5 / np.sqrt(x),
+		np.cbrt: lambda x: 1 / (3 * np.cbrt(x)**2),
+		np.square: lambda x: 2 * x,
+		np.reciprocal: lambda x: -1 / x**2,
+		np.sin: np.cos,
+		np.cos: lambda x: -np.sin(x),
+		np.tan: lambda x: 1 / np.cos(x)**2,
+		np.arcsin: lambda x: 1 / np.sqrt(1 - x**2),
+		np.arccos: lambda x: -1 / np.sqrt(1 - x**2),
+		np.arctan: lambda x: 1 / (1 + x**2),
+		np.sinh: np.cosh,
+		np.cosh: np.sinh,
+		np.tanh: lambda x: 1 - np.tanh(x)**2,
+		np.arcsinh: lambda x: 1 / np.sqrt(x**2 + 1),
+		np.arccosh: lambda x: 1 / np.sqrt(x**2 - 1),
+		np.arctanh: lambda x: 1 / (1 - x**2),
+		np.deg2rad: lambda x: math.pi / 180,
+		np.rad2deg: lambda x: 180 / math.pi,
+	}
+	# `ufunc: (method, reflected method)` of the functions that are the
+	# arithmetic operators
+	_ufuncOperators = {
+		np.add: ('__add__', '__radd__'),
+		np.subtract: ('__sub__', '__rsub__'),
+		np.multiply: ('__mul__', '__rmul__'),
+		np.true_divide: ('__truediv__', '__rtruediv__'),
+		np.power: ('__pow__', '__rpow__'),
+		np.equal: ('__eq__', '__eq__'),
+		np.not_equal: ('__ne__', '__ne__'),
+	}
+
+	def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+		"""Support NumPy's elementwise functions (e.g. `np.log(x)`),
+		propagating the uncertainty to first order.
+
+		The arithmetic functions use the operators. Used with a NumPy array,
+		the measurement is broadcast as the matching `UncertaintyArray`.
+
+		"""
+		if method != '__call__' or kwargs:
+			return NotImplemented
+		if any(isinstance(x, np.ndarray) and x.dtype == object for x in inputs):
+			# Elementwise, as NumPy would for an `object` array (e.g. a column
+			# of `FileHandler.load`). Measurements are wrapped in 0-d arrays so
+			# that this method isn't called again for the whole array.
+			inputs = tuple(_objectScalar(x) if isinstance(x, _Uncertainty_Prototype) else x for x in inputs)
+			return np.frompyfunc(ufunc, len(inputs), 1)(*inputs)
+		if any(isinstance(x, (np.ndarray, UncertaintyArray)) and x.ndim > 0 for x in inputs):
+			inputs = tuple(x._asArray() if isinstance(x, _Uncertainty_Prototype) else x for x in inputs)
+			return ufunc(*inputs)
+		if ufunc in self._ufuncOperators:
+			return self._ufuncOperator(ufunc, inputs)
+		if ufunc in self._ufuncDerivatives and len(inputs) == 1:
+			return self._applyUnary(ufunc, self._ufuncDerivatives[ufunc])
+		return NotImplemented
+
+	def _applyUnary(self, f, derivative):
+		"""Return `f(self)`, with the uncertainty propagated by
+		`abs(derivative(val)) * unc`."""
+		return self._fromValUnc(float(f(self._val)), abs(float(derivative(self._val))) * self._unc)
+
+	def _asArray(self):
+		"""Return this measurement as a 0-dimensional `UncertaintyArray` (or,
+		for classes without one, an `object` array)."""
+		arrayType = {CoherentUncertainty: CoherentUncertaintyArray,
+					 IncoherentUncertainty: IncoherentUncertaintyArray}.get(type(self))
+		if arrayType is None:
+			return _objectScalar(self)
+		return arrayType._fromArrays(np.asarray(float(self._val)), np.asarray(float(self._unc)))
+
+	@classmethod
+	def _ufuncOperator(cls, ufunc, inputs):
+		"""Apply an arithmetic ufunc of `_ufuncOperators` through the
+		operator methods of its (measurement) inputs."""
+		forward, reflected = cls._ufuncOperators[ufunc]
+		x, y = inputs
+		result = NotImplemented
+		if isinstance(x, (_Uncertainty_Prototype, UncertaintyArray)):
+			result = getattr(x, forward)(y)
+		if result is NotImplemented and isinstance(y, (_Uncertainty_Prototype, UncertaintyArray)) and hasattr(y, reflected):
+			result = getattr(y, reflected)(x)
+		return result
+
+
 	## TYPECASTING AND DISPLAYING ##
 	def __hash__(self): 
 		if self.unc == 0:
@@ -445,7 +649,7 @@ class _Uncertainty_Prototype:
 	def __float__(self):
 		#raise NotImplementedError("This shouldn't be a thing as this is a value WITH AN UNCERTAINTY, but it might be useful... (say, for numpy arrays)")
 		#Commented - it's useful for pd dataframes when doing mean, std etc.
-		return self.val
+		return float(self.val)
 
 	def __str__(self):
 		if self.__autoOutputPrefix:
@@ -479,8 +683,8 @@ class _Uncertainty_Prototype:
 				raise ValueError("'{}' isn't a valid prefix".format(prefix))
 		
 		else:
-			bestPrefix = self.findBestPrefix()
-			bestScale = self.prefixToScale(bestPrefix)
+			bestPrefix = self._bestPrefix(self.val)
+			bestScale = self.__prefixes[bestPrefix]
 			if bestPrefix == '':
 				returnString = str(self.val) + " +- " + str(self.unc)
 			else:
@@ -493,6 +697,97 @@ class _Uncertainty_Prototype:
 	def __repr__(self): return str(self)
 
 
+class IncoherenceWarning(UserWarning):
+	"""A Coherent calculation gave an incoherent uncertainty (e.g. the
+	product of values of opposite signs), which is not corrected for."""
+
+
+class IncoherenceReporter:
+	"""Aggregate and rate-limit the `IncoherenceWarning`s of `Coherent`
+	calculations.
+
+	Occurrences are counted per operation. The first occurrence of each
+	operation is warned about straight away, then at most one warning (with
+	the number of occurrences since the last) is given per `interval`
+	seconds, so a loop over many measurements doesn't flood the output.
+	Pending occurrences can be warned about with `flush`.
+
+	The reporter used by the Coherent classes is
+	`CoherentUncertainty.incoherenceReporter`, and it is skipped entirely
+	when `CoherentUncertainty.suppress_IncoherenceMessages(True)` is set.
+
+	Attributes
+	----------
+	interval : float
+		Minimum number of seconds between warnings about the same operation.
+
+	"""
+
+	def __init__(self, interval = 5.0):
+		self.interval = interval
+		self._counts = {} # operation: total occurrences
+		self._pending = {} # operation: [occurrences since the last warning, message]
+		self._lastWarned = {} # operation: time.monotonic() of the last warning
+
+	def counts(self):
+		"""Return the total number of occurrences of each operation.
+
+		Returns
+		-------
+		:obj:`dict` of :obj:`str` to :obj:`int`
+
+		"""
+		return dict(self._counts)
+
+	def flush(self):
+		"""Warn about every operation with occurrences since its last
+		warning."""
+		for operation in list(self._pending):
+			self._warn(operation, stacklevel=3)
+		return
+
+	def report(self, operation, message, count = 1, stacklevel = 2):
+		"""Record `count` occurrences of `operation`, warning if due.
+
+		Parameters
+		----------
+		operation : str
+			e.g. `"x*y"`.
+		message : str
+			Description of the problem, used in the warning.
+		count : :obj:`int`, optional
+			Default `1`.
+		stacklevel : :obj:`int`, optional
+			As per `warnings.warn`, relative to the caller. Default `2` (the
+			caller's caller, i.e. the code using the operation).
+
+		"""
+		count = int(count)
+		self._counts[operation] = self._counts.get(operation, 0) + count
+		pending = self._pending.setdefault(operation, [0, message])
+		pending[0] += count
+		pending[1] = message
+		lastWarned = self._lastWarned.get(operation)
+		if lastWarned is None or time.monotonic() - lastWarned >= self.interval:
+			self._warn(operation, stacklevel=stacklevel + 2)
+		return
+
+	def reset(self):
+		"""Forget all occurrences (so the next of each is warned about)."""
+		self._counts.clear()
+		self._pending.clear()
+		self._lastWarned.clear()
+		return
+
+	def _warn(self, operation, stacklevel):
+		count, message = self._pending.pop(operation)
+		if count > 1:
+			message = "{0} ({1} occurrences of {2} since the last warning)".format(message, count, operation)
+		warnings.warn(message, IncoherenceWarning, stacklevel=stacklevel)
+		self._lastWarned[operation] = time.monotonic()
+		return
+
+
 class CoherentUncertainty(_Uncertainty_Prototype):
 	"""Uncertainty class for values with ABSOLUTE uncertainties -> value +-
 	uncertainty
@@ -524,12 +819,20 @@ class CoherentUncertainty(_Uncertainty_Prototype):
 	__suppress_IncoherenceMessages : bool
 		Suppress warnings about possible incorrect calculations. (This should
 		be a property)
+	incoherenceReporter : IncoherenceReporter
+		Issues the (aggregated) `IncoherenceWarning`s.
 	
 	"""
 
+	__slots__ = ()
+
 	## CLASSMETHODS ##
 	#this would be better as a class property than separate getter/setters
 	__suppress_IncoherenceMessages = False
+	incoherenceReporter = IncoherenceReporter()
+	_powerIncoherenceMessage = ("The base of a power is less than one, this will likely cause an incoherent "
+								"uncertainty, but this hasn't been accounted for. It is advised to use "
+								"IncoherentUncertainty objects instead")
 	@classmethod
 	def suppress_IncoherenceMessages(cls, bool_ = None):
 		"""suppress the Incoherent Uncertainty warnings if True
@@ -550,6 +853,19 @@ class CoherentUncertainty(_Uncertainty_Prototype):
 			raise TypeError("bool_ must be a bool, not type '{}'".format(type(bool_)))
 
 
+	@classmethod
+	def _fromValUncChecked(cls, val, unc):
+		"""`_fromValUnc`, but keep the sign check of the `unc` setter.
+		
+		Coherent propagation can produce a negative uncertainty (e.g. when
+		multiplying by a negative number), which must still raise.
+
+		"""
+		if unc < 0:
+			raise ValueError("uncertainty must be positive, not '{}'".format(unc))
+		return cls._fromValUnc(val, unc)
+
+
 	## CONSTRUCTOR ##
 	def __init__(self, val, unc = 0, scale = 1):
 		"""Initialise a CoherentUncertainty object: `val+-unc * scale`
@@ -572,44 +888,44 @@ class CoherentUncertainty(_Uncertainty_Prototype):
 	
 	## OPERATIONS ##
 	def __add__(self, other):
-		A, a = self.val, self.unc
+		A, a = self._val, self._unc
 		try: B, b = self._getOtherValueUnc(other)
 		except TypeError: return NotImplemented
-		return type(self)(A+B, a+b)
+		return self._fromValUnc(A+B, a+b)
 	
 	def __sub__(self, other):
-		A, a = self.val, self.unc
+		A, a = self._val, self._unc
 		try: B, b = self._getOtherValueUnc(other)
 		except TypeError: return NotImplemented
-		return type(self)(A-B, a+b)
+		return self._fromValUnc(A-B, a+b)
 	
 	def __mul__(self, other):
-		A, a = self.val, self.unc
+		A, a = self._val, self._unc
 		try: B, b = self._getOtherValueUnc(other)
 		except TypeError: return NotImplemented
-		if A*B < 0 and not self.suppress_IncoherenceMessages():
-			print("WARNING: {0}*{1} results in an incoherent uncertainty, but is not corrected in calculations".format(A,B))
-		return type(self)(A*B, B*a + A*b)
+		if A*B < 0 and not self.__suppress_IncoherenceMessages:
+			self.incoherenceReporter.report("x*y", "x*y results in an incoherent uncertainty (e.g. {0}*{1}), but is not corrected in calculations".format(A,B))
+		return self._fromValUncChecked(A*B, B*a + A*b)
 	
 	def __truediv__(self, other):
-		A, a = self.val, self.unc
+		A, a = self._val, self._unc
 		try: B, b = self._getOtherValueUnc(other)
 		except TypeError: return NotImplemented
-		if A*B < 0 and not self.suppress_IncoherenceMessages():
-			print("WARNING: {0}/{1} results in an incoherent uncertainty, but is not corrected in calculations".format(A,B))
-		return type(self)(A/B, a/B + A*b/(B**2))
+		if A*B < 0 and not self.__suppress_IncoherenceMessages:
+			self.incoherenceReporter.report("x/y", "x/y results in an incoherent uncertainty (e.g. {0}/{1}), but is not corrected in calculations".format(A,B))
+		return self._fromValUncChecked(A/B, a/B + A*b/(B**2))
 	
 	def __rtruediv__(self, other):
-		B, b = self.val, self.unc
+		B, b = self._val, self._unc
 		try: A, a = self._getOtherValueUnc(other)
 		except TypeError: return NotImplemented
 
-		if A*B < 0 and not self.suppress_IncoherenceMessages():
-			print("WARNING: {0}/{1} results in an incoherent uncertainty, but is not corrected in calculations".format(A,B))
-		return type(self)(A/B, a/B + A*b/(B**2) )
+		if A*B < 0 and not self.__suppress_IncoherenceMessages:
+			self.incoherenceReporter.report("x/y", "x/y results in an incoherent uncertainty (e.g. {0}/{1}), but is not corrected in calculations".format(A,B))
+		return self._fromValUncChecked(A/B, a/B + A*b/(B**2) )
 
 	def __pow__(self, other):
-		A, a = self.val, self.unc
+		A, a = self._val, self._unc
 		try: B, b = self._getOtherValueUnc(other)
 		except TypeError: return NotImplemented
 
@@ -623,14 +939,14 @@ class CoherentUncertainty(_Uncertainty_Prototype):
 		X = A**B
 		if 0 < A <= 1:
 			#raise RunTimeWarning("The base of a power is less than one, this will likely cause an incoherent uncertainty, but this hasn't been accounted for. It is advised to use IncoherentUncertainty objects instead")
-			if b != 0 and not self.suppress_IncoherenceMessages(): 
-				print("WARNING: The base of a power is less than one, this will likely cause an incoherent uncertainty, but this hasn't been accounted for. It is advised to use IncoherentUncertainty objects instead")
-			return type(self)(X, X*(B*a/A + math.log1p(A-1)*b) )
+			if b != 0 and not self.__suppress_IncoherenceMessages:
+				self.incoherenceReporter.report("x**y", self._powerIncoherenceMessage)
+			return self._fromValUncChecked(X, X*(B*a/A + math.log1p(A-1)*b) )
 		else:
-			return type(self)(X, X*(B*a/A + math.log(A)*b) )
+			return self._fromValUncChecked(X, X*(B*a/A + math.log(A)*b) )
 
 	def __rpow__(self, other):
-		B, b = self.val, self.unc
+		B, b = self._val, self._unc
 		try: A, a = self._getOtherValueUnc(other)
 		except TypeError: return NotImplemented
 
@@ -644,11 +960,11 @@ class CoherentUncertainty(_Uncertainty_Prototype):
 		X = A**B
 		if 0 < A <= 1:
 			#raise RuntimeWarning("The base of a power is less than one, this will likely cause an incoherent uncertainty, but this hasn't been accounted for. It is advised to use IncoherentUncertainty objects instead")
-			if b != 0 and not self.suppress_IncoherenceMessages(): 
-				print("WARNING: The base of a power is less than one, this will likely cause an incoherent uncertainty, but this hasn't been accounted for. It is advised to use IncoherentUncertainty objects instead")
-			return type(self)(X, X*(B*a/A + math.log1p(A-1)*b) )
+			if b != 0 and not self.__suppress_IncoherenceMessages:
+				self.incoherenceReporter.report("x**y", self._powerIncoherenceMessage)
+			return self._fromValUncChecked(X, X*(B*a/A + math.log1p(A-1)*b) )
 		else:
-			return type(self)(X, X*(B*a/A + math.log(A)*b) )
+			return self._fromValUncChecked(X, X*(B*a/A + math.log(A)*b) )
 
 
 class CoherentUncertaintyForced(_Uncertainty_Prototype):
@@ -659,6 +975,8 @@ class CoherentUncertaintyForced(_Uncertainty_Prototype):
 
 	"""
 
+	__slots__ = ()
+
 	def __init__(self):
 		return NotImplementedError
 
@@ -678,43 +996,45 @@ class IncoherentUncertainty(_Uncertainty_Prototype):
 
 	"""
 
+	__slots__ = ()
+
 	#def __init__(self, val, unc, scale):
 	#	"""Note that this does not need a separate __init__ function"""
 	#	raise NotImplementedError()
 	
 	## OPERATIONS ##
 	def __add__(self, other):
-		A, a = self.val, self.unc
+		A, a = self._val, self._unc
 		try: B, b = self._getOtherValueUnc(other)
 		except TypeError: return NotImplemented
-		return type(self)(A+B, math.sqrt(a**2 + b**2))
+		return self._fromValUnc(A+B, math.sqrt(a**2 + b**2))
 	
 	def __sub__(self, other):
-		A, a = self.val, self.unc
+		A, a = self._val, self._unc
 		try: B, b = self._getOtherValueUnc(other)
 		except TypeError: return NotImplemented
-		return type(self)(A-B, math.sqrt(a**2 + b**2))
+		return self._fromValUnc(A-B, math.sqrt(a**2 + b**2))
 	
 	def __mul__(self, other):
-		A, a = self.val, self.unc
+		A, a = self._val, self._unc
 		try: B, b = self._getOtherValueUnc(other)
 		except TypeError: return NotImplemented
-		return type(self)(A*B, math.sqrt((B*a)**2 + (A*b)**2))
+		return self._fromValUnc(A*B, math.sqrt((B*a)**2 + (A*b)**2))
 	
 	def __truediv__(self, other):
-		A, a = self.val, self.unc
+		A, a = self._val, self._unc
 		try: B, b = self._getOtherValueUnc(other)
 		except TypeError: return NotImplemented
-		return type(self)(A/B, math.sqrt((a/B)**2 + (A*b/(B**2))**2))
+		return self._fromValUnc(A/B, math.sqrt((a/B)**2 + (A*b/(B**2))**2))
 	
 	def __rtruediv__(self, other):
-		B, b = self.val, self.unc
+		B, b = self._val, self._unc
 		try: A, a = self._getOtherValueUnc(other)
 		except TypeError: return NotImplemented
-		return type(self)(A/B, math.sqrt((a/B)**2 + (A*b/(B**2))**2))
+		return self._fromValUnc(A/B, math.sqrt((a/B)**2 + (A*b/(B**2))**2))
 
 	def __pow__(self, other):
-		A, a = self.val, self.unc
+		A, a = self._val, self._unc
 		try: B, b = self._getOtherValueUnc(other)
 		except TypeError: return NotImplemented
 
@@ -727,12 +1047,12 @@ class IncoherentUncertainty(_Uncertainty_Prototype):
 		
 		X = A**B
 		if 0 < A <= 1:
-			return type(self)(X, abs(X)*math.sqrt((B*a/A)**2 + (math.log1p(A-1)*b)**2))
+			return self._fromValUnc(X, abs(X)*math.sqrt((B*a/A)**2 + (math.log1p(A-1)*b)**2))
 		else:
-			return type(self)(X, abs(X)*math.sqrt((B*a/A)**2 + (math.log(A)*b)**2))
+			return self._fromValUnc(X, abs(X)*math.sqrt((B*a/A)**2 + (math.log(A)*b)**2))
 
 	def __rpow__(self, other):
-		B, b = self.val, self.unc
+		B, b = self._val, self._unc
 		try: A, a = self._getOtherValueUnc(other)
 		except TypeError: return NotImplemented
 
@@ -745,9 +1065,372 @@ class IncoherentUncertainty(_Uncertainty_Prototype):
 		
 		X = A**B
 		if 0 < A <= 1:
-			return type(self)(X, abs(X)*math.sqrt((B*a/A)**2 + (math.log1p(A-1)*b)**2))
+			return self._fromValUnc(X, abs(X)*math.sqrt((B*a/A)**2 + (math.log1p(A-1)*b)**2))
+		else:
+			return self._fromValUnc(X, abs(X)*math.sqrt((B*a/A)**2 + (math.log(A)*b)**2))
+
+
+class CorrelatedUncertainty(_Uncertainty_Prototype):
+	"""Uncertainty object that tracks correlations between measurements.
+
+	Like `IncoherentUncertainty`, this calculates standard error. But rather
+	than assuming every operand is independent, each measurement carries its
+	first-order sensitivities to the independent 'source' measurements it was
+	calculated from. For f(x_1, x_2, ...) the uncertainty is
+		`sqrt( sum_k (df/dx_k * x_k.unc)**2 )`
+	summed over the sources x_k, which is exact to first order even when a
+	source is reused. E.g. `x - x` has zero uncertainty, and `x*x/x` has the
+	uncertainty of `x`.
+
+	Every measurement created by the constructor (or assigned an uncertainty)
+	is a new independent source. `IncoherentUncertainty` operands are also
+	treated as new independent sources.
+
+	Notes
+	-----
+	The sensitivities are stored as a sparse `{sourceId: df/dx_k * x_k.unc}`
+	dict, so that combining two measurements is a single dict merge and the
+	uncertainty is a sum of squares. The dicts are never mutated once
+	created, so they are shared between measurements where possible.
+
+	"""
+
+	__slots__ = ('_contribs',)
+	_sourceIds = itertools.count()
+
+	## CLASSMETHODS ##
+	@classmethod
+	def _fromValContribs(cls, val, contribs):
+		"""Return a new measurement from its sensitivities, without
+		validation."""
+		self = object.__new__(cls)
+		self._val = val
+		self._contribs = contribs
+		self._unc = math.sqrt(math.fsum([c*c for c in contribs.values()]))
+		return self
+
+	@classmethod
+	def _getOtherValueContribs(cls, other):
+		"""Return the appropriate `(value, contribs)` tuple of `other`.
+
+		Raises
+		------
+		TypeError
+			Indicates that `other` cannot be interpreted as a measurement.
+
+		"""
+		if isinstance(other, cls): return (other._val, other._contribs)
+		if isinstance(other, IncoherentUncertainty):
+			return (other.val, {next(cls._sourceIds): other.unc} if other.unc else {})
+		if isinstance(other, _Uncertainty_Prototype):
+			raise TypeError("'{0}' cannot be combined with '{1}'".format(type(other), cls))
+		B, b = _Uncertainty_Prototype._getOtherValueUnc(other)
+		return (B, {})
+
+	@staticmethod
+	def _linearCombination(ca, fa, cb = None, fb = 0):
+		"""Return the sensitivities of `fa*a + fb*b`, given those of `a` and
+		`b`. Exactly cancelling sources are dropped."""
+		if not cb:
+			if fa == 1: return ca
+			return {k: fa*c for (k, c) in ca.items()}
+		if not ca:
+			return {k: fb*c for (k, c) in cb.items()}
+		if len(ca) < len(cb):
+			ca, fa, cb, fb = cb, fb, ca, fa
+		result = {k: fa*c for (k, c) in ca.items()}
+		for k, c in cb.items():
+			if k in result:
+				total = result[k] + fb*c
+				if total == 0: del result[k]
+				else: result[k] = total
+			else:
+				result[k] = fb*c
+		return result
+
+
+	## PROPERTIES ##
+	@property
+	def unc(self):
+		""":obj:`float`: Standard error of the measurement. Assigning an
+		uncertainty makes this measurement a new independent source."""
+		return self._unc
+
+	@unc.setter
+	def unc(self, value):
+		_Uncertainty_Prototype.unc.fset(self, value)
+		self._contribs = {next(self._sourceIds): value} if value else {}
+
+
+	## CONSTRUCTOR ##
+	def __init__(self, val, unc = 0, scale = 1):
+		"""Initialise an independent measurement: `val+-unc * scale`
+
+		If `val` is a `CorrelatedUncertainty` (and `unc` and `scale` are
+		default), the result is fully correlated with `val`.
+
+		Parameters
+		----------
+		val : float
+			The measured valued.
+		unc : :obj:`float`, optional
+			The measurement's standard error. Default `0`.
+		scale : :obj:`float`, :obj:`str`, optional
+			The scale of both `value` and `uncertainty`. Can either be a number
+			of a valid prefix. Default `1`.
+
+		"""
+		if isinstance(val, CorrelatedUncertainty) and unc == 0 and scale == 1:
+			self._val, self._unc, self._contribs = val._val, val._unc, val._contribs
 		else:
-			return type(self)(X, abs(X)*math.sqrt((B*a/A)**2 + (math.log(A)*b)**2))
+			super().__init__(val, unc, scale)
+
+
+	## OPERATIONS ##
+	def __abs__(self):
+		if self._val < 0: return -self
+		return self
+
+	def __neg__(self):
+		return self._fromValContribs(-self._val, self._linearCombination(self._contribs, -1))
+
+	def __add__(self, other):
+		try: B, cb = self._getOtherValueContribs(other)
+		except TypeError: return NotImplemented
+		return self._fromValContribs(self._val + B, self._linearCombination(self._contribs, 1, cb, 1))
+
+	def __sub__(self, other):
+		try: B, cb = self._getOtherValueContribs(other)
+		except TypeError: return NotImplemented
+		return self._fromValContribs(self._val - B, self._linearCombination(self._contribs, 1, cb, -1))
+
+	def __rsub__(self, other):
+		try: B, cb = self._getOtherValueContribs(other)
+		except TypeError: return NotImplemented
+		return self._fromValContribs(B - self._val, self._linearCombination(self._contribs, -1, cb, 1))
+
+	def __mul__(self, other):
+		A, ca = self._val, self._contribs
+		try: B, cb = self._getOtherValueContribs(other)
+		except TypeError: return NotImplemented
+		return self._fromValContribs(A*B, self._linearCombination(ca, B, cb, A))
+
+	def __truediv__(self, other):
+		A, ca = self._val, self._contribs
+		try: B, cb = self._getOtherValueContribs(other)
+		except TypeError: return NotImplemented
+		return self._fromValContribs(A/B, self._linearCombination(ca, 1/B, cb, -A/(B**2)))
+
+	def __rtruediv__(self, other):
+		B, cb = self._val, self._contribs
+		try: A, ca = self._getOtherValueContribs(other)
+		except TypeError: return NotImplemented
+		return self._fromValContribs(A/B, self._linearCombination(ca, 1/B, cb, -A/(B**2)))
+
+	@classmethod
+	def _pow(cls, A, ca, B, cb):
+		"""Return `A**B` with sensitivities, for `__pow__` and `__rpow__`."""
+		if cb and A <= 0:
+			raise ValueError("{0}**{1} with an uncertain exponent requires a positive base".format(A, B))
+		X = A**B
+		if isinstance(X, complex):
+			raise ValueError("{0}**{1} is complex, so an uncertainty calculation cannot be done".format(A,B))
+		dA = B * A**(B-1) if ca else 0
+		dB = X * math.log(A) if cb else 0
+		return cls._fromValContribs(X, cls._linearCombination(ca, dA, cb, dB))
+
+	def __pow__(self, other):
+		try: B, cb = self._getOtherValueContribs(other)
+		except TypeError: return NotImplemented
+		return self._pow(self._val, self._contribs, B, cb)
+
+	def __rpow__(self, other):
+		try: A, ca = self._getOtherValueContribs(other)
+		except TypeError: return NotImplemented
+		return self._pow(A, ca, self._val, self._contribs)
+
+
+	## METHODS ##
+	def correlation(self, other):
+		"""Return the correlation coefficient with `other`.
+
+		Parameters
+		----------
+		other : CorrelatedUncertainty
+
+		Returns
+		-------
+		float
+			`nan` if either measurement has zero uncertainty.
+
+		"""
+		if self._unc == 0 or other._unc == 0: return math.nan
+		return self.covariance(other) / (self._unc * other._unc)
+
+	def covariance(self, other):
+		"""Return the (first-order) covariance with `other`.
+
+		Parameters
+		----------
+		other : CorrelatedUncertainty
+
+		Returns
+		-------
+		float
+
+		"""
+		ca, cb = self._contribs, other._contribs
+		if len(ca) > len(cb): ca, cb = cb, ca
+		return math.fsum([c * cb[k] for (k, c) in ca.items() if k in cb])
+
+	def _applyUnary(self, f, derivative):
+		"""Return `f(self)`, scaling every sensitivity by the (signed)
+		derivative (chain rule)."""
+		return self._fromValContribs(float(f(self._val)), self._linearCombination(self._contribs, float(derivative(self._val))))
+
+	def derivative(self, source):
+		"""Return the partial derivative of this measurement with respect to
+		an independent `source` measurement.
+
+		Parameters
+		----------
+		source : CorrelatedUncertainty
+			A measurement created by the constructor, with non-zero
+			uncertainty.
+
+		Returns
+		-------
+		float
+
+		"""
+		if len(source._contribs) != 1:
+			raise ValueError("source must be an independent measurement with a non-zero uncertainty")
+		((k, c),) = source._contribs.items()
+		return self._contribs.get(k, 0) / c
+
+
+class EstimateCache:
+	"""Bounded least-recently-used cache of
+	`GeneralUncertainty.estimateUncertainty` results.
+
+	Results are keyed on the function (by identity), the values and
+	uncertainties of the measurements rounded to `significantFigures`, and
+	every other argument that affects the search. Once `maxSize` results are
+	stored, the least recently used is evicted for each new one.
+
+	The cache is disabled by default. It is enabled by setting
+	`GeneralUncertainty.estimateCache`, e.g.
+	`GeneralUncertainty.estimateCache = EstimateCache(256)`.
+
+	Attributes
+	----------
+	significantFigures : int
+		Number of significant figures the values and uncertainties are
+		rounded to for the key, so that results for (practically) identical
+		inputs are shared.
+	hits, misses, evictions : int
+		Counts since the cache was created or last cleared.
+
+	Notes
+	-----
+	A function redefined between calls (e.g. a `lambda` written inline) is a
+	new function each time, so will never hit. Calls with unhashable extra
+	arguments are not cached.
+
+	"""
+
+	def __init__(self, maxSize = 128, significantFigures = 12):
+		self._results = collections.OrderedDict() # key: GeneralUncertainty, most recently used last
+		self.maxSize = maxSize
+		self.significantFigures = significantFigures
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+
+	def __len__(self): return len(self._results)
+
+	@property
+	def maxSize(self):
+		""":obj:`int`: Maximum number of results stored. Reducing it evicts
+		the least recently used results."""
+		return self._maxSize
+
+	@maxSize.setter
+	def maxSize(self, value):
+		if not isinstance(value, int) or value < 1:
+			raise ValueError("maxSize must be a positive integer, not '{}'".format(value))
+		self._maxSize = value
+		self._evict()
+
+	def clear(self):
+		"""Remove every result and reset the counters."""
+		self._results.clear()
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+		return
+
+	def info(self):
+		"""Return the counters and size of the cache.
+
+		Returns
+		-------
+		:obj:`dict`
+			With keys `'hits'`, `'misses'`, `'evictions'`, `'size'` and
+			`'maxSize'`.
+
+		"""
+		return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+				'size': len(self._results), 'maxSize': self._maxSize}
+
+	def lookup(self, key):
+		"""Return the result stored under `key` (as returned by `makeKey`),
+		or `None`."""
+		if key is None: return None
+		result = self._results.get(key)
+		if result is None:
+			self.misses += 1
+			return None
+		self._results.move_to_end(key)
+		self.hits += 1
+		return result
+
+	def makeKey(self, f, measurements, options, args = (), kwargs = {}):
+		"""Return the key of a call of `f` on `measurements`, or `None` if the
+		call can't be cached.
+
+		Parameters
+		----------
+		f : function
+		measurements : :obj:`list` of :obj:`GeneralUncertainty`
+		options : tuple
+			Every other argument that affects the result.
+		args : :obj:`tuple`, optional
+		kwargs : :obj:`dict`, optional
+
+		"""
+		quantize = lambda x: float("{0:.{1}g}".format(x, self.significantFigures))
+		inputs = tuple((quantize(m.val), quantize(m.unc[0]), quantize(m.unc[1])) for m in measurements)
+		key = (f, inputs, tuple(options), tuple(args), tuple(sorted(kwargs.items())))
+		try:
+			hash(key)
+		except TypeError:
+			return None
+		return key
+
+	def store(self, key, result):
+		"""Store `result` under `key` (as returned by `makeKey`)."""
+		if key is None: return
+		self._results[key] = result
+		self._results.move_to_end(key)
+		self._evict()
+		return
+
+	def _evict(self):
+		while len(self._results) > self._maxSize:
+			self._results.popitem(last=False)
+			self.evictions += 1
+		return
 
 
 class GeneralUncertainty(_Uncertainty_Prototype):
@@ -766,12 +1449,15 @@ class GeneralUncertainty(_Uncertainty_Prototype):
 	- Get the prototype to play nice (or just make this class independent)
 	- make repr() sensible, at the moment it's "val +- (lower, upper)" which
 	  is visually confusing
-	- multiply/divide could be done explicitly
 
 	WARNINGS:
 	- estimateUncertainty is not fullproof/trustworthy yet
 	"""
 
+	__slots__ = ()
+
+	estimateCache = None # EstimateCache of estimateUncertainty results, if enabled
+
 	#CLASSMETHODS and STATICMETHODS
 	@classmethod
 	def _getOtherValUnc(cls, other):
@@ -798,27 +1484,249 @@ class GeneralUncertainty(_Uncertainty_Prototype):
 		return (B,b)
 
 	@classmethod
-	def minimise(cls, f, start, domain, precision=5, test_domain_corners=True,
-				 useDynamicStepSize=True, *args, **kwargs):
-		"""equivalently maximise -f"""
-		return -cls.maximise(
-			lambda *x: -f(*x),
-			start,
-			domain,
-			precision,
-			test_domain_corners,
-			useDynamicStepSize,
-			*args,
-			**kwargs
-		)
+	def _hillClimb(cls, evaluate, start, startVal, domain, precs, maxPrecs,
+				   useDynamicStepSize, offsets, maxEvaluations=None, tolerance=0,
+				   relativeTolerance=None, reference=None):
+		"""Climb from `start` to a local maximum of `evaluate`.
 
-	@classmethod
-	def maximise(cls, f, start, domain, precision=5, test_domain_corners=True,
-				 useDynamicStepSize=True, *args, **kwargs):
-		"""Return the maximum value of function `f(*params)` over `domain` to
-		`precision`
+		Each iteration evaluates the whole neighbourhood (`point +
+		offsets*precs`, restricted to `domain`) in one call of `evaluate`, and
+		moves to its best point if that improves on the current value by more
+		than `tolerance`.
 
-		It might be more useful to return the values that give the max value!
+		Parameters
+		----------
+		evaluate : function
+			Called as `evaluate(points)` with an `(m, n)` array of points,
+			returning an `(m,)` array of function values.
+		start : :obj:`tuple` of :obj:`float`
+		startVal : float
+			Function value at `start`.
+		domain : :obj:`np.ndarray`
+			`(n, 2)` array of `(lower, upper)` bounds.
+		precs, maxPrecs : :obj:`list` of :obj:`float`
+			Starting and finest step sizes.
+		useDynamicStepSize : bool
+		offsets : np.ndarray
+			As returned by `_neighbourhoodOffsets`.
+		maxEvaluations : :obj:`int`, optional
+			Stop before exceeding this many evaluations.
+		tolerance : :obj:`float`, optional
+			Improvements of at most `tolerance` are treated as no improvement.
+		relativeTolerance : :obj:`float`, optional
+			As `tolerance`, but relative to the current distance of the value
+			from `reference` (i.e. the uncertainty being estimated). Also stops
+			refining the step size once a whole step size gained no more than
+			this, as finer steps can't change the result meaningfully.
+		reference : :obj:`float`, optional
+			Required with `relativeTolerance`.
+
+		Returns
+		-------
+		:obj:`tuple`
+			`(point, value, numberOfEvaluations)`
+
+		"""
+		point = np.array(start, dtype=float)
+		val = startVal
+		precs = np.array(precs, dtype=float)
+		maxPrecs = np.array(maxPrecs, dtype=float)
+		lower, upper = domain[:, 0], domain[:, 1]
+		nEvals = 0
+		levelStartVal = val # value when the step size was last changed
+		while True:
+			if relativeTolerance is not None:
+				threshold = max(tolerance, relativeTolerance * abs(val - reference))
+			else:
+				threshold = tolerance
+			oldPoint = point
+			candidates = point + offsets * precs
+			inDomain = (offsets == 0) | ((lower <= candidates) & (candidates <= upper))
+			candidates = candidates[np.all(inDomain, axis=1)]
+			if maxEvaluations is not None and nEvals + len(candidates) > maxEvaluations:
+				break
+
+			maxed = True
+			if len(candidates) > 0:
+				vals = evaluate(candidates)
+				nEvals += len(candidates)
+				vals = np.where(np.isnan(vals), -np.inf, vals)
+				i = np.argmax(vals) # first maximum, as the sequential search did
+				if vals[i] > val + threshold:
+					point, val = candidates[i], vals[i]
+					maxed = False
+
+			#Adjust step sizes
+			if useDynamicStepSize:
+				refine = (oldPoint == point) & (precs > maxPrecs)
+				if refine.any() and relativeTolerance is not None and maxed:
+					if val - levelStartVal <= threshold and levelStartVal != startVal:
+						break
+					levelStartVal = val
+				if refine.any():
+					precs[refine] = precs[refine] / 10 #I am concerned about losing precision in this value though...
+					maxed = False
+			if maxed:
+				break
+		return (tuple(point.tolist()), val, nEvals)
+
+	@staticmethod
+	def _makeEvaluator(f, vectorized, args, kwargs):
+		"""Return `evaluate(points)` for `_hillClimb`, calling `f` once per
+		point or (if `vectorized`) once per batch."""
+		if vectorized:
+			def evaluate(points):
+				vals = f(*points.T, *args, **kwargs)
+				return np.broadcast_to(np.asarray(vals, dtype=float), (len(points),))
+		else:
+			def evaluate(points):
+				return np.array([f(*p, *args, **kwargs) for p in points.tolist()], dtype=float)
+		return evaluate
+
+	@staticmethod
+	def _makeCachedEvaluator(evaluate, cache):
+		"""Return `(cachedEvaluate, count)`: `evaluate` with its results
+		stored in the `dict` `cache` (keyed on the point tuple), and a
+		function returning the number of points actually evaluated."""
+		nEvals = [0]
+		def cachedEvaluate(points):
+			keys = [tuple(p) for p in points.tolist()]
+			missing = [i for (i, key) in enumerate(keys) if key not in cache]
+			if missing:
+				for (i, val) in zip(missing, evaluate(points[missing]).tolist()):
+					cache[keys[i]] = val
+				nEvals[0] += len(missing)
+			return np.array([cache[key] for key in keys], dtype=float)
+		return cachedEvaluate, lambda: nEvals[0]
+
+	@staticmethod
+	def _neighbourhoodOffsets(n):
+		"""Return the `(3**n - 1, n)` array of step directions around a point.
+
+		Ordered as the original sequential search checked them (each
+		parameter unchanged, increased, then decreased, with the last
+		parameter varying fastest), without the all-zero offset.
+
+		"""
+		return np.array(list(itertools.product((0, 1, -1), repeat=n)), dtype=float)[1:]
+
+	@staticmethod
+	def _stepSizes(start, precision, useDynamicStepSize):
+		"""Return the starting and finest step sizes `(precs, maxPrecs)` of
+		each parameter, as used by `maximise`."""
+		maxPrecs = []
+		for p in start:
+			if p == 0:
+				maxPrecs.append(10**(-precision))
+			else:
+				maxPrecs.append(10 ** (math.floor( math.log10(abs(p)) ) - precision))
+		if useDynamicStepSize:
+			precs = []
+			for p in start:
+				if p == 0:
+					precs.append(1)
+				else:
+					precs.append(10 ** (math.floor( math.log10(abs(p)) )))
+		else: precs = maxPrecs
+		return precs, maxPrecs
+
+	@classmethod
+	def extremise(cls, f, start, domain, precision=5, test_domain_corners=True,
+				  useDynamicStepSize=True, *args, vectorized=False,
+				  maxEvaluations=None, tolerance=0, relativeTolerance=None,
+				  processes=None, useThreads=False, **kwargs):
+		"""Return the minimum and maximum values of `f(*params)` over `domain`,
+		as `minimise` and `maximise` would, in one pass.
+
+		From each starting point, the climbs towards the maximum and the
+		minimum share one cache of function values, so points (e.g. the
+		starting points and their first neighbourhoods) are only evaluated
+		once. The starting points are independent, so can be spread over a
+		pool.
+
+		Parameters
+		----------
+		f, start, domain, precision, test_domain_corners, useDynamicStepSize, vectorized, tolerance
+			As per `maximise`.
+		maxEvaluations : int
+			If given, stop searching before `f` has been asked for more than
+			this many points (split evenly between the starting points if
+			`processes` is used, unless there are more starting points than
+			this). Must be at least `1`.
+		relativeTolerance : float
+			If given, treat improvements of at most this fraction of the
+			current distance from `f(*start)` (the uncertainty) as no
+			improvement, and stop refining the step size once it no longer
+			improves by more than that. e.g. `1e-3` for bounds to about 3
+			significant figures.
+		processes : int
+			If given, spread the starting points over a pool of this size.
+			`f` must then be picklable (e.g. not a `lambda`) unless
+			`useThreads`.
+		useThreads : bool
+			Use a thread pool rather than a process pool, so that the
+			evaluation cache is shared between all starting points. Only
+			faster if `f` releases the GIL (e.g. large NumPy operations).
+
+		Returns
+		-------
+		:obj:`tuple` of :obj:`float`
+			`(minValue, maxValue)`
+
+		"""
+		if maxEvaluations is not None and maxEvaluations < 1:
+			raise ValueError("maxEvaluations must be at least 1, not {}".format(maxEvaluations))
+		if test_domain_corners:
+			starts = [tuple(start)] + list(itertools.product(*domain))
+		else: starts = [tuple(start)]
+		precs, maxPrecs = cls._stepSizes(start, precision, useDynamicStepSize)
+		domainArray = np.array(domain, dtype=float).reshape(len(start), 2)
+		search = (f, tuple(start), domainArray, precs, maxPrecs, useDynamicStepSize,
+				  vectorized, tolerance, relativeTolerance, args, kwargs)
+
+		if (processes is None or processes <= 1 or len(starts) == 1
+				or (maxEvaluations is not None and maxEvaluations < len(starts))):
+			results = [_extremiseStarts(*search, starts, maxEvaluations)]
+		else:
+			import concurrent.futures
+			if useThreads:
+				executorType, cache = concurrent.futures.ThreadPoolExecutor, {}
+			else:
+				executorType, cache = concurrent.futures.ProcessPoolExecutor, None
+			budget = None if maxEvaluations is None else maxEvaluations // len(starts)
+			with executorType(processes) as executor:
+				futures = [executor.submit(_extremiseStarts, *search, [s], budget, cache) for s in starts]
+				results = [future.result() for future in futures]
+		results = [r for r in results if r is not None]
+		return (float(min(r[0] for r in results)), float(max(r[1] for r in results)))
+
+	@classmethod
+	def minimise(cls, f, start, domain, precision=5, test_domain_corners=True,
+				 useDynamicStepSize=True, *args, vectorized=False,
+				 maxEvaluations=None, tolerance=0, **kwargs):
+		"""equivalently maximise -f"""
+		return -cls.maximise(
+			lambda *x, **kw: -f(*x, **kw),
+			start,
+			domain,
+			precision,
+			test_domain_corners,
+			useDynamicStepSize,
+			*args,
+			vectorized=vectorized,
+			maxEvaluations=maxEvaluations,
+			tolerance=tolerance,
+			**kwargs
+		)
+
+	@classmethod
+	def maximise(cls, f, start, domain, precision=5, test_domain_corners=True,
+				 useDynamicStepSize=True, *args, vectorized=False,
+				 maxEvaluations=None, tolerance=0, **kwargs):
+		"""Return the maximum value of function `f(*params)` over `domain` to
+		`precision`
+
+		It might be more useful to return the values that give the max value!
 		(NO, as multiple values might give the same maximum! (eg. if an
 		absolute value function of a plane -> a line of infinite values give
 		the same max)).
@@ -839,6 +1747,17 @@ class GeneralUncertainty(_Uncertainty_Prototype):
 			if True, this will start at a lower precision for each start value,
 			decreasing how much each parameter can change until the desired
 			precision is reached.
+		vectorized : bool
+			If True, `f` is called once per iteration with each parameter as
+			an `np.ndarray` of every candidate point (up to `3**n - 1` of
+			them), and must return an array of their values. Otherwise `f` is
+			called once per candidate point.
+		maxEvaluations : int
+			If given, stop searching before `f` has been evaluated at more
+			than this many points. Must be at least `1`.
+		tolerance : float
+			Only move to a point that improves the value by more than this.
+			Default `0`.
 
 		Notes
 		-----
@@ -862,98 +1781,134 @@ class GeneralUncertainty(_Uncertainty_Prototype):
 		#For now I'll assume everything is correct type
 
 		#Preparing
+		if maxEvaluations is not None and maxEvaluations < 1:
+			raise ValueError("maxEvaluations must be at least 1, not {}".format(maxEvaluations))
 		if test_domain_corners:
-			starting_points = asd.iterOverIterables([start], asd.permuteOptions(domain))
+			starting_points = itertools.chain([start], itertools.product(*domain))
 		else: starting_points = [start]
 
-		maxPrecs = []
-		for p in start:
-			if p == 0:
-				maxPrecs.append(10**(-precision))
-			else:
-				maxPrecs.append(10 ** (math.floor( math.log10(abs(p)) ) - precision))
-		if useDynamicStepSize:
-			precs = []
-			for p in start:
-				if p == 0:
-					precs.append(1)
-				else:
-					precs.append(10 ** (math.floor( math.log10(abs(p)) )))
-		else: precs = maxPrecs
+		precs, maxPrecs = cls._stepSizes(start, precision, useDynamicStepSize)
 
 		#Search
+		evaluate = cls._makeEvaluator(f, vectorized, args, kwargs)
+		offsets = cls._neighbourhoodOffsets(len(start))
+		domainArray = np.array(domain, dtype=float).reshape(len(start), 2)
+		nEvals = 0
 		maxPoints = [] #Keeps track of the parameter values, and function values. (Might be useful if I ever want the points)
 		for start in starting_points:
-			maxed = False
-			currentPoint = start
-			currentVal = f(*currentPoint, *args, **kwargs)
-			while not maxed:
-				#New points to check
-				oldPoint, oldVal = currentPoint, currentVal
-				perms = []
-				for p, d, prec in zip(currentPoint, domain, precs): #possible paramter values that are within domain
-					perm = [p]
-					if d[0] <= p + prec <= d[1]:
-						perm.append(p + prec)
-					if d[0] <= p - prec <= d[1]:
-						perm.append(p - prec)
-					perms.append(perm)
-
-				#Function value check
-				pointsGiveMax = True
-				for perm in asd.permuteOptions(perms):
-					newVal = f(*perm, *args, **kwargs)
-					if newVal > currentVal:
-						currentVal = newVal
-						currentPoint = perm
-						pointsGiveMax = False
-				if pointsGiveMax:
-					maxed = True
-				
-				#Adjust step sizes
-				if useDynamicStepSize:
-					for i, (oldParam, currentParam, prec, maxPrec) in enumerate(zip(oldPoint, currentPoint, precs, maxPrecs)):
-						if oldParam == currentParam and prec > maxPrec:
-							precs[i] = prec / 10 #I am concerned about losing precision in this value though...
-							maxed = False
-			maxPoints.append((currentPoint, currentVal))
+			if maxEvaluations is not None and nEvals >= maxEvaluations:
+				break
+			startVal = evaluate(np.array([start], dtype=float))[0]
+			nEvals += 1
+			budget = None if maxEvaluations is None else maxEvaluations - nEvals
+			point, val, n = cls._hillClimb(evaluate, start, startVal, domainArray,
+				precs, maxPrecs, useDynamicStepSize, offsets, budget, tolerance)
+			nEvals += n
+			maxPoints.append((point, val))
 		maxEstimate = max(maxPoints, key=lambda x: x[1])
-		return maxEstimate[1]
+		return float(maxEstimate[1])
+
+	@classmethod
+	def fullDomainExtrema(cls, f, domain, precision=5, *args, vectorized=False,
+						  tileSize=2**16, processes=None, **kwargs):
+		"""Return the minimum and maximum of `f(*params)` over a grid covering
+		the entire parameter space, and where they occur.
+
+		The grid steps each parameter by `precision` decimal places below the
+		most significant figure of the centre of its interval (and always
+		includes both ends of the interval). It is evaluated in tiles of at
+		most `tileSize` points, built with NumPy, so memory use is bounded
+		regardless of the grid size.
+
+		This is necessary for functions like f(x) = sin(x) * e^(-x)
+
+		Parameters
+		----------
+		f : function
+			Function to search. Must be picklable (e.g. not a `lambda`) if
+			`processes` is used.
+		domain : :obj:`tuple` of :obj:`tuple` of :obj:`float`
+			`(lower, upper)` closed interval of each parameter.
+		precision : int
+			Number of decimal places below the most significant figure of each
+			value is to be checked.
+		vectorized : bool
+			If True, `f` is called once per tile with each parameter as an
+			`np.ndarray`, and must return an array. Otherwise `f` is called
+			once per grid point.
+		tileSize : int
+			Maximum number of grid points evaluated at once.
+		processes : int
+			If given, spread the tiles over a process pool of this size.
+
+		Returns
+		-------
+		:obj:`tuple`
+			`((minValue, minPoint), (maxValue, maxPoint))`, where each point
+			is a tuple of parameter values.
+
+		Notes
+		-----
+		The grid has `prod((upper-lower)/step + 1)` points, which grows very
+		quickly with the number of parameters and `precision`.
+
+		"""
+		axes = []
+		for (p_lower, p_upper) in domain:
+			p = (p_lower + p_upper) / 2
+			if p == 0:
+				prec = 10**(-precision)
+			else:
+				prec = 10 ** (math.floor( math.log10(abs(p)) ) - precision)
+			n = int(math.floor((p_upper - p_lower) / prec + 1e-9)) + 1
+			axis = p_lower + prec * np.arange(n)
+			if axis[-1] < p_upper:
+				axis = np.append(axis, p_upper)
+			axes.append(axis)
+		nPoints = int(np.prod([len(axis) for axis in axes]))
+
+		if processes is None or processes <= 1:
+			results = [_fullDomainTiles(f, axes, 0, nPoints, tileSize, vectorized, args, kwargs)]
+		else:
+			import concurrent.futures
+			nBlocks = min(nPoints, 4*processes)
+			bounds = np.linspace(0, nPoints, nBlocks + 1).astype(int)
+			with concurrent.futures.ProcessPoolExecutor(processes) as executor:
+				futures = [executor.submit(_fullDomainTiles, f, axes, int(start), int(stop), tileSize, vectorized, args, kwargs)
+						   for (start, stop) in zip(bounds[:-1], bounds[1:]) if stop > start]
+				results = [future.result() for future in futures]
+
+		minVal, minIndex = min(((r[0], r[1]) for r in results), key=lambda x: x[0])
+		maxVal, maxIndex = max(((r[2], r[3]) for r in results), key=lambda x: x[0])
+		shape = tuple(len(axis) for axis in axes)
+		def point(index):
+			coords = np.unravel_index(index, shape)
+			return tuple(float(axis[c]) for (axis, c) in zip(axes, coords))
+		return ((minVal, point(minIndex)), (maxVal, point(maxIndex)))
 
 	@classmethod
 	def minimise_fullDomainCheck(cls, f, domain, precision=5, *args, **kwargs):
-		"""equivalently maximise -f"""
-		return -cls.maximise_fullDomainCheck(lambda *x: -f(*x), domain, precision, *args, **kwargs)
+		"""Return the minimum of `f` over the entire parameter space. See
+		`fullDomainExtrema`."""
+		return cls.fullDomainExtrema(f, domain, precision, *args, **kwargs)[0][0]
 
 	@classmethod
 	def maximise_fullDomainCheck(cls, f, domain, precision=5, *args, **kwargs):
 		"""Maximises the function by manually checking the ENTIRE parameter space
 		
-		Assumes <domain> is an iterable of closed intervals
+		Assumes <domain> is an iterable of closed intervals. See
+		`fullDomainExtrema`.
 
 		This is necessary for functions like f(x) = sin(x) * e^(-x)
 		"""
-		precs = []
-		for (p_lower,p_upper) in domain:
-			p = (p_lower + p_upper) / 2
-			if p == 0:
-				precs.append(10**(-precision))
-			else:
-				precs.append(10 ** (math.floor( math.log10(abs(p)) ) - precision))
-		precs = tuple(precs)
-		start = tuple([d[0] for d in domain])
-		stop = tuple([d[1]+prec for (d,prec) in zip(domain, precs)])
-		maxVal = f(*start, *args, **kwargs)
-		for point in asd.multirange(start, stop, precs, allowFloats=True):
-			val = f(*point, *args, **kwargs)
-			if val > maxVal:
-				maxVal = val
-		return maxVal
+		return cls.fullDomainExtrema(f, domain, precision, *args, **kwargs)[1][0]
 
 	@classmethod
 	def estimateUncertainty(cls, f, uncertaintyArgs, precision=5, 
 							test_domain_corners=False, fullDomainCheck=False,
-							useDynamicStepSize=True, *args, **kwargs):
+							useDynamicStepSize=True, *args, vectorized=False,
+							maxEvaluations=None, tolerance=0, relativeTolerance=None,
+							processes=None, useThreads=False, **kwargs):
 		"""Return the uncertainty object that results from passing the
 		`GeneralUncertainty` instances `uncertaintyArgs` through function `f`.
 		
@@ -985,8 +1940,31 @@ class GeneralUncertainty(_Uncertainty_Prototype):
 			value, decreasing how much each parameter cane change until the
 			desired precision is reached. (Only used if 
 			`fullDomainCheck==False`)
+		vectorized : bool
+			If `True`, `f` accepts and returns `np.ndarray`s, so that many
+			points are evaluated per call.
+		maxEvaluations, tolerance, relativeTolerance, useThreads : optional
+			Passed to `extremise`. (Only used if `fullDomainCheck==False`)
+		processes : int
+			Spread the search over a pool of this size. See `extremise` and
+			`fullDomainExtrema`.
+
+		Notes
+		-----
+		If `GeneralUncertainty.estimateCache` is set (see `EstimateCache`),
+		a previous result for the same `f`, measurements and options is
+		returned without searching again.
 
 		"""
+		cache = cls.estimateCache
+		if cache is not None:
+			options = (precision, test_domain_corners, fullDomainCheck, useDynamicStepSize,
+					   vectorized, maxEvaluations, tolerance, relativeTolerance)
+			key = cache.makeKey(f, uncertaintyArgs, options, args, kwargs)
+			result = cache.lookup(key)
+			if result is not None:
+				return cls(result) # a copy, as measurements are mutable
+
 		vals = []
 		uncertaintyArgs_limits = []
 		for measurement in uncertaintyArgs:
@@ -996,12 +1974,19 @@ class GeneralUncertainty(_Uncertainty_Prototype):
 
 		Z = f(*vals, *args, **kwargs)
 		if fullDomainCheck:
-			z_lower = Z - cls.minimise_fullDomainCheck(f, uncertaintyArgs_limits, precision, *args, **kwargs)
-			z_upper = cls.maximise_fullDomainCheck(f, uncertaintyArgs_limits, precision, *args, **kwargs) - Z
+			(z_min, _), (z_max, _) = cls.fullDomainExtrema(f, uncertaintyArgs_limits, precision, *args, vectorized=vectorized, processes=processes, **kwargs)
+			z_lower = Z - z_min
+			z_upper = z_max - Z
 		else:
-			z_lower = Z - cls.minimise(f, vals, uncertaintyArgs_limits, precision, test_domain_corners, useDynamicStepSize,  *args, **kwargs)
-			z_upper = cls.maximise(f, vals, uncertaintyArgs_limits, precision, test_domain_corners, useDynamicStepSize, *args, **kwargs) - Z
-		return cls(Z, (z_lower, z_upper))
+			searchKwargs = {'vectorized': vectorized, 'maxEvaluations': maxEvaluations, 'tolerance': tolerance,
+							'relativeTolerance': relativeTolerance, 'processes': processes, 'useThreads': useThreads}
+			z_min, z_max = cls.extremise(f, vals, uncertaintyArgs_limits, precision, test_domain_corners, useDynamicStepSize, *args, **searchKwargs, **kwargs)
+			z_lower = Z - z_min
+			z_upper = z_max - Z
+		result = cls(Z, (z_lower, z_upper))
+		if cache is not None:
+			cache.store(key, cls(result))
+		return result
 
 
 	## PROPERTIES ##
@@ -1061,11 +2046,16 @@ class GeneralUncertainty(_Uncertainty_Prototype):
 
 
 	## OPERATIONS ##
+	def _applyUnary(self, f, derivative):
+		"""Not supported: the bounds of a general measurement need the
+		search of `estimateUncertainty`, not a derivative."""
+		return NotImplemented
+
 	def __neg__(self):
 		# To see why the uncertainty gets flipped, consider reflecting a point
 		# on the x-axis that has an uncertainty. The furthermost uncertainty
 		# should remain the furmost uncertainty after reflection.
-		return type(self)(-self.val, (self.unc[1], self.unc[0]))
+		return self._fromValUnc(-self.val, (self.unc[1], self.unc[0]))
 
 	def __add__(self, other):
 		A, a = self.val, self.unc
@@ -1074,61 +2064,92 @@ class GeneralUncertainty(_Uncertainty_Prototype):
 		except TypeError:
 			return NotImplemented
 		B, b = other.val, other.unc
-		return type(self)(A+B, (a[0]+b[0], a[1]+b[1]))
+		return self._fromValUnc(A+B, (a[0]+b[0], a[1]+b[1]))
 
 	def __sub__(self, other):
-		#This one can be written explicitly
+		#This one can be written explicitly. The lowest value of A-B uses the
+		#highest B, and vice versa
 		A, a = self.val, self.unc
 		try:
 			other = type(self)(other)
 		except TypeError:
 			return NotImplemented
 		B, b = other.val, other.unc
-		return type(self)(A-B, (a[0]+b[0], a[1]+b[1]))
+		return self._fromValUnc(A-B, (a[0]+b[1], a[1]+b[0]))
 
+	# The bounds of these follow directly from interval arithmetic (see
+	# `_intervalMul` etc.), so no search is needed.
 	def __mul__(self, other):
-		#This one can't be done explicitly, but can be done simply
 		try:
 			other = type(self)(other)
 		except TypeError:
 			return NotImplemented
-		Z = self.val*other.val
-		self_extrema = [self.val-self.unc[0], self.val+self.unc[1]]
-		other_extrema = [other.val-other.unc[0], other.val+other.unc[1]]
-		result_extrema = []
-		for (Aa,Bb) in asd.permuteOptions([self_extrema, other_extrema]):
-			result_extrema.append(Aa*Bb)
-		z_min = Z - min(result_extrema)
-		z_max = max(result_extrema) - Z
-		return type(self)(Z, (z_min, z_max))
+		lower, upper = _intervalMul(*self.bounds(), *other.bounds())
+		return self._fromBounds(self.val*other.val, lower, upper)
 
 	def __truediv__(self, other):
 		try:
 			other = type(self)(other)
 		except TypeError:
 			return NotImplemented
-		return self.estimateUncertainty(lambda x,y: x/y, (self,other))
+		return self._divide(self, other)
 
 	def __rtruediv__(self, other):
 		try:
 			other = type(self)(other)
 		except TypeError:
 			return NotImplemented
-		return self.estimateUncertainty(lambda x,y: y/x, (self,other))
+		return self._divide(other, self)
 
 	def __pow__(self, other):
 		try:
 			other = type(self)(other)
 		except TypeError:
 			return NotImplemented
-		return self.estimateUncertainty(lambda x,y: x**y, (self,other))
+		return self._power(self, other)
 
 	def __rpow__(self, other):
 		try:
 			other = type(self)(other)
 		except TypeError:
 			return NotImplemented
-		return self.estimateUncertainty(lambda x,y: y**x, (self,other))
+		return self._power(other, self)
+
+	@classmethod
+	def _divide(cls, x, y):
+		"""Return `x/y`. A divisor interval containing zero gives unbounded
+		uncertainties."""
+		lower, upper = _intervalDiv(*x.bounds(), *y.bounds())
+		return cls._fromBounds(x.val / y.val, lower, upper) # x.val/0 raises ZeroDivisionError
+
+	@classmethod
+	def _power(cls, x, y):
+		"""Return `x**y`. Bases that may be negative are only supported for
+		exact integer exponents."""
+		val = x.val ** y.val # 0**negative raises ZeroDivisionError
+		lower, upper = _intervalPow(*x.bounds(), *y.bounds())
+		if math.isnan(lower):
+			raise ValueError("{0}**{1} is complex for some values within the uncertainties, so cannot be calculated".format(x, y))
+		return cls._fromBounds(val, lower, upper)
+
+	@classmethod
+	def _fromBounds(cls, val, lower, upper):
+		"""Return `val` with the uncertainty reaching the bounds
+		`[lower, upper]`."""
+		return cls._fromValUnc(val, (max(float(val - lower), 0.0), max(float(upper - val), 0.0)))
+
+
+	## METHODS ##
+	def bounds(self):
+		"""Return the lowest and highest values the measurement could take.
+
+		Returns
+		-------
+		:obj:`tuple` of :obj:`float`
+			`(val - unc[0], val + unc[1])`
+
+		"""
+		return (self.val - self.unc[0], self.val + self.unc[1])
 
 
 	## TYPECASTING AND DISPLAYING ##
@@ -1136,331 +2157,3087 @@ class GeneralUncertainty(_Uncertainty_Prototype):
 		return "<-{0} | {1} | +{2}>".format(self.unc[0], self.val, self.unc[1])
 		
 
-class FileHandler:
-	"""Handle files of uncertainty data
-
-	This version of FileHandler uses csv and stores data in pandas Dataframes,
-	and returns the Dataframe.
+class UncertaintyArray:
+	"""Base class for arrays of measurements stored as a structure of arrays.
+
+	Rather than an array of measurement objects, an `UncertaintyArray` keeps
+	one `np.ndarray` of values and one of uncertainties, so operations are
+	evaluated by NumPy over the whole array at once. Subclasses use exactly
+	the same propagation formulas as their scalar counterparts.
+
+	Operations are supported between arrays of the same class, the scalar
+	measurement class (`_scalarType`) and plain numbers or numeric arrays,
+	with NumPy broadcasting rules.
+
+	The storage `dtype` is chosen when an array is created:
+	- `float64` (default)
+	- `float32` : half the memory and bandwidth, for data that doesn't need
+	  more than ~7 significant figures
+	- `'exact'` : an `object` array of `fractions.Fraction` (`Decimal`, `int`,
+	  `str` and `float` inputs are converted exactly). Values stay exact
+	  through `+`, `-`, `*`, `/` and integer powers. Anything irrational (the
+	  square roots of `Incoherent` uncertainties, logarithms, non-integer
+	  powers, NumPy functions such as `np.sin`) is evaluated in float64 and
+	  converted back to a `Fraction`. `nan` and infinities have no exact
+	  form, so are stored as `float`s.
+
+	When dtypes are mixed in an operation:
+	- float32 and float64 arrays follow NumPy promotion, so the result is
+	  float64. Python scalars (and scalar measurements) don't promote, so a
+	  float32 array stays float32.
+	- exact arrays with scalars of any kind, or other exact arrays, stay
+	  exact (float scalars are converted exactly, so use e.g.
+	  `Fraction('0.1')` for decimal constants).
+	- exact arrays with float arrays give float64, as the exactness has
+	  already been lost.
 
-	<inFilePath> must be the complete path (e.g. starting with C:/Users/ ...)
+	Notes
+	-----
+	Unlike the scalar classes, division by zero follows NumPy semantics
+	(`inf`/`nan` plus a `RuntimeWarning`) rather than raising. `nan` values
+	are allowed, and are used to represent missing measurements. Scalar
+	measurements taken from an array (e.g. by indexing) are always `float`.
 
-	.csv formatted as:
-		variable1,       scale1, varaible2,       scale2, variable3,       scale3, ...
-		   value1, uncertainty1,    value1, uncertainty1,    value1, uncertainty1, ... 
-		   value2, uncertainty2,    value2, uncertainty2,    value2, uncertainty2, ... 
+	In-place operators (`+=`, `*=` etc.) write into the existing `val` and
+	`unc` arrays (so views of them see the update), keeping the dtype of
+	`self`. Where possible the result is computed straight into them with
+	NumPy's `out=`, without temporary arrays.
 
-	IMPROVEMENTS:
-	- turn this into a wrapper for a DataFrame object - inherits all functions etc.
-	  from pd.DataFrame, but just acts on the .df attribute
-	  https://stackoverflow.com/questions/1443129/completely-wrap-an-object-in-python
 	"""
 
-	## CONSTRUCTOR ##
-	def __init__(self, inFilePath, columnOffset = 0, rowOffset = 0, uncertaintyType = "Incoherent"):
-		raise NotImplementedError("This behaviour is not ready, and will hopefully be the basis of 0.3.0")
-		self.df, self._extra_info = self.load(inFilePath, columnOffset, rowOffset, uncertaintyType)
-
+	_scalarType = None
 
+	## CLASSMETHODS ##
 	@classmethod
-	def load(cls, inFilePath, columnOffset = 0, rowOffset = 0, uncertaintyType = "Incoherent"):
-		"""Return the data. 
-		
-		This should also return an 'extra data' array that just contains all
-		the unused stuff in the .csv file - that way you can write it back it.
-		(just the headers - I had a better idea for extra cols)
+	def _fromArrays(cls, val, unc):
+		"""Construct from `val` and `unc` without any validation.
 
-		Parameters
-		----------
-		inFilePath : str
-			FULL directory path to the csv file
-		columnOffset : int
-			Zero-based index of the column to start reading from (NOTE: this
-			must include the variable headers)
-		rowOffset : int
-			Zero-based index of the row to start reading from
-		uncertaintyType : str
-			`"Incoherent"` or `"Coherent"`
+		Used for the results of operations, which are known to be valid.
+		`val` and `unc` are broadcast against each other if necessary.
 
-		Returns
-		-------
-		pandas.DataFrame
-			Compiled data (using the specified uncertainty class)
-		:obj:`dict` of :obj:`list` and :obj:`dict`
-			Extra_info dict (which can be edited to change what prefix measurements get saved as). Used to export the
-			data back to a .csv.
-			
 		"""
-		# TYPECHECKING
-		if not isinstance(inFilePath, str):
-			raise TypeError("inFilePath must be a string, not a, '{}'".format(type(inFilePath)))
-		if inFilePath[-4:] != ".csv":
-			raise ValueError("inFile must be a .csv")
-		if not os.path.exists(inFilePath):
-			print("The specified file '{}' does not exist. This may be caused by using '\' instead of '/'".format(inFilePath))
-		if not isinstance(columnOffset, int):
-			raise TypeError("<columnStart> must be of type '{0}' not type '{1}'".format(int, type(columnOffset)))
-		if not isinstance(rowOffset, int):
-			raise TypeError("<columnStart> must be of type '{0}' not type '{1}'".format(int, type(rowOffset)))
-		if uncertaintyType not in ["Coherent", "Incoherent"]:
-			raise ValueError("uncertaintyType must be 'Coherent' or 'Incoherent'")
-
-		# DATA
-		with open(inFilePath, "r") as infile:
-			reader = csv.reader(infile)
-			header_lines = []
-			for i in range(rowOffset): 
-				header_lines.append(next(reader))
-			lineNumber = rowOffset + 1
-
-			# VARIABLE VALIDATION
-			variables = cls._prepareVariableLine(next(reader)[columnOffset:], lineNumber)
-			lineNumber += 1
-			
-			# LOADING DATA
-			data = []
-			for row in reader:
-				data.append(cls._prepareDataLine(row[columnOffset:], variables, lineNumber, uncertaintyType))
-				lineNumber += 1
-		df = pd.DataFrame(data, columns=variables[::2])
-		extra_cols = pd.read_csv(inFilePath, 
-								usecols=list(range(columnOffset)),
-								skiprows=rowOffset)
-		combined_df = extra_cols.merge(df, left_index=True, right_index=True)
-
-		# EXTRAS
-		extra_info = {'header_lines': header_lines, 'columnOffset':columnOffset}
-		col_scales = {}
-		for variable, scale in zip(variables[::2], variables[1::2]):
-			col_scales[variable] = scale
-		extra_info['col_scales'] = col_scales
-
-		return combined_df, extra_info
-
-	@staticmethod
-	def _prepareVariableLine(variables, lineNumber):
-		"""Prepare the variables line in the file. 
+		self = object.__new__(cls)
+		if np.shape(val) != np.shape(unc):
+			val, unc = np.broadcast_arrays(val, unc)
+			val, unc = val.copy(), unc.copy()
+		val, unc = np.asarray(val), np.asarray(unc)
+		if val.dtype == object or unc.dtype == object:
+			val, unc = _toExact(val), _toExact(unc) # e.g. Fraction**Fraction can give a float
+		elif val.dtype != unc.dtype:
+			dtype = np.result_type(val, unc)
+			val, unc = val.astype(dtype, copy=False), unc.astype(dtype, copy=False)
+		self._val = val
+		self._unc = unc
+		return self
 
-		TODO:
-		- update this to 0.2.2 (doesn't need to prepare for a StringExpression anymore)
+	@classmethod
+	def _getOtherValueUnc(cls, other):
+		"""Return the appropriate `(value, unc)` tuple of `other`.
 
 		Parameters
 		----------
-		variables : str
-			Line for the variables, directly read from the file without
-			adjustment.
-		lineNumber : int
-			Line in the file, for error messages.
-		
+		other : any
+
 		Returns
 		-------
-		list
-			In the same order as the file: `["variable", scale, "variable",
-			scale, ...]`
+		:obj:`tuple`
+			2-tuple of `(value, unc)` if `other` can be intepreted as a
+			measurement (array).
 
 		Raises
 		------
-		ValueError
-			If the variables have invalid characters.
-
+		TypeError
+			Indicates that `other` cannot be interpreted as a measurement.
+		
 		"""
-		if len(variables) % 2 != 0:
-			raise ValueError("The variables line in the file must have 'variable, scale' pairs (ie 2 columns per variable)")
-
-		for i in range(0, len(variables), 2):
-			var = variables[i]
-			for char in "()^*/+-":
-				if char in var:
-					raise ValueError("Variable '{0}' contains an illegal character: '{1}' on line {2}".format(var, char, lineNumber))
+		if isinstance(other, cls): return (other._val, other._unc)
+		if isinstance(other, cls._scalarType): return (other.val, other.unc)
+		if isinstance(other, (int, float, np.number, fractions.Fraction, decimal.Decimal)): return (other, 0.0)
+		if isinstance(other, np.ndarray) and other.dtype.kind in 'iuf':
+			return (other, 0.0)
+		raise TypeError("'{}' cannot be interpreted as a measurement".format(type(other)))
 
-			if variables[i] == "":
-				raise ValueError("Cannot have a variable that is a blank string. Please check your headers and try again (there should be a value every 2 columns, starting with the 1st column)")
-			if variables[i] in variables[:i] + variables[i+1:]:
-				raise ValueError("Cannot have two variables in the data with the same name. '{}'".format(variables[i]))
+	@staticmethod
+	def _storageDtype(dtype):
+		"""Return the `np.dtype` that arrays of `dtype` are stored as.
 
-			scale = variables[i+1]
-			try:
-				scale = float(scale)
-				variables[i+1] = scale
-			except ValueError:
-				if not _Uncertainty_Prototype.isValidPrefix(scale):
-					raise ValueError("scale '" + scale + "' must be a number or any of " + str(_Uncertainty_Prototype.validPrefixes()))
+		Parameters
+		----------
+		dtype : any
+			`None` (float64), float32, float64, or `'exact'` (also `object`,
+			`fractions.Fraction` or `decimal.Decimal`).
 
-		return variables
+		"""
+		if dtype is None: return np.dtype(np.float64)
+		if (isinstance(dtype, str) and dtype == 'exact') or dtype in (object, fractions.Fraction, decimal.Decimal):
+			return np.dtype(object)
+		try:
+			storage = np.dtype(dtype)
+		except TypeError:
+			storage = None
+		if storage not in (np.dtype(np.float32), np.dtype(np.float64), np.dtype(object)):
+			raise ValueError("dtype must be float32, float64 or 'exact', not '{}'".format(dtype))
+		return storage
 
 	@staticmethod
-	def _prepareDataLine(row, variables, lineNumber, uncertaintyType):
-		"""Prepare a row, assuming <lineVariables> is in the same order as
-		read in. 
+	def _asStorage(x, dtype):
+		"""Return `x` as an array of the storage `dtype` (as returned by
+		`_storageDtype`)."""
+		if dtype == object: return _toExact(x)
+		return np.asarray(x, dtype=dtype)
+
+	def _inPlaceOperands(self, other, exactOnly = False):
+		"""Return `(B, b)` of `other` if an in-place operation with it can be
+		computed straight into the float storage of `self`, otherwise `None`
+		(for exact storage, if the result would have another shape, or if
+		`other` may share memory with the storage, e.g. `x += x`).
 
 		Parameters
 		----------
-		row : str
-			Row to prepare.
-		variables : :obj:`list` of :obj:`str`
-			Variables in the line, including the scale (`""`, a number, or one
-			of `Uncertainty.__prefixes.keys()`)
-		lineNumber : int
-			Line in the file, for error messages.
-
-		Returns
-		-------
-		list
+		other : any
+		exactOnly : :obj:`bool`, optional
+			Also return `None` if `other` has an uncertainty. Default `False`.
+
+		Raises
+		------
+		TypeError
+			Indicates that `other` cannot be interpreted as a measurement.
+
+		"""
+		B, b = self._getOtherValueUnc(other)
+		if self._val.dtype == object or _isExact(B):
+			return None
+		if exactOnly and not (np.ndim(b) == 0 and b == 0):
+			return None
+		try:
+			if np.broadcast_shapes(self.shape, np.shape(B), np.shape(b)) != self.shape:
+				return None
+		except ValueError:
+			return None # the out of place operation raises
+		for x in (B, b):
+			if isinstance(x, np.ndarray) and (np.may_share_memory(x, self._val) or np.may_share_memory(x, self._unc)):
+				return None # it would be overwritten before it is read
+		return (B, b)
+
+	def _operands(self, other):
+		"""Return `(A, a, B, b)`, the values and uncertainties of `self` and
+		`other`, converted as per the rules for mixing dtypes.
+
+		Raises
+		------
+		TypeError
+			Indicates that `other` cannot be interpreted as a measurement.
+
+		"""
+		A, a = self._val, self._unc
+		B, b = self._getOtherValueUnc(other)
+		if A.dtype == object:
+			if np.ndim(B) > 0 and B.dtype.kind == 'f':
+				return (A.astype(np.float64), a.astype(np.float64), B, b)
+			return (A, a, _toExact(B), _toExact(b))
+		if _isExact(B):
+			if np.ndim(B) == 0:
+				return (A, a, float(B), float(b))
+			return (A, a, np.asarray(B, dtype=np.float64), np.asarray(b, dtype=np.float64))
+		return (A, a, B, b)
+
+	@classmethod
+	def fromMeasurements(cls, measurements, dtype = None):
+		"""Create an array from an iterable of scalar measurements.
+
+		Parameters
+		----------
+		measurements : iterable
+			Measurements of type `cls._scalarType`. If called on
+			`UncertaintyArray` itself, the array class is chosen by the type
+			of the first measurement.
+		dtype : :obj:`str`, optional
+			Storage dtype, see `UncertaintyArray`. Default float64.
+
+		Returns
+		-------
+		UncertaintyArray
+
+		"""
+		measurements = list(measurements)
+		if cls._scalarType is None:
+			if len(measurements) == 0:
+				raise ValueError("cannot infer the array type from no measurements")
+			for arrayType in (CoherentUncertaintyArray, IncoherentUncertaintyArray):
+				if type(measurements[0]) == arrayType._scalarType:
+					return arrayType.fromMeasurements(measurements, dtype)
+			raise TypeError("no array type exists for '{}'".format(type(measurements[0])))
+
+		for m in measurements:
+			if type(m) != cls._scalarType:
+				raise TypeError("all measurements must be of type '{0}', not '{1}'".format(cls._scalarType, type(m)))
+		val = np.fromiter((m.val for m in measurements), dtype=float, count=len(measurements))
+		unc = np.fromiter((m.unc for m in measurements), dtype=float, count=len(measurements))
+		dtype = cls._storageDtype(dtype)
+		return cls._fromArrays(cls._asStorage(val, dtype), cls._asStorage(unc, dtype))
+
+
+	## PROPERTIES ##
+	@property
+	def val(self):
+		""":obj:`np.ndarray`: Values of the measurements."""
+		return self._val
+
+	@val.setter
+	def val(self, value):
+		value = self._asStorage(value, self._val.dtype)
+		if value.shape != self._unc.shape:
+			raise ValueError("value must have shape {0}, not {1}".format(self._unc.shape, value.shape))
+		self._val = value
+
+	@property
+	def unc(self):
+		""":obj:`np.ndarray`: Uncertainties of the measurements."""
+		return self._unc
+
+	@unc.setter
+	def unc(self, value):
+		value = self._asStorage(value, self._unc.dtype)
+		if value.shape != self._val.shape:
+			raise ValueError("uncertainty must have shape {0}, not {1}".format(self._val.shape, value.shape))
+		if np.any(value < 0):
+			raise ValueError("uncertainties must be positive")
+		self._unc = value
+
+	@property
+	def dtype(self):
+		""":obj:`np.dtype`: Storage dtype of the values and uncertainties
+		(`object` for exact arrays)."""
+		return self._val.dtype
+
+	@property
+	def shape(self):
+		""":obj:`tuple`: Shape of the array."""
+		return self._val.shape
+
+	@property
+	def ndim(self):
+		""":obj:`int`: Number of array dimensions."""
+		return self._val.ndim
+
+	@property
+	def size(self):
+		""":obj:`int`: Number of measurements in the array."""
+		return self._val.size
+
+
+	## CONSTRUCTOR ##
+	def __init__(self, val, unc = 0, scale = 1, dtype = None):
+		"""Initialise an array of measurements: `val+-unc * scale`
+
+		Parameters
+		----------
+		val : array_like
+			The measured values.
+		unc : :obj:`array_like`, optional
+			The associated uncertainties, broadcast against `val`. Default
+			`0`.
+		scale : :obj:`float`, :obj:`str`, optional
+			The scale of both `val` and `unc`. Can either be a number or a
+			valid prefix. Default `1`.
+		dtype : :obj:`str`, optional
+			Storage dtype: `'float64'` (default), `'float32'` or `'exact'`.
+			See `UncertaintyArray`.
+
+		"""
+		if type(self) == UncertaintyArray:
+			raise TypeError("UncertaintyArray cannot be instantiated directly, use a subclass")
+		scale = _Uncertainty_Prototype.prefixToScale(scale)
+		dtype = self._storageDtype(dtype)
+		val = self._asStorage(val, dtype)
+		unc = self._asStorage(unc, dtype)
+		if dtype == object:
+			scale = fractions.Fraction(repr(float(scale))) # e.g. 1/1000 for 'm', not the nearest float
+		if scale != 1:
+			val = val * scale
+			unc = unc * scale
+		if np.any(unc < 0):
+			raise ValueError("uncertainties must be positive")
+		shape = np.broadcast_shapes(val.shape, unc.shape)
+		self._val = np.array(np.broadcast_to(val, shape))
+		self._unc = np.array(np.broadcast_to(unc, shape))
+
+
+	## CONTAINER METHODS ##
+	def __getitem__(self, key):
+		val, unc = self._val[key], self._unc[key]
+		if np.ndim(val) == 0:
+			return self._scalarType._fromValUnc(float(val), float(unc))
+		return self._fromArrays(val, unc)
+
+	def __setitem__(self, key, value):
+		try: B, b = self._getOtherValueUnc(value)
+		except TypeError:
+			raise TypeError("cannot assign type '{0}' to a '{1}'".format(type(value), type(self).__name__))
+		if np.any(np.asarray(b) < 0):
+			raise ValueError("uncertainties must be positive")
+		if self._val.dtype == object:
+			B, b = _toExact(B), _toExact(b)
+			B, b = (B[()] if B.ndim == 0 else B), (b[()] if b.ndim == 0 else b) # not as a 0-d array element
+		self._val[key] = B
+		self._unc[key] = b
+
+	def __iter__(self):
+		for i in range(len(self)):
+			yield self[i]
+
+	def __len__(self): return len(self._val)
+
+
+	## OPERATIONS ##
+	def __abs__(self): return self._fromArrays(np.abs(self._val), self._unc.copy())
+
+	def __pos__(self): return self.copy()
+
+	def __neg__(self): return self._fromArrays(-self._val, self._unc.copy())
+
+	def __radd__(self, b): return self.__add__(b)
+
+	def __rsub__(self, b): return (-self).__add__(b)
+
+	def __rmul__(self, b): return self.__mul__(b)
+
+	def __eq__(self, b):
+		"""Elementwise equality check, returning an array of `bool`."""
+		try: A, a, B, b = self._operands(b)
+		except TypeError: return NotImplemented
+		return (A == B) & (a == b)
+
+	def __ne__(self, b):
+		result = self == b
+		if result is NotImplemented: return result
+		return ~result
+
+	# Subclasses override `__iadd__`, `__isub__`, `__imul__` and
+	# `__itruediv__` to compute into the storage directly where possible.
+	def __ipow__(self, b): return self._update(self.__pow__(b))
+
+	def _update(self, result):
+		"""Write `result` into the storage of `self`, and return `self`.
+
+		`result` is returned unchanged if it is of another type (or
+		`NotImplemented`), so that the in-place operation falls back to
+		rebinding the name as an out of place operation would.
+
+		Raises
+		------
+		ValueError
+			If `result` doesn't have the shape of `self`.
+
+		"""
+		if type(result) is not type(self): return result
+		if result.shape != self.shape:
+			raise ValueError("non-broadcastable output operand with shape {0} doesn't match the broadcast shape {1}".format(self.shape, result.shape))
+		self._val[...] = self._asStorage(result._val, self._val.dtype)
+		self._unc[...] = self._asStorage(result._unc, self._unc.dtype)
+		return self
+
+
+	## METHODS ##
+	def astype(self, dtype):
+		"""Return a copy of the array stored as `dtype`.
+
+		Parameters
+		----------
+		dtype : str
+			`'float64'`, `'float32'` or `'exact'`. See `UncertaintyArray`.
+
+		Returns
+		-------
+		UncertaintyArray
+
+		"""
+		dtype = self._storageDtype(dtype)
+		return self._fromArrays(self._asStorage(self._val, dtype).copy(), self._asStorage(self._unc, dtype).copy())
+
+	def copy(self):
+		"""Return a copy of the array (with copies of `val` and `unc`)."""
+		return self._fromArrays(self._val.copy(), self._unc.copy())
+
+	def maxVal(self):
+		"""Return the maximum values the measurements could take.
+
+		Returns
+		-------
+		np.ndarray
+
+		"""
+		return self._val + self._unc
+
+	def minVal(self):
+		"""Return the minimum values the measurements could take.
+
+		Returns
+		-------
+		np.ndarray
+
+		"""
+		return self._val - self._unc
+
+	def percent(self):
+		"""Return the percentage uncertainties (uncertainty/value).
+
+		Returns
+		-------
+		np.ndarray
+
+		"""
+		return _divide(self._unc, self._val)
+
+	def findBestPrefix(self):
+		"""Return the best prefix of each measurement, as per
+		`CoherentUncertainty.findBestPrefix`.
+
+		Returns
+		-------
+		np.ndarray
+			`object` array of `str`
+
+		"""
+		return self._scalarType.findBestPrefixes(self._val)
+
+	def reprWithPrefix(self, prefix = None):
+		"""Return the representation of each measurement with the best
+		prefix (or `prefix`), as per `CoherentUncertainty.reprWithPrefix`,
+		formatting the whole array at once.
+
+		Parameters
+		----------
+		prefix : :obj:`str`, optional
+			If specified, use this prefix for every measurement.
+
+		Returns
+		-------
+		np.ndarray
+			Array of `str`
+
+		"""
+		if prefix is not None:
+			if not self._scalarType.isValidPrefix(prefix):
+				raise ValueError("'{}' isn't a valid prefix".format(prefix))
+			prefixes = np.full(self.shape, prefix, dtype=object)
+			suffix = np.char.add(" prefix:", prefix)
+		else:
+			prefixes = self.findBestPrefix()
+			suffix = np.where(prefixes == '', '', np.char.add(" | prefix:", prefixes.astype(str)))
+		uniquePrefixes, inverse = np.unique(prefixes.astype(str), return_inverse=True)
+		scales = np.array([self._scalarType.prefixToScale(p) for p in uniquePrefixes], dtype=float)[inverse].reshape(self.shape)
+		valStrings = np.char.add(np.char.add((self._val / scales).astype(str), " +- "), (self._unc / scales).astype(str))
+		return np.char.add(valStrings, suffix)
+
+	def toMeasurements(self):
+		"""Return a flat list of scalar measurements.
+
+		Returns
+		-------
+		:obj:`list` of `_scalarType`
+
+		"""
+		fromValUnc = self._scalarType._fromValUnc
+		val, unc = np.asarray(self._val, dtype=float), np.asarray(self._unc, dtype=float)
+		return [fromValUnc(v, u) for (v, u) in zip(val.ravel().tolist(), unc.ravel().tolist())]
+
+
+	## REDUCTIONS ##
+	# Sums use `np.sum` (pairwise summation) and spreads are taken about the
+	# mean, so these are accurate for large arrays. See `RunningStatistics`
+	# for the same reductions over data arriving in chunks.
+	def chiSquared(self, expected = None, axis = None):
+		"""Return the chi-squared of the values about `expected`, weighted by
+		the uncertainties, to test whether they are consistent.
+
+		Parameters
+		----------
+		expected : :obj:`float` or array_like, optional
+			Default: the weighted mean (along `axis`).
+		axis : :obj:`int`, optional
+			Default: reduce over every element.
+
+		Returns
+		-------
+		float or np.ndarray
+			`sum(((val - expected)/unc)**2)`
+		int
+			Degrees of freedom: the number of values, less one if `expected`
+			is the weighted mean.
+
+		"""
+		n = self._val.size if axis is None else self._val.shape[axis]
+		if expected is None:
+			expected = self._weightedMeanVal(axis, keepdims=True)
+			n -= 1
+		elif np.any(self._unc == 0):
+			raise ValueError("chi-squared is undefined for measurements with zero uncertainty")
+		chiSquared = np.sum(_divide(self._val - expected, self._unc)**2, axis=axis)
+		return (float(chiSquared) if np.ndim(chiSquared) == 0 else chiSquared), n
+
+	def mean(self, axis = None):
+		"""Return the mean, propagating the uncertainty.
+
+		Parameters
+		----------
+		axis : :obj:`int`, optional
+			Default: reduce over every element.
+
+		Returns
+		-------
+		measurement or UncertaintyArray
+			A scalar measurement if reduced to a single value.
+
+		"""
+		n = self._val.size if axis is None else self._val.shape[axis]
+		unc = np.asarray(self._combineUnc(self._unc, axis), dtype=self._unc.dtype) # an empty object sum is int 0
+		return self._reduced(np.mean(self._val, axis=axis), _divide(unc, n))
+
+	def standardError(self, axis = None):
+		"""Return the standard error of the mean of the values, from their
+		scatter (`std(val, ddof=1)/sqrt(n)`), ignoring the uncertainties.
+
+		Parameters
+		----------
+		axis : :obj:`int`, optional
+			Default: reduce over every element.
+
+		Returns
+		-------
+		float or np.ndarray
+
+		"""
+		n = self._val.size if axis is None else self._val.shape[axis]
+		standardError = np.std(np.asarray(self._val, dtype=float), axis=axis, ddof=1) / math.sqrt(n)
+		return float(standardError) if np.ndim(standardError) == 0 else standardError
+
+	def sum(self, axis = None):
+		"""Return the sum, propagating the uncertainty.
+
+		Parameters
+		----------
+		axis : :obj:`int`, optional
+			Default: reduce over every element.
+
+		Returns
+		-------
+		measurement or UncertaintyArray
+			A scalar measurement if reduced to a single value.
+
+		"""
+		return self._reduced(np.sum(self._val, axis=axis), self._combineUnc(self._unc, axis))
+
+	def weightedMean(self, axis = None):
+		"""Return the inverse-variance weighted mean (weights `1/unc**2`).
+
+		Parameters
+		----------
+		axis : :obj:`int`, optional
+			Default: reduce over every element.
+
+		Returns
+		-------
+		measurement or UncertaintyArray
+			A scalar measurement if reduced to a single value.
+
+		Raises
+		------
+		ValueError
+			If any measurement has zero uncertainty (infinite weight).
+
+		"""
+		val = self._weightedMeanVal(axis)
+		unc = self._weightedMeanUnc(np.sum(1 / self._unc, axis=axis), np.sum(self._unc**-2, axis=axis))
+		return self._reduced(val, unc)
+
+	def _reduced(self, val, unc):
+		"""Return a scalar measurement if `val` is 0-dimensional, else an
+		array."""
+		if np.ndim(val) == 0:
+			return self._scalarType._fromValUnc(float(val), float(unc))
+		return self._fromArrays(val, unc)
+
+	def _weightedMeanVal(self, axis = None, keepdims = False):
+		"""Return the value of `weightedMean`."""
+		if np.any(self._unc == 0):
+			raise ValueError("the weighted mean is undefined for measurements with zero uncertainty")
+		weight = self._unc**-2
+		return _divide(np.sum(weight * self._val, axis=axis, keepdims=keepdims), np.sum(weight, axis=axis, keepdims=keepdims))
+
+
+	## NUMPY PROTOCOLS ##
+	def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+		"""Support NumPy's elementwise functions (e.g. `np.log(x)`), as per
+		`CoherentUncertainty.__array_ufunc__`, as whole-array operations."""
+		if method != '__call__' or kwargs:
+			return NotImplemented
+		inputs = tuple(x._asArray() if isinstance(x, _Uncertainty_Prototype) else x for x in inputs)
+		if ufunc in _Uncertainty_Prototype._ufuncOperators:
+			return _Uncertainty_Prototype._ufuncOperator(ufunc, inputs)
+		if ufunc in _Uncertainty_Prototype._ufuncDerivatives and len(inputs) == 1:
+			A, a = self._val, self._unc
+			derivative = _Uncertainty_Prototype._ufuncDerivatives[ufunc]
+			return self._fromArrays(_exactOrFloat(ufunc, A), np.abs(_exactOrFloat(derivative, A)) * a)
+		return NotImplemented
+
+	_arrayFunctions = None # `{function: handler}`, see `_arrayFunctionHandlers`
+
+	def __array_function__(self, func, types, args, kwargs):
+		"""Support NumPy functions that rearrange or join arrays (e.g.
+		`np.reshape`, `np.concatenate`), and `np.sum`/`np.mean` (as per
+		`sum`/`mean`)."""
+		handler = self._arrayFunctionHandlers().get(func)
+		if handler is None or not all(issubclass(t, (UncertaintyArray, np.ndarray)) for t in types):
+			return NotImplemented
+		return handler(*args, **kwargs)
+
+	@staticmethod
+	def _arrayFunctionHandlers():
+		"""Return (building on first use) the handlers of
+		`__array_function__`."""
+		if UncertaintyArray._arrayFunctions is None:
+			def elementwise(func):
+				# apply identically to the values and uncertainties
+				return lambda a, *args, **kwargs: a._fromArrays(func(a._val, *args, **kwargs), func(a._unc, *args, **kwargs))
+			def joined(func):
+				def handler(arrays, *args, **kwargs):
+					arrays = [_asUncertaintyArray(a) for a in arrays]
+					arrayType = type(arrays[0])
+					if not all(type(a) == arrayType for a in arrays):
+						raise TypeError("can only join arrays of the same type, not {}".format(sorted({type(a).__name__ for a in arrays})))
+					return arrayType._fromArrays(func([a._val for a in arrays], *args, **kwargs), func([a._unc for a in arrays], *args, **kwargs))
+				return handler
+			handlers = {
+				np.sum: lambda a, axis = None: a.sum(axis),
+				np.mean: lambda a, axis = None: a.mean(axis),
+				np.shape: lambda a: a.shape,
+				np.ndim: lambda a: a.ndim,
+				np.size: lambda a, axis = None: a.size if axis is None else a.shape[axis],
+				np.copy: lambda a, *args, **kwargs: a.copy(),
+			}
+			for func in (np.reshape, np.ravel, np.transpose, np.squeeze, np.expand_dims, np.moveaxis,
+						 np.swapaxes, np.flip, np.roll, np.broadcast_to, np.take, np.repeat, np.tile):
+				handlers[func] = elementwise(func)
+			for func in (np.concatenate, np.stack, np.hstack, np.vstack):
+				handlers[func] = joined(func)
+			UncertaintyArray._arrayFunctions = handlers
+		return UncertaintyArray._arrayFunctions
+
+
+	## TYPECASTING AND DISPLAYING ##
+	def __repr__(self):
+		return "{0}(val={1}, unc={2})".format(type(self).__name__, self._val, self._unc)
+
+	def __str__(self):
+		return "{0}\n+-\n{1}".format(self._val, self._unc)
+
+
+class CoherentUncertaintyArray(UncertaintyArray):
+	"""Array version of `CoherentUncertainty`.
+
+	The operations between `x=A+-a` and `y=B+-b` (elementwise) are as per
+	`CoherentUncertainty`. Incoherence warnings are printed at most once per
+	operation, through `CoherentUncertainty.incoherenceReporter` (so also
+	respect `CoherentUncertainty.suppress_IncoherenceMessages`).
+
+	"""
+
+	_scalarType = CoherentUncertainty
+
+	## CLASSMETHODS ##
+	@staticmethod
+	def _combineUnc(unc, axis = None):
+		"""Return the uncertainty of a sum of measurements with
+		uncertainties `unc` (along `axis`)."""
+		return np.sum(unc, axis=axis)
+
+	@staticmethod
+	def _weightedMeanUnc(sumInvUnc, sumWeight):
+		"""Return the uncertainty of the weighted mean, from `sum(1/unc)` and
+		`sum(1/unc**2)`."""
+		return _divide(sumInvUnc, sumWeight)
+
+	@classmethod
+	def _checkedResult(cls, val, unc):
+		"""`_fromArrays`, but raise as the scalar class would on a negative
+		uncertainty."""
+		if np.any(unc < 0):
+			raise ValueError("uncertainty must be positive, the operation gave negative uncertainties")
+		return cls._fromArrays(val, unc)
+
+	@staticmethod
+	def _warnIncoherent(mask, opString):
+		"""Report the elements of `mask` that are `True` as a single
+		occurrence count."""
+		if CoherentUncertainty.suppress_IncoherenceMessages(): return
+		count = np.count_nonzero(mask)
+		if count:
+			CoherentUncertainty.incoherenceReporter.report(opString, "{} results in an incoherent uncertainty, but is not corrected in calculations".format(opString), count, stacklevel=3)
+		return
+
+	@staticmethod
+	def _powChecks(A, b):
+		"""Raise/warn as `CoherentUncertainty.__pow__` would."""
+		if np.any(A == 0):
+			raise ValueError("0**anything where 0 is an uncertainty cannot be calculated. +++This requires GeneralUncertainty objects")
+		if np.any(A < 0):
+			raise ValueError("negative values are present, so an uncertainty calculation involving them to any power cannot currently be done")
+		if not CoherentUncertainty.suppress_IncoherenceMessages():
+			count = np.count_nonzero((A <= 1) & (b != 0))
+			if count:
+				CoherentUncertainty.incoherenceReporter.report("x**y", CoherentUncertainty._powerIncoherenceMessage, count, stacklevel=3)
+		return
+
+
+	## OPERATIONS ##
+	def __add__(self, other):
+		try: A, a, B, b = self._operands(other)
+		except TypeError: return NotImplemented
+		return self._fromArrays(A+B, a+b)
+
+	def __sub__(self, other):
+		try: A, a, B, b = self._operands(other)
+		except TypeError: return NotImplemented
+		return self._fromArrays(A-B, a+b)
+
+	def __mul__(self, other):
+		try: A, a, B, b = self._operands(other)
+		except TypeError: return NotImplemented
+		self._warnIncoherent(A*B < 0, "x*y")
+		return self._checkedResult(A*B, B*a + A*b)
+
+	def __truediv__(self, other):
+		try: A, a, B, b = self._operands(other)
+		except TypeError: return NotImplemented
+		self._warnIncoherent(A*B < 0, "x/y")
+		return self._checkedResult(_divide(A, B), _divide(a, B) + _divide(A*b, B**2))
+
+	def __rtruediv__(self, other):
+		try: B, b, A, a = self._operands(other)
+		except TypeError: return NotImplemented
+		self._warnIncoherent(A*B < 0, "x/y")
+		return self._checkedResult(_divide(A, B), _divide(a, B) + _divide(A*b, B**2))
+
+	def __pow__(self, other):
+		try: A, a, B, b = self._operands(other)
+		except TypeError: return NotImplemented
+		self._powChecks(A, b)
+		X = A**B
+		return self._checkedResult(X, X*(B*a/A + _exactOrFloat(np.log, A)*b))
+
+	def __rpow__(self, other):
+		try: B, b, A, a = self._operands(other)
+		except TypeError: return NotImplemented
+		self._powChecks(A, b)
+		X = A**B
+		return self._checkedResult(X, X*(B*a/A + _exactOrFloat(np.log, A)*b))
+
+	def __iadd__(self, other):
+		try: operands = self._inPlaceOperands(other)
+		except TypeError: return NotImplemented
+		if operands is None: return self._update(self.__add__(other))
+		B, b = operands
+		np.add(self._val, B, out=self._val)
+		np.add(self._unc, b, out=self._unc)
+		return self
+
+	def __isub__(self, other):
+		try: operands = self._inPlaceOperands(other)
+		except TypeError: return NotImplemented
+		if operands is None: return self._update(self.__sub__(other))
+		B, b = operands
+		np.subtract(self._val, B, out=self._val)
+		np.add(self._unc, b, out=self._unc)
+		return self
+
+	def __imul__(self, other):
+		try: operands = self._inPlaceOperands(other, exactOnly=True)
+		except TypeError: return NotImplemented
+		if operands is None: return self._update(self.__mul__(other))
+		A, a, (B, _) = self._val, self._unc, operands
+		self._warnIncoherent(A*B < 0, "x*y")
+		if np.any((B < 0) & (a > 0)):
+			raise ValueError("uncertainty must be positive, the operation gave negative uncertainties")
+		np.multiply(A, B, out=A)
+		np.multiply(a, B, out=a)
+		return self
+
+	def __itruediv__(self, other):
+		try: operands = self._inPlaceOperands(other, exactOnly=True)
+		except TypeError: return NotImplemented
+		if operands is None: return self._update(self.__truediv__(other))
+		A, a, (B, _) = self._val, self._unc, operands
+		self._warnIncoherent(A*B < 0, "x/y")
+		if np.any((B < 0) & (a > 0)):
+			raise ValueError("uncertainty must be positive, the operation gave negative uncertainties")
+		np.divide(A, B, out=A)
+		np.divide(a, B, out=a)
+		return self
+
+
+class IncoherentUncertaintyArray(UncertaintyArray):
+	"""Array version of `IncoherentUncertainty`.
+
+	The operations between `x=A+-a` and `y=B+-b` (elementwise) are as per
+	`IncoherentUncertainty`.
+
+	"""
+
+	_scalarType = IncoherentUncertainty
+
+	## CLASSMETHODS ##
+	@staticmethod
+	def _combineUnc(unc, axis = None):
+		"""Return the uncertainty of a sum of measurements with
+		uncertainties `unc` (along `axis`)."""
+		return _exactOrFloat(np.sqrt, np.sum(np.square(unc), axis=axis))
+
+	@staticmethod
+	def _weightedMeanUnc(sumInvUnc, sumWeight):
+		"""Return the uncertainty of the weighted mean, from `sum(1/unc)` and
+		`sum(1/unc**2)`."""
+		return _divide(1, _exactOrFloat(np.sqrt, sumWeight))
+
+	@staticmethod
+	def _powChecks(A):
+		"""Raise as `IncoherentUncertainty.__pow__` would."""
+		if np.any(A == 0):
+			raise ValueError("0**anything where 0 is an uncertainty cannot be calculated. +++This requires GeneralUncertainty objects")
+		if np.any(A < 0):
+			raise ValueError("negative values are present, so an uncertainty calculation involving them to any power cannot currently be done")
+		return
+
+
+	## OPERATIONS ##
+	def __add__(self, other):
+		try: A, a, B, b = self._operands(other)
+		except TypeError: return NotImplemented
+		return self._fromArrays(A+B, _exactOrFloat(np.sqrt, a**2 + b**2))
+
+	def __sub__(self, other):
+		try: A, a, B, b = self._operands(other)
+		except TypeError: return NotImplemented
+		return self._fromArrays(A-B, _exactOrFloat(np.sqrt, a**2 + b**2))
+
+	def __mul__(self, other):
+		try: A, a, B, b = self._operands(other)
+		except TypeError: return NotImplemented
+		return self._fromArrays(A*B, _exactOrFloat(np.sqrt, (B*a)**2 + (A*b)**2))
+
+	def __truediv__(self, other):
+		try: A, a, B, b = self._operands(other)
+		except TypeError: return NotImplemented
+		return self._fromArrays(_divide(A, B), _exactOrFloat(np.sqrt, _divide(a, B)**2 + _divide(A*b, B**2)**2))
+
+	def __rtruediv__(self, other):
+		try: B, b, A, a = self._operands(other)
+		except TypeError: return NotImplemented
+		return self._fromArrays(_divide(A, B), _exactOrFloat(np.sqrt, _divide(a, B)**2 + _divide(A*b, B**2)**2))
+
+	def __pow__(self, other):
+		try: A, a, B, b = self._operands(other)
+		except TypeError: return NotImplemented
+		self._powChecks(A)
+		X = A**B
+		return self._fromArrays(X, np.abs(X)*_exactOrFloat(np.sqrt, (B*a/A)**2 + (_exactOrFloat(np.log, A)*b)**2))
+
+	def __rpow__(self, other):
+		try: B, b, A, a = self._operands(other)
+		except TypeError: return NotImplemented
+		self._powChecks(A)
+		X = A**B
+		return self._fromArrays(X, np.abs(X)*_exactOrFloat(np.sqrt, (B*a/A)**2 + (_exactOrFloat(np.log, A)*b)**2))
+
+	def _addUncInPlace(self, b):
+		"""Combine the uncertainties `b` into the storage, as for a sum."""
+		if np.ndim(b) == 0 and b == 0: return
+		a = self._unc
+		np.square(a, out=a)
+		np.add(a, np.square(b), out=a)
+		np.sqrt(a, out=a)
+		return
+
+	def __iadd__(self, other):
+		try: operands = self._inPlaceOperands(other)
+		except TypeError: return NotImplemented
+		if operands is None: return self._update(self.__add__(other))
+		B, b = operands
+		np.add(self._val, B, out=self._val)
+		self._addUncInPlace(b)
+		return self
+
+	def __isub__(self, other):
+		try: operands = self._inPlaceOperands(other)
+		except TypeError: return NotImplemented
+		if operands is None: return self._update(self.__sub__(other))
+		B, b = operands
+		np.subtract(self._val, B, out=self._val)
+		self._addUncInPlace(b)
+		return self
+
+	def __imul__(self, other):
+		try: operands = self._inPlaceOperands(other, exactOnly=True)
+		except TypeError: return NotImplemented
+		if operands is None: return self._update(self.__mul__(other))
+		B, _ = operands
+		np.multiply(self._val, B, out=self._val)
+		np.multiply(self._unc, np.abs(B), out=self._unc)
+		return self
+
+	def __itruediv__(self, other):
+		try: operands = self._inPlaceOperands(other, exactOnly=True)
+		except TypeError: return NotImplemented
+		if operands is None: return self._update(self.__truediv__(other))
+		B, _ = operands
+		np.divide(self._val, B, out=self._val)
+		np.divide(self._unc, np.abs(B), out=self._unc)
+		return self
+
+
+class GeneralUncertaintyArray:
+	"""Array version of `GeneralUncertainty`.
+
+	Stores one `np.ndarray` of values and one each of the lower and upper
+	uncertainties. Operations propagate the bounds `[val-lower, val+upper]`
+	elementwise by interval arithmetic, exactly as the scalar operators do,
+	with NumPy broadcasting rules.
+
+	Notes
+	-----
+	As with `UncertaintyArray`, division by zero follows NumPy semantics
+	rather than raising, and complex results (e.g. a possibly negative base to
+	a non-integer power) give `nan` rather than raising.
+
+	"""
+
+	_scalarType = GeneralUncertainty
+
+	## CLASSMETHODS ##
+	@classmethod
+	def _fromBounds(cls, val, lower, upper):
+		"""Construct from values and the bounds `[lower, upper]`, without any
+		validation."""
+		self = object.__new__(cls)
+		val, lower, upper = np.broadcast_arrays(val, lower, upper)
+		self._val = np.array(val, dtype=float)
+		with np.errstate(invalid='ignore'):
+			self._uncLower = np.maximum(self._val - lower, 0.0)
+			self._uncUpper = np.maximum(upper - self._val, 0.0)
+		return self
+
+	@classmethod
+	def _getOtherValueBounds(cls, other):
+		"""Return the appropriate `(value, lower, upper)` tuple of `other`.
+
+		Raises
+		------
+		TypeError
+			Indicates that `other` cannot be interpreted as a measurement.
+
+		"""
+		if isinstance(other, cls): return (other._val, *other.bounds())
+		if isinstance(other, cls._scalarType): return (other.val, *other.bounds())
+		if isinstance(other, (int, float, np.number)): return (other, other, other)
+		if isinstance(other, np.ndarray) and other.dtype.kind in 'iuf':
+			return (other, other, other)
+		raise TypeError("'{}' cannot be interpreted as a measurement".format(type(other)))
+
+	@classmethod
+	def fromMeasurements(cls, measurements):
+		"""Create an array from an iterable of `GeneralUncertainty`s.
+
+		Parameters
+		----------
+		measurements : iterable
+
+		Returns
+		-------
+		GeneralUncertaintyArray
+
+		"""
+		measurements = list(measurements)
+		for m in measurements:
+			if type(m) != cls._scalarType:
+				raise TypeError("all measurements must be of type '{0}', not '{1}'".format(cls._scalarType, type(m)))
+		n = len(measurements)
+		val = np.fromiter((m.val for m in measurements), dtype=float, count=n)
+		uncLower = np.fromiter((m.unc[0] for m in measurements), dtype=float, count=n)
+		uncUpper = np.fromiter((m.unc[1] for m in measurements), dtype=float, count=n)
+		return cls(val, (uncLower, uncUpper))
+
+
+	## PROPERTIES ##
+	@property
+	def val(self):
+		""":obj:`np.ndarray`: Values of the measurements."""
+		return self._val
+
+	@property
+	def unc(self):
+		""":obj:`tuple` of :obj:`np.ndarray`: Lower and upper uncertainties
+		of the measurements."""
+		return (self._uncLower, self._uncUpper)
+
+	@property
+	def shape(self):
+		""":obj:`tuple`: Shape of the array."""
+		return self._val.shape
+
+	@property
+	def ndim(self):
+		""":obj:`int`: Number of array dimensions."""
+		return self._val.ndim
+
+	@property
+	def size(self):
+		""":obj:`int`: Number of measurements in the array."""
+		return self._val.size
+
+
+	## CONSTRUCTOR ##
+	def __init__(self, val, unc = (0, 0), scale = 1):
+		"""Initialise an array of measurements: `val (-unc[0], +unc[1]) * scale`
+
+		Parameters
+		----------
+		val : array_like
+			The measured values.
+		unc : :obj:`tuple` of array_like, optional
+			The lower and upper uncertainties, broadcast against `val`.
+			Default `(0, 0)`.
+		scale : :obj:`float`, :obj:`str`, optional
+			The scale of both `val` and `unc`. Can either be a number or a
+			valid prefix. Default `1`.
+
+		"""
+		if len(unc) != 2:
+			raise ValueError("unc must be a (lower, upper) pair")
+		scale = _Uncertainty_Prototype.prefixToScale(scale)
+		val = np.asarray(val, dtype=float) * scale
+		uncLower = np.asarray(unc[0], dtype=float) * scale
+		uncUpper = np.asarray(unc[1], dtype=float) * scale
+		if np.any(uncLower < 0) or np.any(uncUpper < 0):
+			raise ValueError("uncertainties must be positive")
+		val, uncLower, uncUpper = np.broadcast_arrays(val, uncLower, uncUpper)
+		self._val = np.array(val)
+		self._uncLower = np.array(uncLower)
+		self._uncUpper = np.array(uncUpper)
+
+
+	## CONTAINER METHODS ##
+	def __getitem__(self, key):
+		val, uncLower, uncUpper = self._val[key], self._uncLower[key], self._uncUpper[key]
+		if np.ndim(val) == 0:
+			return self._scalarType._fromValUnc(float(val), (float(uncLower), float(uncUpper)))
+		result = object.__new__(type(self))
+		result._val, result._uncLower, result._uncUpper = val, uncLower, uncUpper
+		return result
+
+	def __iter__(self):
+		for i in range(len(self)):
+			yield self[i]
+
+	def __len__(self): return len(self._val)
+
+
+	## OPERATIONS ##
+	__array_ufunc__ = None # defer to the reflected operators below
+
+	def __neg__(self):
+		lower, upper = self.bounds()
+		return self._fromBounds(-self._val, -upper, -lower)
+
+	def __pos__(self): return self._fromBounds(self._val, *self.bounds())
+
+	def __add__(self, other):
+		try: B, bLo, bHi = self._getOtherValueBounds(other)
+		except TypeError: return NotImplemented
+		lower, upper = self.bounds()
+		return self._fromBounds(self._val + B, lower + bLo, upper + bHi)
+
+	def __radd__(self, other): return self.__add__(other)
+
+	def __sub__(self, other):
+		try: B, bLo, bHi = self._getOtherValueBounds(other)
+		except TypeError: return NotImplemented
+		lower, upper = self.bounds()
+		return self._fromBounds(self._val - B, lower - bHi, upper - bLo)
+
+	def __rsub__(self, other): return (-self).__add__(other)
+
+	def __mul__(self, other):
+		try: B, bLo, bHi = self._getOtherValueBounds(other)
+		except TypeError: return NotImplemented
+		return self._fromBounds(self._val * B, *_intervalMul(*self.bounds(), bLo, bHi))
+
+	def __rmul__(self, other): return self.__mul__(other)
+
+	def __truediv__(self, other):
+		try: B, bLo, bHi = self._getOtherValueBounds(other)
+		except TypeError: return NotImplemented
+		return self._fromBounds(self._val / B, *_intervalDiv(*self.bounds(), bLo, bHi))
+
+	def __rtruediv__(self, other):
+		try: A, aLo, aHi = self._getOtherValueBounds(other)
+		except TypeError: return NotImplemented
+		return self._fromBounds(A / self._val, *_intervalDiv(aLo, aHi, *self.bounds()))
+
+	def __pow__(self, other):
+		try: B, bLo, bHi = self._getOtherValueBounds(other)
+		except TypeError: return NotImplemented
+		with np.errstate(invalid='ignore'):
+			return self._fromBounds(self._val ** B, *_intervalPow(*self.bounds(), bLo, bHi))
+
+	def __rpow__(self, other):
+		try: A, aLo, aHi = self._getOtherValueBounds(other)
+		except TypeError: return NotImplemented
+		with np.errstate(invalid='ignore'):
+			return self._fromBounds(A ** self._val, *_intervalPow(aLo, aHi, *self.bounds()))
+
+
+	## METHODS ##
+	def bounds(self):
+		"""Return the lowest and highest values each measurement could take.
+
+		Returns
+		-------
+		:obj:`tuple` of :obj:`np.ndarray`
+			`(val - unc[0], val + unc[1])`
+
+		"""
+		return (self._val - self._uncLower, self._val + self._uncUpper)
+
+	def copy(self):
+		"""Return a copy of the array (with its own data)."""
+		return type(self)(self._val.copy(), (self._uncLower.copy(), self._uncUpper.copy()))
+
+	def toMeasurements(self):
+		"""Return a flat list of `GeneralUncertainty` objects."""
+		return [self._scalarType._fromValUnc(A, (a0, a1)) for (A, a0, a1)
+				in zip(self._val.ravel().tolist(), self._uncLower.ravel().tolist(), self._uncUpper.ravel().tolist())]
+
+
+	## TYPECASTING AND DISPLAYING ##
+	def __repr__(self):
+		return "{0}(val={1}, unc=({2}, {3}))".format(type(self).__name__, self._val, self._uncLower, self._uncUpper)
+
+	def __str__(self):
+		return "{0}\n-\n{1}\n+\n{2}".format(self._val, self._uncLower, self._uncUpper)
+
+
+class RunningStatistics:
+	"""Accumulate the reductions of `UncertaintyArray` (`sum`, `mean`,
+	`weightedMean`, `standardError` and `chiSquared`) over data that arrives
+	in chunks, e.g. from `FileHandler.loadChunks`, in a single pass.
+
+	Each chunk is reduced with NumPy, and the chunks' means and spreads are
+	merged with Chan et al.'s pairwise update (weighted as per West), so the
+	result is as accurate as reducing all the data at once.
+
+	Examples
+	--------
+	>>> stats = RunningStatistics("Incoherent")
+	>>> for extra_cols, measurements in FileHandler.loadChunks('data.csv'):
+	... 	stats.update(measurements['x'])
+	>>> stats.weightedMean(), stats.chiSquared()
+
+	"""
+
+	def __init__(self, uncertaintyType = "Incoherent"):
+		"""
+		Parameters
+		----------
+		uncertaintyType : :obj:`str`, optional
+			`"Incoherent"` (default) or `"Coherent"`, the propagation to use.
+
+		"""
+		if uncertaintyType not in ["Coherent", "Incoherent"]:
+			raise ValueError("uncertaintyType must be 'Coherent' or 'Incoherent'")
+		self._arrayType = CoherentUncertaintyArray if uncertaintyType == "Coherent" else IncoherentUncertaintyArray
+		self.count = 0
+		self._mean = 0.0 # of the values
+		self._m2 = 0.0 # sum of squared deviations from `_mean`
+		self._unc = 0.0 # uncertainty of the sum
+		self._weight = 0.0 # sum of 1/unc**2
+		self._sumInvUnc = 0.0 # sum of 1/unc
+		self._weightedMean = 0.0
+		self._weightedM2 = 0.0 # sum of ((val - `_weightedMean`)/unc)**2
+		self._hasExactValues = False # any zero uncertainties
+
+	def update(self, measurements):
+		"""Add a chunk of measurements.
+
+		Parameters
+		----------
+		measurements : UncertaintyArray, measurement or sequence of measurements
+
+		"""
+		arr = _asUncertaintyArray(measurements)
+		if not isinstance(arr, UncertaintyArray):
+			arr = UncertaintyArray.fromMeasurements([arr])
+		val, unc = arr.val.ravel(), arr.unc.ravel()
+		n = val.size
+		if n == 0: return
+
+		# VALUES (Chan et al.)
+		mean = np.mean(val)
+		m2 = np.sum(np.square(val - mean))
+		total = self.count + n
+		delta = mean - self._mean
+		self._mean += delta * n / total
+		self._m2 += m2 + delta**2 * self.count * n / total
+		self.count = total
+		self._unc = float(self._arrayType._combineUnc(np.array([self._unc, self._arrayType._combineUnc(unc)])))
+
+		# WEIGHTED (West)
+		if self._hasExactValues or np.any(unc == 0):
+			self._hasExactValues = True
+			return
+		weight = unc**-2
+		W = np.sum(weight)
+		weightedMean = np.sum(weight * val) / W
+		weightedM2 = np.sum(weight * np.square(val - weightedMean))
+		totalW = self._weight + W
+		delta = weightedMean - self._weightedMean
+		self._weightedMean += delta * W / totalW
+		self._weightedM2 += weightedM2 + delta**2 * self._weight * W / totalW
+		self._weight = totalW
+		self._sumInvUnc += np.sum(1 / unc)
+		return
+
+	def chiSquared(self, expected = None):
+		"""See `UncertaintyArray.chiSquared` (`expected` must be a single
+		number here)."""
+		self._checkWeighted("chi-squared")
+		if expected is None:
+			return float(self._weightedM2), self.count - 1
+		return float(self._weightedM2 + self._weight * (self._weightedMean - expected)**2), self.count
+
+	def mean(self):
+		"""See `UncertaintyArray.mean` (`nan +- nan` if no measurements have
+		been added)."""
+		if self.count == 0:
+			return self._arrayType._scalarType._fromValUnc(math.nan, math.nan)
+		return self._arrayType._scalarType._fromValUnc(float(self._mean), self._unc / self.count)
+
+	def standardError(self):
+		"""See `UncertaintyArray.standardError` (`nan` for fewer than 2
+		measurements)."""
+		if self.count < 2:
+			return math.nan
+		return math.sqrt(self._m2 / (self.count - 1) / self.count)
+
+	def sum(self):
+		"""See `UncertaintyArray.sum`."""
+		return self._arrayType._scalarType._fromValUnc(float(self._mean * self.count), self._unc)
+
+	def weightedMean(self):
+		"""See `UncertaintyArray.weightedMean`."""
+		self._checkWeighted("the weighted mean")
+		unc = self._arrayType._weightedMeanUnc(self._sumInvUnc, self._weight)
+		return self._arrayType._scalarType._fromValUnc(float(self._weightedMean), float(unc))
+
+	def _checkWeighted(self, name):
+		if self._hasExactValues:
+			raise ValueError("{} is undefined for measurements with zero uncertainty".format(name))
+		if self.count == 0:
+			raise ValueError("no measurements have been added")
+
+
+class Expression:
+	"""Node of a lazily evaluated calculation on measurements.
+
+	Operations on `Expression`s don't calculate anything, they record an
+	expression graph (a DAG). Start from symbolic placeholders (see
+	`placeholders`) and combine them with `+ - * / **`, `-x` and `abs(x)`,
+	numbers and scalar measurements. `compile` then turns the graph into a
+	`CompiledExpression`, which evaluates it over whole columns of a dataset
+	at once.
+
+	Examples
+	--------
+	>>> x, y = placeholders('x', 'y')
+	>>> kernel = (x*y + x/y).compile('Incoherent')
+	>>> kernel({'x': xArray, 'y': yArray})   # or a loaded DataFrame
+
+	"""
+
+	__slots__ = ('op', 'operands')
+	__array_ufunc__ = None # Make NumPy defer to our reflected operators
+
+	## CONSTRUCTOR ##
+	def __init__(self, op, operands):
+		"""Create a node. Usually done through `placeholders` or operators.
+
+		Parameters
+		----------
+		op : str
+			`'var'` (operands `(name,)`), `'const'` (operands `(value,)`), or
+			one of `CompiledExpression.OPERATIONS`.
+		operands : tuple
+
+		"""
+		self.op = op
+		self.operands = operands
+		return
+
+
+	## CLASSMETHODS ##
+	@classmethod
+	def _wrap(cls, other):
+		"""Return `other` as an `Expression` (constants become `'const'`
+		nodes)."""
+		if isinstance(other, Expression): return other
+		if isinstance(other, (CoherentUncertainty, IncoherentUncertainty)):
+			return cls('const', (other,))
+		if isinstance(other, (int, float, np.number)) and not isinstance(other, bool):
+			return cls('const', (other,))
+		raise TypeError("'{}' cannot be used in an Expression".format(type(other)))
+
+	def _binary(self, op, other, reflected = False):
+		try: other = self._wrap(other)
+		except TypeError: return NotImplemented
+		if reflected: return Expression(op, (other, self))
+		return Expression(op, (self, other))
+
+
+	## OPERATIONS ##
+	def __abs__(self): return Expression('abs', (self,))
+
+	def __pos__(self): return self
+
+	def __neg__(self): return Expression('neg', (self,))
+
+	def __add__(self, other): return self._binary('add', other)
+
+	def __radd__(self, other): return self._binary('add', other, True)
+
+	def __sub__(self, other): return self._binary('sub', other)
+
+	def __rsub__(self, other): return self._binary('sub', other, True)
+
+	def __mul__(self, other): return self._binary('mul', other)
+
+	def __rmul__(self, other): return self._binary('mul', other, True)
+
+	def __truediv__(self, other): return self._binary('truediv', other)
+
+	def __rtruediv__(self, other): return self._binary('truediv', other, True)
+
+	def __pow__(self, other): return self._binary('pow', other)
+
+	def __rpow__(self, other): return self._binary('pow', other, True)
+
+
+	## METHODS ##
+	def compile(self, uncertaintyType = "Incoherent"):
+		"""Compile into a `CompiledExpression`. See `CompiledExpression`."""
+		return CompiledExpression(self, uncertaintyType)
+
+	def evaluate(self, data, uncertaintyType = "Incoherent"):
+		"""Compile and evaluate once. See `CompiledExpression.__call__`."""
+		return CompiledExpression(self, uncertaintyType)(data)
+
+
+	## TYPECASTING AND DISPLAYING ##
+	def __repr__(self): return str(self)
+
+	def __str__(self):
+		symbols = {'add': '+', 'sub': '-', 'mul': '*', 'truediv': '/', 'pow': '**'}
+		if self.op == 'var': return self.operands[0]
+		if self.op == 'const': return '({})'.format(self.operands[0])
+		if self.op == 'neg': return '(-{})'.format(self.operands[0])
+		if self.op == 'abs': return 'abs({})'.format(self.operands[0])
+		return '({0} {1} {2})'.format(self.operands[0], symbols[self.op], self.operands[1])
+
+
+class CompiledExpression:
+	"""One or more `Expression`s compiled for whole-dataset evaluation.
+
+	Compiling flattens the expression graph into a list of instructions, with
+	common subexpressions merged so they are evaluated once. Calling the
+	compiled expression then runs each instruction once over entire columns
+	as NumPy operations.
+
+	Propagation depends on `uncertaintyType`:
+	- `"Coherent"`, `"Incoherent"` : operation by operation, exactly as the
+	  `CoherentUncertaintyArray`/`IncoherentUncertaintyArray` operators (and
+	  so the scalar classes) would.
+	- `"Correlated"` : exact first-order propagation, as
+	  `CorrelatedUncertainty`. Placeholders (per row) and measurement
+	  constants are the independent sources, so reused variables are
+	  accounted for. Returns `IncoherentUncertaintyArray`s.
+
+	Attributes
+	----------
+	variables : :obj:`tuple` of :obj:`str`
+		Names of the placeholders the expression needs.
+	instructions : :obj:`list` of :obj:`tuple`
+		`(op, operandSlots)` for each distinct node, in evaluation order.
+
+	"""
+
+	OPERATIONS = ('add', 'sub', 'mul', 'truediv', 'pow', 'neg', 'abs')
+	_arrayTypes = {
+		'Coherent': CoherentUncertaintyArray,
+		'Incoherent': IncoherentUncertaintyArray,
+	}
+
+	## CONSTRUCTOR ##
+	def __init__(self, outputs, uncertaintyType = "Incoherent"):
+		"""Compile `outputs`.
+
+		Parameters
+		----------
+		outputs : :obj:`Expression`, :obj:`dict` of :obj:`Expression`
+			A single expression, or `{name: expression}` to compute several
+			outputs with shared subexpressions.
+		uncertaintyType : :obj:`str`, optional
+			`"Coherent"`, `"Incoherent"` (default) or `"Correlated"`.
+
+		"""
+		if uncertaintyType not in ("Coherent", "Incoherent", "Correlated"):
+			raise ValueError("uncertaintyType must be 'Coherent', 'Incoherent' or 'Correlated'")
+		self.uncertaintyType = uncertaintyType
+		self._single = isinstance(outputs, Expression)
+		if self._single:
+			outputs = {None: outputs}
+		for name, expr in outputs.items():
+			if not isinstance(expr, Expression):
+				raise TypeError("output '{0}' must be an Expression, not '{1}'".format(name, type(expr)))
+
+		# Post-order traversal (iterative, so deep expressions don't recurse),
+		# merging structurally identical nodes.
+		self.instructions = []
+		slotOf = {}   # id(node) -> slot
+		slotByKey = {} # (op, operands as slots/values) -> slot
+		variables = []
+		for root in outputs.values():
+			stack = [(root, False)]
+			while stack:
+				node, expanded = stack.pop()
+				if id(node) in slotOf: continue
+				if node.op in ('var', 'const'):
+					value = node.operands[0]
+					key = (node.op, value if node.op == 'var' else (type(value), id(value) if isinstance(value, _Uncertainty_Prototype) else value))
+				elif not expanded:
+					stack.append((node, True))
+					stack.extend((child, False) for child in reversed(node.operands))
+					continue
+				else:
+					key = (node.op,) + tuple(slotOf[id(child)] for child in node.operands)
+				if key not in slotByKey:
+					slotByKey[key] = len(self.instructions)
+					if node.op in ('var', 'const'):
+						self.instructions.append((node.op, node.operands))
+						if node.op == 'var': variables.append(node.operands[0])
+					else:
+						self.instructions.append((node.op, key[1:]))
+				slotOf[id(node)] = slotByKey[key]
+		self._outputSlots = {name: slotOf[id(expr)] for (name, expr) in outputs.items()}
+		self.variables = tuple(variables)
+		return
+
+
+	## METHODS ##
+	def __call__(self, data = None, **columns):
+		"""Evaluate over `data`.
+
+		Parameters
+		----------
+		data : :obj:`dict`, :obj:`pd.DataFrame`, optional
+			Maps each name in `variables` to its column: an
+			`UncertaintyArray`, a pandas Series of measurements (either dtype),
+			a scalar measurement, or numbers.
+		**columns
+			Columns given as keyword arguments instead.
+
+		Returns
+		-------
+		UncertaintyArray, dict
+			The result, or `{name: result}` if compiled with several outputs.
+
+		"""
+		if data is None: data = {}
+		inputs = {}
+		for name in self.variables:
+			if name in columns: inputs[name] = columns[name]
+			else:
+				try: inputs[name] = data[name]
+				except KeyError: raise KeyError("no data for variable '{}'".format(name))
+		if self.uncertaintyType == "Correlated":
+			slots = self._evaluateCorrelated(inputs)
+		else:
+			slots = self._evaluate(inputs)
+		results = {name: slots[slot] for (name, slot) in self._outputSlots.items()}
+		if self._single: return results[None]
+		return results
+
+	def _evaluate(self, inputs):
+		"""Run the instructions with the `UncertaintyArray` operators."""
+		arrayType = self._arrayTypes[self.uncertaintyType]
+		scalarType = arrayType._scalarType
+		ops = {'add': operator.add, 'sub': operator.sub, 'mul': operator.mul,
+			   'truediv': operator.truediv, 'pow': operator.pow,
+			   'neg': operator.neg, 'abs': operator.abs}
+		slots = []
+		for op, operands in self.instructions:
+			if op == 'var':
+				x = _asUncertaintyArray(inputs[operands[0]])
+				if isinstance(x, UncertaintyArray) and type(x) != arrayType:
+					x = arrayType._fromArrays(x.val, x.unc)
+				slots.append(x)
+			elif op == 'const':
+				value = operands[0]
+				if isinstance(value, _Uncertainty_Prototype) and type(value) != scalarType:
+					value = scalarType._fromValUnc(value.val, value.unc)
+				slots.append(value)
+			else:
+				slots.append(ops[op](*[slots[i] for i in operands]))
+		return [arrayType._fromArrays(np.asarray(x, dtype=float), np.zeros(np.shape(x))) if not isinstance(x, UncertaintyArray) else x for x in slots]
+
+	def _evaluateCorrelated(self, inputs):
+		"""Run the instructions in forward mode, carrying each slot's
+		sensitivities to the independent sources.
+
+		Each slot is `(val, grad)` where `grad[..., k]` is the derivative with
+		respect to source `k` times that source's uncertainty (`None` if it
+		depends on no sources). Sources are on the last axis so that scalar
+		constants broadcast against columns.
+
+		"""
+		sources = [op for (op, operands) in self.instructions
+				   if op == 'var' or (op == 'const' and isinstance(operands[0], _Uncertainty_Prototype))]
+		nSources = len(sources)
+		slots = []
+		sourceIndex = 0
+		for op, operands in self.instructions:
+			if op in ('var', 'const'):
+				x = inputs[operands[0]] if op == 'var' else operands[0]
+				if op == 'var': x = _asUncertaintyArray(x)
+				if isinstance(x, (UncertaintyArray, _Uncertainty_Prototype)):
+					val = np.asarray(x.val, dtype=float)
+					grad = np.zeros(val.shape + (nSources,))
+					grad[..., sourceIndex] = x.unc
+					sourceIndex += 1
+				else:
+					val, grad = np.asarray(x, dtype=float), None
+					if op == 'var': sourceIndex += 1
+				slots.append((val, grad))
+				continue
+
+			(A, ga) = slots[operands[0]]
+			(B, gb) = slots[operands[1]] if len(operands) > 1 else (None, None)
+			if op == 'add': X, terms = A + B, ((ga, 1), (gb, 1))
+			elif op == 'sub': X, terms = A - B, ((ga, 1), (gb, -1))
+			elif op == 'mul': X, terms = A * B, ((ga, B), (gb, A))
+			elif op == 'truediv': X, terms = A / B, ((ga, 1/B), (gb, -A/B**2))
+			elif op == 'neg': X, terms = -A, ((ga, -1),)
+			elif op == 'abs': X, terms = np.abs(A), ((ga, np.sign(A)),)
+			elif op == 'pow':
+				if gb is not None and np.any(A <= 0):
+					raise ValueError("x**y with an uncertain exponent requires a positive base")
+				X = A**B
+				terms = ((ga, B * A**(B-1) if ga is not None else 0),
+						 (gb, X * np.log(A) if gb is not None else 0))
+			grad = None
+			for g, factor in terms:
+				if g is None: continue
+				g = g * np.expand_dims(factor, -1)
+				grad = g if grad is None else grad + g
+			slots.append((X, grad))
+		return [IncoherentUncertaintyArray._fromArrays(val, np.zeros(np.shape(val)) if grad is None else np.sqrt(np.sum(grad**2, axis=-1)))
+				for (val, grad) in slots]
+
+	def __repr__(self):
+		return "CompiledExpression({0} instructions, variables={1}, uncertaintyType='{2}')".format(len(self.instructions), self.variables, self.uncertaintyType)
+
+
+class MonteCarloResult:
+	"""Result of a `monteCarlo` propagation.
+
+	All attributes are `float` for scalar inputs, or `np.ndarray` (with the
+	broadcast shape of the inputs) for array inputs.
+
+	Attributes
+	----------
+	mean : float, np.ndarray
+		Mean of the sampled outputs.
+	std : float, np.ndarray
+		Standard deviation (`ddof=1`) of the sampled outputs.
+	lower, upper : float, np.ndarray, None
+		Lower and upper percentile bounds, or `None` if percentiles weren't
+		requested.
+	percentiles : :obj:`tuple` of :obj:`float`, None
+		The `(lower, upper)` percentiles used.
+	nSamples : int
+		Number of samples drawn.
+
+	"""
+
+	def __init__(self, mean, std, lower, upper, percentiles, nSamples):
+		self.mean = mean
+		self.std = std
+		self.lower = lower
+		self.upper = upper
+		self.percentiles = percentiles
+		self.nSamples = nSamples
+		return
+
+	def toGeneral(self):
+		"""Return a `GeneralUncertainty` of `mean` with the percentile bounds
+		as its (lower, upper) uncertainty. Only for scalar results."""
+		if self.lower is None:
+			raise ValueError("no percentile bounds were calculated")
+		if np.ndim(self.mean) != 0:
+			raise ValueError("only scalar results can be converted to a GeneralUncertainty")
+		return GeneralUncertainty(self.mean, (self.mean - self.lower, self.upper - self.mean))
+
+	def toIncoherent(self):
+		"""Return `mean+-std` as an `IncoherentUncertainty`, or an
+		`IncoherentUncertaintyArray` for array results."""
+		if np.ndim(self.mean) == 0:
+			return IncoherentUncertainty(self.mean, self.std)
+		return IncoherentUncertaintyArray(self.mean, self.std)
+
+	def __repr__(self): return str(self)
+
+	def __str__(self):
+		if self.lower is None:
+			return "{0} +- {1}".format(self.mean, self.std)
+		return "{0} +- {1} [{2}, {3}]".format(self.mean, self.std, self.lower, self.upper)
+
+
+class CovarianceResult:
+	"""Result of a `propagateCovariance` propagation of `n` inputs through a
+	function with `m` outputs.
+
+	Attributes
+	----------
+	val : np.ndarray
+		Output values, shape `(*batch, m)`.
+	cov : np.ndarray
+		Output covariance matrices, shape `(*batch, m, m)`.
+	jacobian : np.ndarray
+		Partial derivatives of each output with respect to each input, shape
+		`(*batch, m, n)`.
+
+	"""
+
+	def __init__(self, val, cov, jacobian):
+		self.val = val
+		self.cov = cov
+		self.jacobian = jacobian
+		return
+
+	@property
+	def unc(self):
+		""":obj:`np.ndarray`: Standard uncertainties of the outputs (the
+		square root of the diagonal of `cov`), shape `(*batch, m)`."""
+		return np.sqrt(np.diagonal(self.cov, axis1=-2, axis2=-1))
+
+	def correlation(self):
+		"""Return the correlation matrices of the outputs, shape `(*batch, m,
+		m)`. `nan` where an output has zero uncertainty."""
+		unc = self.unc
+		with np.errstate(divide='ignore', invalid='ignore'):
+			return self.cov / (unc[..., :, None] * unc[..., None, :])
+
+	def toIncoherent(self):
+		"""Return each output as an `IncoherentUncertainty`, or an
+		`IncoherentUncertaintyArray` for batched results. Their correlations
+		are lost.
+
+		Returns
+		-------
+		:obj:`list`
+
+		"""
+		unc = self.unc
+		if self.val.ndim == 1:
+			return [IncoherentUncertainty(float(A), float(a)) for (A, a) in zip(self.val, unc)]
+		return [IncoherentUncertaintyArray(self.val[..., i], unc[..., i]) for i in range(self.val.shape[-1])]
+
+	def __repr__(self): return str(self)
+
+	def __str__(self):
+		return "{0}\n+-\n{1}\ncov:\n{2}".format(self.val, self.unc, self.cov)
+
+
+class FileHandler:
+	"""Handle files of uncertainty data
+
+	This version of FileHandler uses csv and stores data in pandas Dataframes,
+	and returns the Dataframe.
+
+	<inFilePath> must be the complete path (e.g. starting with C:/Users/ ...)
+
+	.csv formatted as:
+		variable1,       scale1, varaible2,       scale2, variable3,       scale3, ...
+		   value1, uncertainty1,    value1, uncertainty1,    value1, uncertainty1, ... 
+		   value2, uncertainty2,    value2, uncertainty2,    value2, uncertainty2, ... 
+
+	IMPROVEMENTS:
+	- turn this into a wrapper for a DataFrame object - inherits all functions etc.
+	  from pd.DataFrame, but just acts on the .df attribute
+	  https://stackoverflow.com/questions/1443129/completely-wrap-an-object-in-python
+	"""
+
+	## CONSTRUCTOR ##
+	def __init__(self, inFilePath, columnOffset = 0, rowOffset = 0, uncertaintyType = "Incoherent"):
+		raise NotImplementedError("This behaviour is not ready, and will hopefully be the basis of 0.3.0")
+		self.df, self._extra_info = self.load(inFilePath, columnOffset, rowOffset, uncertaintyType)
+
+
+	@classmethod
+	def load(cls, inFilePath, columnOffset = 0, rowOffset = 0, uncertaintyType = "Incoherent", extensionDtype = False):
+		"""Return the data. 
+		
+		This should also return an 'extra data' array that just contains all
+		the unused stuff in the .csv file - that way you can write it back it.
+		(just the headers - I had a better idea for extra cols)
+
+		Parameters
+		----------
+		inFilePath : str
+			FULL directory path to the csv file
+		columnOffset : int
+			Zero-based index of the column to start reading from (NOTE: this
+			must include the variable headers)
+		rowOffset : int
+			Zero-based index of the row to start reading from
+		uncertaintyType : str
+			`"Incoherent"` or `"Coherent"`
+		extensionDtype : bool
+			If `True`, store the measurement columns with the
+			`uncertaintyPandas.MeasurementDtype` extension dtype instead of as
+			`object` columns of measurement objects.
+
+		Returns
+		-------
+		pandas.DataFrame
+			Compiled data (using the specified uncertainty class)
+		:obj:`dict` of :obj:`list` and :obj:`dict`
+			Extra_info dict (which can be edited to change what prefix measurements get saved as). Used to export the
+			data back to a .csv.
+			
+		"""
+		# DATA (the reader checks the arguments, then it is parsed and
+		# validated as a single block)
+		with ChunkedFileReader(inFilePath, None, columnOffset, rowOffset, uncertaintyType) as reader:
+			extra_info = reader.extra_info
+			extra_cols, measurements = reader.readAll()
+
+		# MEASUREMENT OBJECTS (only created once everything is validated)
+		combined_df = cls._measurementFrame(extra_cols, measurements, extensionDtype)
+
+		return combined_df, extra_info
+
+	@classmethod
+	def loadMany(cls, source, columnOffset = 0, rowOffset = 0, uncertaintyType = "Incoherent", extensionDtype = False,
+				 processes = None, sourceColumn = "source_file"):
+		"""Load many files of the same layout (e.g. one per run) into one
+		DataFrame, parsing the files in parallel.
+
+		Parameters
+		----------
+		source : str
+			A directory (every .csv file in it, or its subdirectories, is
+			loaded) or a glob pattern such as `'runs/*/data.csv'`.
+		columnOffset, rowOffset, uncertaintyType, extensionDtype
+			As per `load`, and the same for every file.
+		processes : :obj:`int`, optional
+			Number of processes to parse the files with. Default: the number
+			of CPUs. Use `1` to load the files in this process.
+		sourceColumn : :obj:`str`, optional
+			Name of the column, added before all the others, holding the path
+			of the file each row came from. Default `"source_file"`.
+
+		Returns
+		-------
+		pandas.DataFrame
+			The rows of every file, in sorted file path order.
+		dict
+			`extra_info` as per `load`, of the first file, with
+			`'columnOffset'` including `sourceColumn` (so the result can be
+			passed straight to `save`).
+
+		Raises
+		------
+		FileNotFoundError
+			If no files match `source`.
+		ValueError
+			If a file cannot be loaded, or its variables, scales or extra
+			columns do not match the first file's.
+
+		"""
+		import pandas as pd
+		if not isinstance(source, str):
+			raise TypeError("source must be a string, not a, '{}'".format(type(source)))
+		if os.path.isdir(source):
+			from pythonutils.io import walkFiles
+			paths = []
+			walkFiles(source, lambda filePath: paths.append(filePath) if filePath[-4:] == ".csv" else None)
+		else:
+			import glob
+			paths = glob.glob(source, recursive=True)
+		paths = sorted(paths)
+		if not paths:
+			raise FileNotFoundError("no .csv files match '{}'".format(source))
+		cls._checkLoadArguments(paths[0], columnOffset, rowOffset, uncertaintyType)
+
+		# PARSING
+		if processes is None:
+			processes = os.cpu_count() or 1
+		processes = min(processes, len(paths))
+		loadArgs = ([columnOffset]*len(paths), [rowOffset]*len(paths), [uncertaintyType]*len(paths))
+		if processes <= 1:
+			results = list(map(_loadFileArrays, paths, *loadArgs))
+		else:
+			import concurrent.futures
+			with concurrent.futures.ProcessPoolExecutor(processes) as executor:
+				results = list(executor.map(_loadFileArrays, paths, *loadArgs,
+											chunksize=max(1, len(paths) // (4*processes))))
+
+		# HEADER VALIDATION
+		_, _, extra_info = results[0]
+		expected = (list(results[0][0].columns), list(extra_info['col_scales'].items()))
+		for filePath, (extra_cols, _, info) in zip(paths, results):
+			if (list(extra_cols.columns), list(info['col_scales'].items())) != expected:
+				raise ValueError("the headers of '{0}' do not match those of '{1}'".format(filePath, paths[0]))
+
+		# CONCATENATION
+		arrayType = CoherentUncertaintyArray if uncertaintyType == "Coherent" else IncoherentUncertaintyArray
+		extra_cols = pd.concat([r[0] for r in results], ignore_index=True)
+		extra_cols.insert(0, sourceColumn, np.repeat(paths, [len(r[0]) for r in results]))
+		measurements = {}
+		for variable in extra_info['col_scales']:
+			val = np.concatenate([r[1][variable][0] for r in results])
+			unc = np.concatenate([r[1][variable][1] for r in results])
+			measurements[variable] = arrayType._fromArrays(val, unc)
+		combined_df = cls._measurementFrame(extra_cols, measurements, extensionDtype)
+
+		extra_info = dict(extra_info, columnOffset=columnOffset + 1)
+		return combined_df, extra_info
+
+	@classmethod
+	def loadChunks(cls, inFilePath, chunkSize = 100000, columnOffset = 0, rowOffset = 0, uncertaintyType = "Incoherent"):
+		"""Return a `ChunkedFileReader` to stream the data in fixed-size
+		chunks, in a single pass with bounded memory.
+
+		Parameters are as per `load`, plus `chunkSize` (the number of rows per
+		chunk, or `None` to read the whole file as one chunk). See
+		`ChunkedFileReader`.
+
+		Examples
+		--------
+		>>> with FileHandler.loadChunks('data.csv', 100000, 1, 2) as chunks:
+		... 	for extra_cols, measurements in chunks:
+		... 		result = measurements['x'] * measurements['y']
+
+		"""
+		return ChunkedFileReader(inFilePath, chunkSize, columnOffset, rowOffset, uncertaintyType)
+
+	@staticmethod
+	def _checkLoadArguments(inFilePath, columnOffset, rowOffset, uncertaintyType):
+		"""Raise an appropriate error if the arguments to `load` are invalid."""
+		if not isinstance(inFilePath, str):
+			raise TypeError("inFilePath must be a string, not a, '{}'".format(type(inFilePath)))
+		if inFilePath[-4:] != ".csv":
+			raise ValueError("inFile must be a .csv")
+		if not os.path.exists(inFilePath):
+			print("The specified file '{}' does not exist. This may be caused by using '\' instead of '/'".format(inFilePath))
+		if not isinstance(columnOffset, int):
+			raise TypeError("<columnStart> must be of type '{0}' not type '{1}'".format(int, type(columnOffset)))
+		if not isinstance(rowOffset, int):
+			raise TypeError("<columnStart> must be of type '{0}' not type '{1}'".format(int, type(rowOffset)))
+		if uncertaintyType not in ["Coherent", "Incoherent"]:
+			raise ValueError("uncertaintyType must be 'Coherent' or 'Incoherent'")
+		return
+
+	@staticmethod
+	def _measurementFrame(extra_cols, measurements, extensionDtype = False):
+		"""Return the DataFrame of `load` from the extra columns and
+		`{variable: UncertaintyArray}`."""
+		import pandas as pd
+		columns = {}
+		if extensionDtype:
+			from pythonutils.uncertaintyPandas import MeasurementArray
+			for variable, arr in measurements.items():
+				columns[variable] = pd.Series(MeasurementArray(arr), index=extra_cols.index)
+		else:
+			for variable, arr in measurements.items():
+				columns[variable] = pd.Series(arr.toMeasurements(), index=extra_cols.index, dtype=object)
+		return pd.concat([extra_cols, pd.DataFrame(columns, index=extra_cols.index)], axis=1)
+
+	@staticmethod
+	def _parseDataBlock(block, firstLineNumber):
+		"""Return the numeric block of the file as a float array, validating
+		every cell at once (reporting the line and value of the first bad cell).
+
+		Parameters
+		----------
+		block : pd.DataFrame
+			The value/uncertainty columns, as read by `pd.read_csv` with
+			`keep_default_na=False` (so invalid cells are left as strings).
+		firstLineNumber : int
+			Line in the file of the first row of `block`, for error messages.
+
+		Returns
+		-------
+		np.ndarray
+			2D array of floats, in the same layout as `block`.
+
+		Raises
+		------
+		ValueError
+			If any cell is not a valid number (`nan` and empty cells are
+			invalid, `inf` is valid), reporting the first offending value and
+			its line.
+
+		"""
+		import pandas as pd
+		columns = []
+		for _, col in block.items():
+			if col.dtype.kind in 'fiu':
+				columns.append(col.to_numpy(dtype=float))
+			else:
+				columns.append(pd.to_numeric(col, errors='coerce').to_numpy(dtype=float))
+		values = np.column_stack(columns) if columns else np.empty((len(block), 0))
+		invalid = np.isnan(values)
+		if invalid.any():
+			row, col = np.argwhere(invalid)[0]
+			raise ValueError("'{0}' Cannot be interpreted as a float, please put a valid numerical value. This is on line {1} in the file".format(block.iat[row, col], firstLineNumber + row))
+		return values
+
+	@staticmethod
+	def _prepareVariableLine(variables, lineNumber):
+		"""Prepare the variables line in the file. 
+
+		TODO:
+		- update this to 0.2.2 (doesn't need to prepare for a StringExpression anymore)
+
+		Parameters
+		----------
+		variables : str
+			Line for the variables, directly read from the file without
+			adjustment.
+		lineNumber : int
+			Line in the file, for error messages.
+		
+		Returns
+		-------
+		list
+			In the same order as the file: `["variable", scale, "variable",
+			scale, ...]`
 
 		Raises
 		------
 		ValueError
+			If the variables have invalid characters.
 
 		"""
-		if len(row) % 2 != 0:
-			raise ValueError("line {} does not have an even number of columns, i.e. there might be an uncertainty missing".format(lineNumber))
-		for elem in row:
-			if not asd.isFloatable(elem, acceptInf=True):
-				raise ValueError("'{0}' Cannot be interpreted as a float, please put a valid numerical value. This is on line {1} in the file".format(elem, lineNumber))
-		if len(variables) != len(row): 
-			raise ValueError("Something unexpected occured, and the variables list does not have the same length as the line. This is on line {} in the file".format(lineNumber))
-
-		valuesList = []
-		if uncertaintyType == "Coherent":
-			for i in range(0, len(variables), 2):
-				val = float(row[i])
-				unc = float(row[i+1])
-				scale = variables[i+1]
-				valuesList.append(CoherentUncertainty(val, unc, scale))
-		elif uncertaintyType == "Incoherent":
-			for i in range(0, len(variables), 2):
-				val = float(row[i])
-				unc = float(row[i+1])
-				scale = variables[i+1]
-				valuesList.append(IncoherentUncertainty(val, unc, scale))
-		return valuesList
+		if len(variables) % 2 != 0:
+			raise ValueError("The variables line in the file must have 'variable, scale' pairs (ie 2 columns per variable)")
+
+		for i in range(0, len(variables), 2):
+			var = variables[i]
+			for char in "()^*/+-":
+				if char in var:
+					raise ValueError("Variable '{0}' contains an illegal character: '{1}' on line {2}".format(var, char, lineNumber))
+
+			if variables[i] == "":
+				raise ValueError("Cannot have a variable that is a blank string. Please check your headers and try again (there should be a value every 2 columns, starting with the 1st column)")
+			if variables[i] in variables[:i] + variables[i+1:]:
+				raise ValueError("Cannot have two variables in the data with the same name. '{}'".format(variables[i]))
+
+			scale = variables[i+1]
+			try:
+				scale = float(scale)
+				variables[i+1] = scale
+			except ValueError:
+				if not _Uncertainty_Prototype.isValidPrefix(scale):
+					raise ValueError("scale '" + scale + "' must be a number or any of " + str(_Uncertainty_Prototype.validPrefixes()))
+
+		return variables
 
 	@staticmethod
 	def save(outFilePath, data, extra_info = None):
 		"""Save the data to outFilePath.
 
-		TODO: 
-		- more elegant solution is to just use the csv module for saving pandas
-		  is cool, but it isn't meant for this sort of thing.
+		The values and uncertainties of each measurement column are pulled
+		out as arrays in one pass and written together, so this is linear in
+		the number of rows and columns. For outputs bigger than memory, see
+		`saveChunks`.
 
 		Parameters
 		----------
 		outFilePath : str
 		data : `pd.DataFrame`
+			Extra columns, then measurement columns (of measurement objects,
+			or with the `uncertaintyPandas.MeasurementDtype` dtype).
 		extra_info : dict
 			`extra_info` returned by `FileHandler.load()`
 
 		"""
-		
+		with ChunkedFileWriter(outFilePath, extra_info) as writer:
+			writer.write(data)
+		return
+
+	@staticmethod
+	def saveChunks(outFilePath, extra_info = None):
+		"""Return a `ChunkedFileWriter` to save the data chunk by chunk, so
+		that it never has to all be in memory at once.
+
+		Parameters are as per `save`.
+
+		Examples
+		--------
+		>>> reader = FileHandler.loadChunks('in.csv', 100000, 1)
+		>>> with reader, FileHandler.saveChunks('out.csv', reader.extra_info) as writer:
+		... 	for extra_cols, measurements in reader:
+		... 		measurements['z'] = measurements['x'] * measurements['y']
+		... 		writer.write(extra_cols, measurements)
+
+		"""
+		return ChunkedFileWriter(outFilePath, extra_info)
+
+	@staticmethod
+	def _measurementArrays(measurements):
+		"""Return the values and uncertainties of a column of measurements.
+
+		Parameters
+		----------
+		measurements : pd.Series or UncertaintyArray
+			Measurement objects, a `MeasurementDtype` column, or an array.
+
+		Returns
+		-------
+		np.ndarray
+			Values.
+		np.ndarray
+			Uncertainties.
+
+		"""
+		if isinstance(measurements, UncertaintyArray):
+			return measurements.val, measurements.unc
+		array = getattr(measurements, 'array', None)
+		if isinstance(getattr(array, '_data', None), UncertaintyArray):
+			return array.val, array.unc # MeasurementArray
+		valUnc = np.fromiter(((x.val, x.unc) for x in measurements), dtype=(float, 2), count=len(measurements))
+		return valUnc[:, 0], valUnc[:, 1]
+
+	@staticmethod
+	def _uncertaintyTypeOf(measurements):
+		"""Return `"Coherent"` or `"Incoherent"` for a column as accepted by
+		`_measurementArrays` (`"Incoherent"` if it cannot be told)."""
+		if isinstance(measurements, UncertaintyArray):
+			scalarType = measurements._scalarType
+		elif getattr(measurements, 'dtype', object) != object:
+			scalarType = measurements.dtype.type
+		elif len(measurements):
+			scalarType = type(measurements.iloc[0])
+		else:
+			return "Incoherent"
+		return "Coherent" if issubclass(scalarType, CoherentUncertainty) else "Incoherent"
+
+
+	## BINARY FORMAT ##
+	# A dataset saved as 'name.npy' is made of:
+	# - 'name.npy' : float64 array of shape (nRows, 2*nVariables), in Fortran
+	#   order so that each column is contiguous, as `val0, unc0, val1, ...`
+	#   (scaled, i.e. as stored in the measurements)
+	# - 'name.json' : metadata sidecar (`extra_info`, variables, etc.)
+	# - 'name.extra.csv' : the extra columns, if there are any
+	BINARY_FORMAT_VERSION = 1
+
+	@staticmethod
+	def _binaryPaths(filePath):
+		"""Return the `(data, sidecar, extra columns)` paths of a binary
+		dataset, validating `filePath`."""
+		if not isinstance(filePath, str):
+			raise TypeError("filePath must be a string, not a, '{}'".format(type(filePath)))
+		if filePath[-4:] != ".npy":
+			raise ValueError("binary files must be a .npy")
+		base = filePath[:-4]
+		return filePath, base + ".json", base + ".extra.csv"
+
+	@classmethod
+	def binaryToCsv(cls, inFilePath, outFilePath, chunkSize = 100000):
+		"""Convert a binary dataset to the .csv layout of `load`/`save`,
+		streaming `chunkSize` rows at a time.
+
+		Parameters
+		----------
+		inFilePath : str
+			.npy file written by `saveBinary` or `csvToBinary`.
+		outFilePath : str
+			.csv file to write.
+		chunkSize : :obj:`int`, optional
+
+		"""
+		import pandas as pd
+		_, _, extraPath = cls._binaryPaths(inFilePath)
+		_, measurements, extra_info = cls.loadBinary(inFilePath, extraColumns=False)
+		nRows = len(next(iter(measurements.values()))) if measurements else 0
+		if extra_info['columnOffset']:
+			extraChunks = pd.read_csv(extraPath, chunksize=chunkSize)
+		else:
+			extraChunks = (pd.DataFrame(index=range(start, min(start+chunkSize, nRows))) for start in range(0, max(nRows, 1), chunkSize))
+		with ChunkedFileWriter(outFilePath, extra_info) as writer:
+			start = 0
+			for extra_cols in extraChunks:
+				rows = slice(start, start + len(extra_cols))
+				writer.write(extra_cols, {variable: arr[rows] for variable, arr in measurements.items()})
+				start = rows.stop
+		return
+
+	@classmethod
+	def csvToBinary(cls, inFilePath, outFilePath, columnOffset = 0, rowOffset = 0, uncertaintyType = "Incoherent", chunkSize = 100000):
+		"""Convert a .csv file (as per `load`) to the binary format of
+		`saveBinary`, streaming `chunkSize` rows at a time so that the file
+		never has to fit in memory.
+
+		Parameters
+		----------
+		inFilePath : str
+		outFilePath : str
+			.npy file to write (the sidecar files are written next to it).
+		columnOffset, rowOffset, uncertaintyType
+			As per `load`.
+		chunkSize : :obj:`int`, optional
+
+		"""
+		from pythonutils.io import numLinesInFile
+		dataPath, sidecarPath, extraPath = cls._binaryPaths(outFilePath)
+		with open(inFilePath, "rb") as infile:
+			maxRows = max(numLinesInFile(infile) - rowOffset - 1, 0)
+
+		with ChunkedFileReader(inFilePath, chunkSize, columnOffset, rowOffset, uncertaintyType) as reader:
+			out = np.lib.format.open_memmap(dataPath, mode='w+', dtype=float, shape=(maxRows, 2*len(reader.variables)), fortran_order=True)
+			nRows = 0
+			writeHeader = True
+			with open(extraPath, 'w', newline='') if columnOffset else contextlib.nullcontext() as extraFile:
+				for extra_cols, measurements in reader:
+					rows = slice(nRows, nRows + len(extra_cols))
+					for i, arr in enumerate(measurements.values()):
+						out[rows, 2*i] = arr.val
+						out[rows, 2*i+1] = arr.unc
+					if columnOffset:
+						extra_cols.to_csv(extraFile, index=False, header=writeHeader)
+						writeHeader = False
+					nRows = rows.stop
+			out.flush()
+			del out
+			cls._writeSidecar(sidecarPath, reader.extra_info, reader.variables, uncertaintyType, nRows)
+		return
+
+	@classmethod
+	def loadBinary(cls, inFilePath, extraColumns = True):
+		"""Open a binary dataset, memory-mapping the measurements.
+
+		Opening is (nearly) instant regardless of the size of the file, and
+		only the parts of the columns that are used are read from disk.
+
+		Parameters
+		----------
+		inFilePath : str
+			.npy file written by `saveBinary` or `csvToBinary`.
+		extraColumns : :obj:`bool`, optional
+			Also read the extra columns (these are stored as a .csv, so are
+			not memory-mapped). Default `True`.
+
+		Returns
+		-------
+		pd.DataFrame or None
+			The extra columns, or `None` if `extraColumns` is `False`.
+		:obj:`dict` of :obj:`str` to UncertaintyArray
+			Read-only measurement arrays, backed by the memory-mapped file.
+		dict
+			`extra_info`, as per `load`.
+
+		"""
+		import pandas as pd
+		dataPath, sidecarPath, extraPath = cls._binaryPaths(inFilePath)
+		with open(sidecarPath, "r") as infile:
+			meta = json.load(infile)
+		if meta.get('version') != cls.BINARY_FORMAT_VERSION:
+			raise ValueError("'{0}' is not a version {1} binary file".format(sidecarPath, cls.BINARY_FORMAT_VERSION))
+
+		data = np.load(dataPath, mmap_mode='r')
+		nRows = meta['nRows']
+		arrayType = CoherentUncertaintyArray if meta['uncertaintyType'] == "Coherent" else IncoherentUncertaintyArray
+		measurements = {}
+		for i, variable in enumerate(meta['variables']):
+			measurements[variable] = arrayType._fromArrays(data[:nRows, 2*i], data[:nRows, 2*i+1])
+
+		extra_info = meta['extra_info']
+		extra_cols = None
+		if extraColumns:
+			if extra_info['columnOffset']:
+				extra_cols = pd.read_csv(extraPath)
+			else:
+				extra_cols = pd.DataFrame(index=range(nRows))
+		return extra_cols, measurements, extra_info
+
+	@classmethod
+	def saveBinary(cls, outFilePath, data, extra_info = None, uncertaintyType = None):
+		"""Save the data in a binary format that `loadBinary` can
+		memory-map.
+
+		Parameters
+		----------
+		outFilePath : str
+			.npy file to write. The metadata is written to the `.json` file
+			of the same name, and any extra columns to the `.extra.csv`.
+		data : pd.DataFrame
+			As per `save`.
+		extra_info : :obj:`dict`, optional
+			`extra_info` returned by `FileHandler.load()`
+		uncertaintyType : :obj:`str`, optional
+			`"Coherent"` or `"Incoherent"`. Default: inferred from the first
+			measurement column.
+
+		"""
+		dataPath, sidecarPath, extraPath = cls._binaryPaths(outFilePath)
+		extra_info = dict(extra_info) if extra_info else {}
+		extra_info.setdefault('columnOffset', 0)
+		extra_info.setdefault('header_lines', [])
+		extra_info.setdefault('col_scales', {})
+		columnOffset = extra_info['columnOffset']
+		measurementCols = data.iloc[:, columnOffset:]
+		if uncertaintyType is None:
+			uncertaintyType = cls._uncertaintyTypeOf(measurementCols.iloc[:, 0]) if measurementCols.shape[1] else "Incoherent"
+		if uncertaintyType not in ["Coherent", "Incoherent"]:
+			raise ValueError("uncertaintyType must be 'Coherent' or 'Incoherent'")
+
+		out = np.lib.format.open_memmap(dataPath, mode='w+', dtype=float, shape=(len(data), 2*measurementCols.shape[1]), fortran_order=True)
+		for i, (_, column) in enumerate(measurementCols.items()):
+			out[:, 2*i], out[:, 2*i+1] = cls._measurementArrays(column)
+		out.flush()
+		del out
+		if columnOffset:
+			data.iloc[:, :columnOffset].to_csv(extraPath, index=False)
+		cls._writeSidecar(sidecarPath, extra_info, list(measurementCols.columns), uncertaintyType, len(data))
+		return
+
+	@classmethod
+	def _writeSidecar(cls, sidecarPath, extra_info, variables, uncertaintyType, nRows):
+		"""Write the metadata of a binary dataset."""
+		col_scales = extra_info.get('col_scales') or {}
+		meta = {
+			'version': cls.BINARY_FORMAT_VERSION,
+			'uncertaintyType': uncertaintyType,
+			'nRows': nRows,
+			'variables': variables,
+			'extra_info': {
+				'header_lines': extra_info.get('header_lines') or [],
+				'columnOffset': extra_info.get('columnOffset') or 0,
+				'col_scales': {variable: col_scales.get(variable, 1) for variable in variables},
+			},
+		}
+		with open(sidecarPath, "w") as outfile:
+			json.dump(meta, outfile, indent='\t')
+		return
+
+
+class ChunkedFileReader:
+	"""Stream a `FileHandler` formatted .csv file in fixed-size chunks.
+
+	The file is read once, front to back, and only one chunk is held in
+	memory at a time. Iterating yields `(extra_cols, measurements)` for each
+	chunk of up to `chunkSize` rows:
+	- `extra_cols` : `pd.DataFrame` of the columns before `columnOffset`
+	- `measurements` : `{variable: UncertaintyArray}` of the scaled values
+	  and uncertainties of each variable
+
+	Can also be used in a `with` statement to close the file.
+
+	Attributes
+	----------
+	variables : :obj:`list` of :obj:`str`
+		Names of the measurement variables, in file order.
+	extra_info : dict
+		As returned by `FileHandler.load`, available before iterating.
+
+	"""
+
+	# pandas' default missing value markers, only applied to the extra
+	# columns (the numeric block is validated instead).
+	_NA_STRINGS = ['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN',
+				   '-nan', '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL',
+				   'NaN', 'None', 'n/a', 'nan', 'null']
+
+	def __init__(self, inFilePath, chunkSize = 100000, columnOffset = 0, rowOffset = 0, uncertaintyType = "Incoherent"):
+		"""Open the file and read its headers. See `FileHandler.loadChunks`."""
+		FileHandler._checkLoadArguments(inFilePath, columnOffset, rowOffset, uncertaintyType)
+		if chunkSize is not None and (not isinstance(chunkSize, int) or chunkSize < 1):
+			raise ValueError("chunkSize must be a positive int, not '{}'".format(chunkSize))
+		self._chunkSize = chunkSize
+		self._columnOffset = columnOffset
+		self._arrayType = CoherentUncertaintyArray if uncertaintyType == "Coherent" else IncoherentUncertaintyArray
+
+		self._file = open(inFilePath, "r")
+		reader = csv.reader(self._file)
+		header_lines = []
+		for i in range(rowOffset):
+			header_lines.append(next(reader))
+		lineNumber = rowOffset + 1
+		row = next(reader)
+		self._extraNames = row[:columnOffset]
+		variables = FileHandler._prepareVariableLine(row[columnOffset:], lineNumber)
+		self._firstDataLine = lineNumber + 1
+
+		self.variables = variables[::2]
+		self._scales = [_Uncertainty_Prototype.prefixToScale(scale) for scale in variables[1::2]]
+		self.extra_info = {
+			'header_lines': header_lines,
+			'columnOffset': columnOffset,
+			'col_scales': dict(zip(variables[::2], variables[1::2]))
+		}
+		return
+
+	def __iter__(self):
+		"""
+		Yields
+		------
+		tuple[pd.DataFrame, dict]
+			`(extra_cols, measurements)` for each chunk.
+
+		"""
+		import pandas as pd
+		nCols = self._columnOffset + 2*len(self.variables)
+		lineNumber = self._firstDataLine
+		try:
+			try:
+				# one spare column, as pandas silently drops the excess fields of
+				# long rows when reading in chunks
+				reader = pd.read_csv(self._file, header=None, names=range(nCols + 1),
+									 index_col=False, chunksize=self._chunkSize,
+									 keep_default_na=False,
+									 na_values={i: self._NA_STRINGS for i in range(self._columnOffset)})
+			except pd.errors.EmptyDataError:
+				return
+			if self._chunkSize is None:
+				reader = [reader]
+			for chunk in reader:
+				excess = (chunk[nCols] != '').to_numpy()
+				if excess.any():
+					raise ValueError("line {0} has more than the {1} columns of the variables line".format(lineNumber + int(np.argmax(excess)), nCols))
+				values = FileHandler._parseDataBlock(chunk.iloc[:, self._columnOffset:nCols], lineNumber)
+				measurements = {}
+				for i, (variable, scale) in enumerate(zip(self.variables, self._scales)):
+					val, unc = values[:, 2*i], values[:, 2*i+1]
+					if scale != 1:
+						val, unc = val * scale, unc * scale
+					if np.any(unc < 0):
+						row = int(np.argmax(unc < 0))
+						raise ValueError("uncertainty must be positive, not '{0}'. This is on line {1} in the file".format(values[row, 2*i+1], lineNumber + row))
+					measurements[variable] = self._arrayType._fromArrays(val, unc)
+				extra_cols = chunk.iloc[:, :self._columnOffset]
+				extra_cols.columns = self._extraNames
+				lineNumber += len(chunk)
+				yield (extra_cols, measurements)
+		except pd.errors.ParserError as e:
+			# pandas counts lines from the start of the data
+			message = re.sub(r"line (\d+)", lambda m: "line {}".format(int(m.group(1)) + self._firstDataLine - 1), str(e).strip())
+			raise ValueError("could not parse the data: {}".format(message))
+		return
+
+	def close(self):
+		"""Close the file."""
+		self._file.close()
+		return
+
+	def readAll(self):
+		"""Return the rest of the file as a single chunk.
+
+		Returns
+		-------
+		pd.DataFrame
+			Extra columns.
+		:obj:`dict` of :obj:`str` to UncertaintyArray
+			Measurements.
+
+		"""
+		import pandas as pd
+		self._chunkSize = None
+		for chunk in self:
+			return chunk
+		empty = np.empty(0)
+		return pd.DataFrame(columns=self._extraNames), {variable: self._arrayType._fromArrays(empty, empty) for variable in self.variables}
+
+	def __enter__(self): return self
+
+	def __exit__(self, *exc): self.close()
+
+
+
+class ChunkedFileWriter:
+	"""Write a `FileHandler` formatted .csv file chunk by chunk.
+
+	The header lines are written on opening, and the variables line with the
+	first chunk. Use in a `with` statement (or call `close`) to close the
+	file. See `FileHandler.saveChunks`.
+
+	"""
+
+	def __init__(self, outFilePath, extra_info = None):
+		"""Open the file and write the header lines. See `FileHandler.save`."""
 		# TYPE CHECKING
-		if extra_info == None: 
+		if extra_info == None:
 			extra_info = {}
 		elif type(extra_info) != dict:
 			raise TypeError("'extra_info' must be 'None' or type 'dict', not type '{}'".format(type(extra_info)))
 		extra_info['columnOffset'] = extra_info['columnOffset'] if extra_info.get('columnOffset', False) else 0
 		extra_info['header_lines'] = extra_info['header_lines'] if extra_info.get('header_lines', False) else []
 		extra_info['col_scales'] = extra_info['col_scales'] if extra_info.get('col_scales', False) else {}
+		self.extra_info = extra_info
 
 		# SAVING HEADERS
-		with open(outFilePath, 'w') as outfile:
-			writer = csv.writer(outfile)
-			writer.writerows(extra_info['header_lines'])
-			
-		# SAVING DATA
-		out_df = data.iloc[:, :extra_info['columnOffset']] #extra preceding cols
-		for data_colName, measurements in data.iloc[:, extra_info['columnOffset']:].items():
-			scale = extra_info['col_scales'].get(data_colName, 1)
+		self._file = open(outFilePath, 'w', newline='')
+		csv.writer(self._file).writerows(extra_info['header_lines'])
+		self._writeHeader = True
+		return
+
+	def write(self, data, measurements = None):
+		"""Append rows to the file.
+
+		Parameters
+		----------
+		data : pd.DataFrame
+			As per `FileHandler.save`. If `measurements` is given, this is
+			only the extra columns.
+		measurements : :obj:`dict` of :obj:`str` to UncertaintyArray, optional
+			Measurement columns, e.g. as yielded by `ChunkedFileReader`.
+
+		"""
+		import pandas as pd
+		columnOffset = self.extra_info['columnOffset']
+		if measurements is None:
+			extra_cols = data.iloc[:, :columnOffset]
+			measurements = data.iloc[:, columnOffset:].items()
+		else:
+			extra_cols = data
+			measurements = measurements.items()
+
+		names = []
+		arrays = []
+		for data_colName, column in measurements:
+			scale = self.extra_info['col_scales'].get(data_colName, 1)
 			scale_as_num = _Uncertainty_Prototype.prefixToScale(scale)
-			vals = measurements.apply(lambda x: x.val/scale_as_num)
-			uncs = measurements.apply(lambda x: x.unc/scale_as_num)
-			# the whole np.array().T is because pd.DataFrame is acting strangely when I do pd.DataFrame([vals,uncs])
-			if scale == 1:
-				extracted_cols = pd.DataFrame(np.array([vals, uncs]).T, columns=[data_colName, ""])
-			else:
-				extracted_cols = pd.DataFrame(np.array([vals, uncs]).T, columns=[data_colName, scale])
-			out_df = out_df.merge(extracted_cols, left_index=True, right_index=True) #adds _x and _y to uncertainty column names
-		
-		out_df = out_df.rename(lambda x: x[:-2] if x[-2:] in ['_x', '_y'] else x, axis="columns") #remove _x, _y from column names
-		out_df.to_csv(outFilePath, mode='a', index=False)
+			vals, uncs = FileHandler._measurementArrays(column)
+			arrays += [vals / scale_as_num, uncs / scale_as_num]
+			names += [data_colName, "" if scale == 1 else scale]
+		values = np.column_stack(arrays) if arrays else np.empty((len(extra_cols), 0))
+
+		out_df = pd.DataFrame(values, columns=names, index=extra_cols.index)
+		out_df = pd.concat([extra_cols, out_df], axis=1)
+		out_df.to_csv(self._file, index=False, header=self._writeHeader)
+		self._writeHeader = False
+		return
+
+	def close(self):
+		"""Close the file."""
+		self._file.close()
 		return
 
+	def __enter__(self): return self
+
+	def __exit__(self, *exc): self.close()
+
 
 
 ################################## FUNCTIONS ##################################
-def log(x, base = math.e):
-	"""math.log() but also supports UncertaintyFull objects. 
-	
-	Will return an UncertaintyFull object if the uncertainty of the returned
-	value is non-zero.
+def _asUncertaintyArray(x):
+	"""Return `x` as an `UncertaintyArray` where possible.
 
-	be aware that this is only accurate for x around 1 (read Propagation of
-	Uncertainty for why)
+	Parameters
+	----------
+	x : any
+		`UncertaintyArray`, pandas `Series`/`MeasurementArray` of
+		measurements (extension or `object` dtype), or a list/`object` array of
+		scalar measurements. Anything else (numbers, numeric arrays, scalar
+		measurements) is returned unchanged.
+
+	Returns
+	-------
+	UncertaintyArray, any
+
+	"""
+	if isinstance(x, UncertaintyArray): return x
+	data = getattr(getattr(x, 'array', x), '_data', None) # Series/MeasurementArray
+	if isinstance(data, UncertaintyArray): return data
+	if isinstance(x, (list, tuple)) or getattr(x, 'dtype', None) == object:
+		return UncertaintyArray.fromMeasurements(x)
+	return x
+
+def _boundHull(*values):
+	"""Return `(min, max)` of `values` (elementwise for arrays), or `nan`s if
+	any is `nan`.
+
+	This and the other `_bound` functions are the elementwise operations of
+	`_intervalMul` etc., so that one implementation serves both
+	`GeneralUncertainty` and `GeneralUncertaintyArray`. Plain numbers are
+	computed in pure Python, as NumPy's overhead dominates for single values.
+
+	"""
+	if np.ndarray in map(type, values):
+		values = np.stack(np.broadcast_arrays(*values))
+		return values.min(axis=0), values.max(axis=0)
+	if any(map(math.isnan, values)):
+		return (math.nan, math.nan)
+	return (min(values), max(values))
+
+def _boundPower(x, y):
+	"""Return `x**y` as `np.power` of floats would: infinite rather than
+	raising, and `nan` where complex."""
+	if isinstance(x, np.ndarray) or isinstance(y, np.ndarray):
+		with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+			return np.power(x, y, dtype=float)
+	try:
+		p = float(x) ** float(y)
+	except (ZeroDivisionError, OverflowError):
+		return math.copysign(math.inf, x) if y % 2 == 1 else math.inf
+	return math.nan if isinstance(p, complex) else p
+
+def _boundProduct(x, y):
+	"""Return `x*y`, with a zero times an infinity taken as `0`."""
+	if isinstance(x, np.ndarray) or isinstance(y, np.ndarray):
+		with np.errstate(invalid='ignore'):
+			p = np.multiply(x, y, dtype=float)
+		return np.where(np.isnan(p) & ~np.isnan(x) & ~np.isnan(y), 0.0, p)
+	p = float(x) * float(y)
+	return 0.0 if (p != p and x == x and y == y) else p
+
+def _boundReciprocal(x):
+	"""Return `1/x`, infinite (with the sign of `x`) rather than raising for
+	`x == 0`."""
+	if isinstance(x, np.ndarray):
+		with np.errstate(divide='ignore'):
+			return 1 / x.astype(float)
+	return 1 / x if x != 0 else math.copysign(math.inf, x)
+
+def _boundWhere(condition, x, y):
+	"""Return `x` where `condition`, otherwise `y` (as `np.where`)."""
+	if isinstance(condition, np.ndarray):
+		return np.where(condition, x, y)
+	return x if condition else y
+
+def _divide(x, y):
+	"""Return `x/y`. Exact values (`Fraction`s, or `object` arrays of them)
+	are divided elementwise, with the division by zero semantics of floats
+	(`inf`/`nan` and a `RuntimeWarning`) rather than `ZeroDivisionError`."""
+	if not (_isExact(x) or _isExact(y)):
+		return x / y
+	return _exactDivide(x, y)
+
+_exactDivide = np.frompyfunc(lambda x, y: x / y if y != 0 else np.float64(x) / np.float64(y), 2, 1)
+
+def _exactOrFloat(f, *xs):
+	"""Return `f(*xs)`. If `xs` are exact (`Fraction`s, or `object` arrays of
+	them) and `f` has no exact result (e.g. `np.sqrt`, `np.log`), it is
+	evaluated in float64 and the result converted back to exact."""
+	if not any(_isExact(x) for x in xs):
+		return f(*xs)
+	try:
+		return _toExact(f(*xs)) # e.g. a derivative that is a float constant
+	except (TypeError, AttributeError, ZeroDivisionError):
+		return _toExact(f(*[np.asarray(x, dtype=np.float64) for x in xs]))
+
+def _exactValue(x):
+	"""Return `x` as a `fractions.Fraction`, or as a `float` if it is `nan` or
+	infinite (which have no exact form)."""
+	try:
+		return fractions.Fraction(x)
+	except (ValueError, OverflowError):
+		value = float(x)
+		if math.isfinite(value): raise
+		return value
+
+def _extremiseStarts(f, centre, domain, precs, maxPrecs, useDynamicStepSize,
+					 vectorized, tolerance, relativeTolerance, args, kwargs,
+					 starts, maxEvaluations, cache = None):
+	"""Climb to the minimum and maximum from each of `starts`, for
+	`GeneralUncertainty.extremise`.
+
+	Module-level so that it can be sent to a process pool. Function values
+	are stored in `cache` (a new `dict` if not given), shared by all of the
+	climbs.
+
+	Returns
+	-------
+	:obj:`tuple`
+		`(minValue, maxValue, numberOfEvaluations)`, or `None` if the budget
+		ran out before any start.
+
+	"""
+	cls = GeneralUncertainty
+	evaluate, count = cls._makeCachedEvaluator(cls._makeEvaluator(f, vectorized, args, kwargs),
+												{} if cache is None else cache)
+	negated = lambda points: -evaluate(points)
+	offsets = cls._neighbourhoodOffsets(len(centre))
+	reference = None
+	if relativeTolerance is not None:
+		reference = evaluate(np.array([centre], dtype=float))[0]
+	minVal, maxVal = math.inf, -math.inf
+	nRequested = {1: 0, -1: 0} # points asked for by each direction, as per `maximise`
+	for start in starts:
+		startVal = None
+		for (sign, g) in ((1, evaluate), (-1, negated)):
+			if maxEvaluations is not None and nRequested[sign] >= maxEvaluations:
+				continue
+			if startVal is None:
+				startVal = evaluate(np.array([start], dtype=float))[0]
+			nRequested[sign] += 1
+			budget = None if maxEvaluations is None else maxEvaluations - nRequested[sign]
+			ref = None if reference is None else sign * reference
+			_, val, n = cls._hillClimb(g, start, sign * startVal, domain, precs, maxPrecs,
+				useDynamicStepSize, offsets, budget, tolerance, relativeTolerance, ref)
+			nRequested[sign] += n
+			if sign == 1: maxVal = max(maxVal, val)
+			else: minVal = min(minVal, -val)
+	if nRequested[1] == 0 or nRequested[-1] == 0: return None
+	return (minVal, maxVal, count())
+
+def _fullDomainTiles(f, axes, start, stop, tileSize, vectorized, args, kwargs):
+	"""Search the flat grid indices `[start, stop)` for
+	`GeneralUncertainty.fullDomainExtrema`, one tile at a time.
+
+	Module-level so that it can be sent to a process pool.
+
+	Returns
+	-------
+	:obj:`tuple`
+		`(minValue, minIndex, maxValue, maxIndex)`, with `nan` values
+		ignored.
 
-	I'm going to do this in a less efficient, but more readable manner
-	(compared to Uncertainty classes definition).
-	
 	"""
-	raise NotImplementedError("Not completed/up-to-date")
-
-	if type(x) == IncoherentUncertainty or type(base) == IncoherentUncertainty:
-		raise NotImplementedError("log() does not currently work for IncoherentUncertainty objects. Try using CoherentUncertainty")
-	if type(x) == CoherentUncertainty:
-		A = x.val
-		a = x.unc
-		if type(base) == CoherentUncertainty:
-			B = base.val
-			b = base.unc
+	shape = tuple(len(axis) for axis in axes)
+	minVal, minIndex, maxVal, maxIndex = math.inf, start, -math.inf, start
+	for tileStart in range(start, stop, tileSize):
+		indices = np.arange(tileStart, min(tileStart + tileSize, stop))
+		coords = np.unravel_index(indices, shape)
+		params = [axis[c] for (axis, c) in zip(axes, coords)]
+		if vectorized:
+			vals = np.broadcast_to(np.asarray(f(*params, *args, **kwargs), dtype=float), indices.shape)
 		else:
-			try: float(base)
-			except ValueError: raise TypeError("base must be floatable")
-			B = base
-			b = 0
-
-	elif type(base) == CoherentUncertainty:
-		try: float(x)
-		except ValueError: raise TypeError("x must be floatable")
-		A = x
-		a = 0
-		B = base.val
-		b = base.unc
+			vals = np.array([f(*p, *args, **kwargs) for p in zip(*[param.tolist() for param in params])], dtype=float)
+		valid = ~np.isnan(vals)
+		if not valid.any(): continue
+		i = np.argmin(np.where(valid, vals, np.inf))
+		if vals[i] < minVal: minVal, minIndex = float(vals[i]), int(indices[i])
+		i = np.argmax(np.where(valid, vals, -np.inf))
+		if vals[i] > maxVal: maxVal, maxIndex = float(vals[i]), int(indices[i])
+	return (minVal, minIndex, maxVal, maxIndex)
+
+def _intervalDiv(aLo, aHi, bLo, bHi):
+	"""Return the bounds of `a/b` for the intervals `a=[aLo, aHi]` and
+	`b=[bLo, bHi]` (elementwise for arrays).
+
+	A `b` containing zero gives unbounded results (the hull of both sides of
+	the asymptote), and `b` exactly `[0, 0]` gives `nan`.
+
+	Returns
+	-------
+	:obj:`tuple`
+		`(lower, upper)`
+
+	"""
+	straddles = (bLo < 0) & (bHi > 0)
+	zero = (bLo == 0) & (bHi == 0)
+	recipLo = _boundWhere(straddles | (bHi == 0), -math.inf, _boundReciprocal(bHi))
+	recipHi = _boundWhere(straddles | (bLo == 0), math.inf, _boundReciprocal(bLo))
+	recipLo = _boundWhere(zero, math.nan, recipLo)
+	recipHi = _boundWhere(zero, math.nan, recipHi)
+	return _intervalMul(aLo, aHi, recipLo, recipHi)
+
+def _intervalMul(aLo, aHi, bLo, bHi):
+	"""Return the bounds of `a*b` for the intervals `a=[aLo, aHi]` and
+	`b=[bLo, bHi]` (elementwise for arrays).
+
+	The extremes of a product are always at the corners. A zero bound times
+	an infinite one is taken as `0`.
+
+	Returns
+	-------
+	:obj:`tuple`
+		`(lower, upper)`
+
+	"""
+	return _boundHull(_boundProduct(aLo, bLo), _boundProduct(aLo, bHi),
+					  _boundProduct(aHi, bLo), _boundProduct(aHi, bHi))
+
+def _intervalPow(aLo, aHi, bLo, bHi):
+	"""Return the bounds of `a**b` for the intervals `a=[aLo, aHi]` and
+	`b=[bLo, bHi]` (elementwise for arrays).
+
+	For a non-negative base `a**b` is monotonic in each argument, so the
+	extremes are at the corners. A base that may be negative is only real for
+	exact integer exponents (`bLo == bHi`), which are handled separately;
+	anything else gives `nan`.
+
+	Returns
+	-------
+	:obj:`tuple`
+		`(lower, upper)`
 
+	"""
+	lower, upper = _boundHull(_boundPower(aLo, bLo), _boundPower(aLo, bHi),
+							  _boundPower(aHi, bLo), _boundPower(aHi, bHi))
+
+	# Integer exponents: x**n is monotonic for odd n, and depends only on |x|
+	# for even n. Negative n are the reciprocal of x**|n|.
+	finite = _boundWhere(abs(bLo) < math.inf, bLo, 0.5)
+	integer = (bLo == bHi) & (finite % 1 == 0)
+	if isinstance(integer, np.ndarray) or integer:
+		n = _boundWhere(integer, abs(finite), 0.0)
+		absLo, absHi = _boundHull(abs(aLo), abs(aHi))
+		absLo = _boundWhere((aLo <= 0) & (aHi >= 0), 0.0, absLo)
+		even = (n % 2 == 0)
+		intLo = _boundWhere(even, _boundPower(absLo, n), _boundPower(aLo, n))
+		intHi = _boundWhere(even, _boundPower(absHi, n), _boundPower(aHi, n))
+		recipLo, recipHi = _intervalDiv(1.0, 1.0, intLo, intHi)
+		intLo = _boundWhere(bLo < 0, recipLo, intLo)
+		intHi = _boundWhere(bLo < 0, recipHi, intHi)
 	else:
-		try: float(x)
-		except ValueError: raise TypeError("x must be floatable")
-		try: float(base)
-		except ValueError: raise TypeError("base must be floatable")
-		A = x
-		a = 0
-		B = base
-		b = 0
-
-	if a == 0 and b == 0:
-		return math.log(A,B)
-
-	if A <= 0: raise ValueError("log(A, B) cannot be calculated with uncertain values for A<=0")
-	if A == 1: raise ValueError("log(A, B) cannot be calculated with uncertain values for A==1")
-	if B <= 0: raise ValueError("log(A, B) cannot be calculated with uncertain values for B<=0")
-
-	# if a=0 and A=1, then L'Hospital's rule gives unc = val*(1/A + b/(B*math.log(B)))
-
-	if 0 <= A <= 1:
-		if 0 <= B <= 1:
-			#print("a")
-			val = math.log1p(A-1) / math.log1p(B-1)
-			unc = val*(a/(A*math.log1p(A-1)) + b/(B*math.log1p(B-1)))
+		intLo = intHi = None # not used, as `integer` is `False`
+
+	lower = _boundWhere(integer, intLo, _boundWhere(aLo < 0, math.nan, lower))
+	upper = _boundWhere(integer, intHi, _boundWhere(aLo < 0, math.nan, upper))
+	isNan = (aLo != aLo) | (aHi != aHi) | (bLo != bLo) | (bHi != bHi)
+	lower = _boundWhere(isNan, math.nan, lower)
+	upper = _boundWhere(isNan, math.nan, upper)
+	return lower, upper
+
+def _isExact(x):
+	"""Return whether `x` is an exact value (`Fraction`/`Decimal`) or an
+	`object` array of them, as stored by exact `UncertaintyArray`s."""
+	return isinstance(x, (fractions.Fraction, decimal.Decimal)) or getattr(x, 'dtype', None) == object
+
+def _loadFileArrays(inFilePath, columnOffset, rowOffset, uncertaintyType):
+	"""Load one file for `FileHandler.loadMany`, as plain arrays (which are
+	cheap to send between processes).
+
+	Module-level so that it can be sent to a process pool.
+
+	Returns
+	-------
+	pd.DataFrame
+		Extra columns.
+	:obj:`dict` of :obj:`str` to :obj:`tuple` of np.ndarray
+		`{variable: (val, unc)}`.
+	dict
+		`extra_info`, as per `FileHandler.load`.
+
+	"""
+	try:
+		with ChunkedFileReader(inFilePath, None, columnOffset, rowOffset, uncertaintyType) as reader:
+			extra_cols, measurements = reader.readAll()
+	except (ValueError, StopIteration) as e:
+		raise ValueError("could not load '{0}': {1}".format(inFilePath, e)) from None
+	return extra_cols, {variable: (arr.val, arr.unc) for variable, arr in measurements.items()}, reader.extra_info
+
+def _objectScalar(x):
+	"""Return `x` wrapped in a 0-dimensional `object` array."""
+	arr = np.empty((), dtype=object)
+	arr[()] = x
+	return arr
+
+def _toExact(x):
+	"""Return `x` as an `object` array of `fractions.Fraction`s (converting
+	floats, `Decimal`s, `int`s and strings exactly). Non-finite values stay
+	`float`s."""
+	x = np.asarray(x)
+	if x.dtype.kind == 'f':
+		x = x.astype(np.float64) # Fraction only accepts Python (64 bit) floats
+	return np.asarray(_toFraction(x.astype(object)), dtype=object)
+
+_toFraction = np.frompyfunc(_exactValue, 1, 1)
+
+def log(x, base = math.e):
+	"""math.log() but also supports measurements and `UncertaintyArray`s.
+
+	The uncertainty is propagated to first order (see
+	`CoherentUncertainty.__array_ufunc__`), so it is only accurate while the
+	uncertainty is small compared to the value.
+
+	Parameters
+	----------
+	x : measurement, UncertaintyArray or number
+	base : measurement or number, optional
+		Default `math.e`.
+
+	Returns
+	-------
+	measurement, UncertaintyArray or float
+		A plain `float` if neither `x` nor `base` is a measurement.
+
+	"""
+	measurementTypes = (_Uncertainty_Prototype, UncertaintyArray)
+	if isinstance(base, measurementTypes):
+		return np.log(x) / np.log(base)
+	if not isinstance(x, measurementTypes):
+		return math.log(x, base)
+	if base == math.e:
+		return np.log(x)
+	lnBase = math.log(base)
+	logBase = lambda A: np.log(A) / lnBase
+	derivative = lambda A: 1 / (A * lnBase)
+	if isinstance(x, UncertaintyArray):
+		return x._fromArrays(logBase(x.val), np.abs(derivative(x.val)) * x.unc)
+	result = x._applyUnary(logBase, derivative)
+	if result is NotImplemented:
+		raise TypeError("log() is not supported for '{}'".format(type(x)))
+	return result
+
+def monteCarlo(f, inputs, nSamples = 100000, seed = None, percentiles = 'auto',
+			   chunkSize = None, *args, **kwargs):
+	"""Propagate uncertainty by evaluating `f` on random samples of `inputs`.
+
+	`f` must be vectorised: it is called once per chunk as
+		`f(*samples, *args, **kwargs)`
+	where each element of `samples` is an `np.ndarray` of shape
+	`(chunk, *shape)`, `shape` being the broadcast shape of the inputs
+	(`()` for scalar measurements, `(rows,)` for dataset columns).
+
+	Inputs are sampled as:
+	- `IncoherentUncertainty(Array)` : normal, standard deviation `unc`
+	- `CorrelatedUncertainty` : normal, jointly over their shared sources so
+	  that their correlations are kept
+	- `CoherentUncertainty(Array)` : uniform over `[val-unc, val+unc]`
+	- `GeneralUncertainty` : uniform over `[val-unc[0], val+unc[1]]`
+	- numbers and numeric arrays : constant
+
+	Parameters
+	----------
+	f : function
+		Vectorised function to propagate through.
+	inputs : :obj:`list`
+		Measurements, measurement arrays or numbers passed to `f`.
+	nSamples : :obj:`int`, optional
+		Number of samples. Default `100000`.
+	seed : :obj:`int`, optional
+		Seed for `np.random.default_rng`, for reproducible results (given
+		the same `chunkSize`).
+	percentiles : :obj:`tuple` of :obj:`float`, optional
+		`(lower, upper)` percentile bounds to calculate, or `None` to skip
+		them. Default `'auto'`: `(2.5, 97.5)` for scalar results, `None`
+		for array results (see Notes).
+	chunkSize : :obj:`int`, optional
+		Samples evaluated per call of `f`. Default chosen so that each chunk
+		of samples uses roughly 32MB.
+
+	Returns
+	-------
+	MonteCarloResult
+
+	Notes
+	-----
+	The mean and standard deviation are accumulated chunk by chunk (Chan et
+	al.'s pairwise update), so with `percentiles=None` memory is bounded by
+	`chunkSize`. Percentiles need every sampled output, i.e. `nSamples *
+	prod(shape)` floats (e.g. 80GB for 10**5 samples of 10**5 rows), so are
+	only calculated by default for scalar results.
+
+	"""
+	rng = np.random.default_rng(seed)
+
+	# Split inputs into kinds of sampling
+	sourceIndex = {}
+	for x in inputs:
+		if isinstance(x, CorrelatedUncertainty):
+			for k in x._contribs:
+				sourceIndex.setdefault(k, len(sourceIndex))
+	samplers = []
+	for x in inputs:
+		if isinstance(x, CorrelatedUncertainty):
+			weights = np.zeros(len(sourceIndex))
+			for k, c in x._contribs.items():
+				weights[sourceIndex[k]] = c
+			samplers.append(('correlated', x.val, weights))
+		elif isinstance(x, (IncoherentUncertainty, IncoherentUncertaintyArray)):
+			samplers.append(('normal', np.asarray(x.val, dtype=float), np.asarray(x.unc, dtype=float)))
+		elif isinstance(x, (CoherentUncertainty, CoherentUncertaintyArray)):
+			val, unc = np.asarray(x.val, dtype=float), np.asarray(x.unc, dtype=float)
+			samplers.append(('uniform', val - unc, val + unc))
+		elif isinstance(x, GeneralUncertainty):
+			samplers.append(('uniform', np.asarray(x.val - x.unc[0]), np.asarray(x.val + x.unc[1])))
+		elif isinstance(x, _Uncertainty_Prototype):
+			raise TypeError("cannot sample '{}'".format(type(x)))
 		else:
-			#print("b", A, a, B, b)
-			val = math.log1p(A-1) / math.log(B)
-			unc = val*(a/(A*math.log1p(A-1)) + b/(B*math.log(B)))
-	else:
-		if 0 <= B <= 1:
-			#print("c")
-			val = math.log(A) / math.log1p(B-1)
-			unc = val*(a/(A*math.log(A)) + b/(B*math.log1p(B-1)))
+			samplers.append(('constant', np.asarray(x, dtype=float), None))
+	shape = np.broadcast_shapes(*[np.shape(s[1]) for s in samplers])
+	if isinstance(percentiles, str) and percentiles == 'auto':
+		percentiles = (2.5, 97.5) if shape == () else None
+	if chunkSize is None:
+		elementsPerSample = max(1, int(np.prod(shape))) * (len(inputs) + 1)
+		chunkSize = max(1, min(nSamples, 2**22 // elementsPerSample))
+
+	# Sample and accumulate
+	n, mean, M2 = 0, np.zeros(shape), np.zeros(shape)
+	outputs = []
+	while n < nSamples:
+		m = min(chunkSize, nSamples - n)
+		eps = rng.standard_normal((m, len(sourceIndex))) if sourceIndex else None
+		samples = []
+		for kind, a, b in samplers:
+			if kind == 'normal':
+				samples.append(rng.normal(a, b, (m,) + shape))
+			elif kind == 'uniform':
+				samples.append(rng.uniform(a, b, (m,) + shape))
+			elif kind == 'correlated':
+				samples.append(np.broadcast_to((a + eps @ b).reshape((m,) + (1,)*len(shape)), (m,) + shape))
+			else:
+				samples.append(np.broadcast_to(a, (m,) + shape))
+		out = np.broadcast_to(np.asarray(f(*samples, *args, **kwargs), dtype=float), (m,) + shape)
+
+		chunkMean = out.mean(axis=0)
+		chunkM2 = ((out - chunkMean)**2).sum(axis=0)
+		delta = chunkMean - mean
+		total = n + m
+		mean = mean + delta * (m / total)
+		M2 = M2 + chunkM2 + delta**2 * (n * m / total)
+		n = total
+		if percentiles is not None:
+			outputs.append(np.array(out))
+
+	std = np.sqrt(M2 / (n - 1)) if n > 1 else np.full(shape, np.nan)
+	lower = upper = None
+	if percentiles is not None:
+		lower, upper = np.percentile(np.concatenate(outputs), percentiles, axis=0)
+	if shape == ():
+		mean, std = float(mean), float(std)
+		if percentiles is not None: lower, upper = float(lower), float(upper)
+	return MonteCarloResult(mean, std, lower, upper, None if percentiles is None else tuple(percentiles), n)
+
+def placeholders(*names):
+	"""Return symbolic placeholder measurements, for building `Expression`s.
+
+	Parameters
+	----------
+	*names : str
+		Variable names, matching the column names of the data the compiled
+		expression will be evaluated on.
+
+	Returns
+	-------
+	Expression, :obj:`tuple` of :obj:`Expression`
+		A single placeholder if one name is given.
+
+	Examples
+	--------
+	>>> x, y = placeholders('x', 'y')
+	>>> z = (x*y + x).compile('Incoherent')
+
+	"""
+	for name in names:
+		if not isinstance(name, str):
+			raise TypeError("names must be strings, not '{}'".format(type(name)))
+	result = tuple(Expression('var', (name,)) for name in names)
+	if len(result) == 1: return result[0]
+	return result
+
+def propagateCovariance(f, inputs, cov = None, method = 'complex', step = None,
+						*args, **kwargs):
+	"""Propagate the covariance of `inputs` through the vector function `f`
+	to first order: `cov_out = J cov J^T`.
+
+	`f` must be vectorised: it is called once, as
+		`f(*params, *args, **kwargs)`
+	where each element of `params` is an `np.ndarray` of shape `(k,
+	*batch)`: the values, and each perturbation needed for the Jacobian, of
+	every row of the batch. It returns a tuple of its `m` outputs (each
+	broadcastable to `(k, *batch)`), or a single output.
+
+	Parameters
+	----------
+	f : function
+		Vectorised vector function.
+	inputs : :obj:`list`
+		The `n` inputs of `f`: measurements, measurement arrays (of the batch
+		shape), or numbers and numeric arrays.
+	cov : :obj:`array_like`, optional
+		Covariance matrix of the inputs, shape `(n, n)` or `(*batch, n, n)`.
+		By default it is built from `inputs`: the squared uncertainties on
+		the diagonal, plus the covariances between `CorrelatedUncertainty`
+		inputs. If given, only the values of `inputs` are used.
+	method : :obj:`str`, optional
+		How the Jacobian is calculated:
+		- `'complex'` (default): complex-step differences, exact to machine
+		  precision, but `f` must be analytic and accept complex input (so no
+		  `abs`, comparisons or `np.real`).
+		- `'central'`: central finite differences, for any smooth `f`.
+	step : :obj:`float`, optional
+		Step relative to the magnitude of each value (absolute if the value is
+		`0`). Default `1e-20` for `'complex'`, and the cube root of the
+		machine epsilon for `'central'`.
+
+	Returns
+	-------
+	CovarianceResult
+
+	Notes
+	-----
+	As with the other first-order propagations, `CoherentUncertainty`
+	uncertainties are treated as standard uncertainties. The function is
+	evaluated at `n+1` (`'complex'`) or `2n+1` (`'central'`) points per row,
+	all in the single call of `f`.
+
+	"""
+	if method not in ('complex', 'central'):
+		raise ValueError("method must be 'complex' or 'central', not '{}'".format(method))
+	n = len(inputs)
+
+	# Values and input covariance
+	vals, variances = [], []
+	for x in inputs:
+		if isinstance(x, GeneralUncertainty):
+			raise TypeError("cannot propagate the asymmetric uncertainties of '{}'".format(type(x)))
+		if isinstance(x, (_Uncertainty_Prototype, UncertaintyArray)):
+			vals.append(np.asarray(x.val, dtype=float))
+			variances.append(np.square(np.asarray(x.unc, dtype=float)))
 		else:
-			#print("d")
-			val = math.log(A,B)
-			unc = val*(a/(A*math.log(A)) + b/(B*math.log(B)))
-	if unc == 0:
-		return val
+			vals.append(np.asarray(x, dtype=float))
+			variances.append(np.zeros(np.shape(x)))
+	vals = np.stack(np.broadcast_arrays(*vals), axis=-1) # (*batch, n)
+	batch = vals.shape[:-1]
+	if cov is None:
+		cov = np.zeros(batch + (n, n))
+		for i in range(n):
+			cov[..., i, i] = variances[i]
+			for j in range(i):
+				if isinstance(inputs[i], CorrelatedUncertainty) and isinstance(inputs[j], CorrelatedUncertainty):
+					cov[..., i, j] = cov[..., j, i] = inputs[i].covariance(inputs[j])
+	else:
+		cov = np.asarray(cov, dtype=float)
+		if cov.shape[-2:] != (n, n):
+			raise ValueError("cov must have shape (..., {0}, {0}), not {1}".format(n, cov.shape))
+
+	# Evaluate f at the values and every perturbation at once
+	if step is None:
+		step = 1e-20 if method == 'complex' else np.finfo(float).eps**(1/3)
+	h = np.where(vals != 0, step * np.abs(vals), step) # (*batch, n)
+	eye = np.eye(n).reshape((n,) + (1,)*len(batch) + (n,))
+	if method == 'complex':
+		points = np.concatenate([vals[None], vals + 1j * h * eye]) # (n+1, *batch, n)
+	else:
+		points = np.concatenate([vals[None], vals + h * eye, vals - h * eye]) # (2n+1, *batch, n)
+	out = f(*np.moveaxis(points, -1, 0), *args, **kwargs)
+	if not isinstance(out, (tuple, list)):
+		out = (out,)
+	out = np.stack(np.broadcast_arrays(*[np.broadcast_to(o, points.shape[:-1]) for o in out]), axis=-1) # (k, *batch, m)
+
+	# Jacobian and output covariance
+	if method == 'complex':
+		if not np.iscomplexobj(out):
+			raise ValueError("f did not return complex values, so the complex step can't be used. Use method='central'")
+		val = out[0].real
+		diffs = out[1:].imag
 	else:
-		return CoherentUncertainty(val, unc)
\ No newline at end of file
+		val = out[0]
+		diffs = (out[1:n+1] - out[n+1:]) / 2
+	jacobian = np.moveaxis(diffs, 0, -1) / h[..., None, :] # (*batch, m, n)
+	covOut = np.einsum('...ij,...jk,...lk->...il', jacobian, cov, jacobian)
+	return CovarianceResult(val, covOut, jacobian)
\ No newline at end of file
@@ -0,0 +1,498 @@
+"""pandas extension types for measurements.
+
+Important classes:
+- MeasurementDtype : registered `measurement[coherent]` and
+  `measurement[incoherent]` pandas dtypes
+- MeasurementArray : pandas ExtensionArray backed by an `UncertaintyArray`
+  (one float array of values and one of uncertainties)
+
+Storing measurements this way (instead of `object` columns of measurement
+objects) keeps pandas operations vectorised, and reductions such as `sum()`
+and `mean()` propagate the uncertainty rather than dropping it through
+`__float__`.
+
+The dtypes are registered with pandas when this module is imported, which
+`import pythonutils` alone doesn't do (its submodules are imported on first
+access), so import this module before using the dtype strings.
+
+Examples
+--------
+>>> s = pd.Series(MeasurementArray(unc.IncoherentUncertaintyArray([1,2],[.1,.2])))
+>>> s.dtype
+measurement[incoherent]
+>>> s.sum()
+3.0 +- 0.223606797749979
+
+"""
+
+
+
+################################### MODULES ###################################
+from pythonutils import uncertainty as unc
+import numbers
+import operator
+import numpy as np
+import pandas as pd
+from pandas.api.extensions import (ExtensionArray, ExtensionDtype,
+								   register_extension_dtype, take)
+from pandas.api.indexers import check_array_indexer
+
+
+
+################################### CLASSES ###################################
+@register_extension_dtype
+class MeasurementDtype(ExtensionDtype):
+	"""pandas dtype for measurements, `measurement[coherent]` or
+	`measurement[incoherent]`.
+
+	Attributes
+	----------
+	uncertaintyType : str
+		`"Coherent"` or `"Incoherent"`, as used by `FileHandler.load`.
+
+	"""
+
+	_metadata = ('uncertaintyType',)
+	_arrayTypes = {
+		'Coherent': unc.CoherentUncertaintyArray,
+		'Incoherent': unc.IncoherentUncertaintyArray,
+	}
+	na_value = np.nan
+	kind = 'O'
+	_is_numeric = True
+
+	## CONSTRUCTOR ##
+	def __init__(self, uncertaintyType = "Incoherent"):
+		"""Create a measurement dtype.
+
+		Parameters
+		----------
+		uncertaintyType : :obj:`str`, optional
+			`"Coherent"` or `"Incoherent"`. Default `"Incoherent"`.
+
+		"""
+		if uncertaintyType not in self._arrayTypes:
+			raise ValueError("uncertaintyType must be 'Coherent' or 'Incoherent', not '{}'".format(uncertaintyType))
+		self.uncertaintyType = uncertaintyType
+		return
+
+
+	## CLASSMETHODS ##
+	@classmethod
+	def construct_array_type(cls):
+		return MeasurementArray
+
+	@classmethod
+	def construct_from_string(cls, string):
+		"""Construct from `'measurement'`, `'measurement[coherent]'` or
+		`'measurement[incoherent]'`."""
+		if not isinstance(string, str):
+			raise TypeError("'construct_from_string' expects a string, got {}".format(type(string)))
+		if string == 'measurement':
+			return cls()
+		for uncertaintyType in cls._arrayTypes:
+			if string == 'measurement[{}]'.format(uncertaintyType.lower()):
+				return cls(uncertaintyType)
+		raise TypeError("Cannot construct a 'MeasurementDtype' from '{}'".format(string))
+
+	@classmethod
+	def fromScalarType(cls, scalarType):
+		"""Return the dtype whose scalar type is `scalarType`.
+
+		Parameters
+		----------
+		scalarType : type
+			`CoherentUncertainty` or `IncoherentUncertainty`
+
+		Returns
+		-------
+		MeasurementDtype
+
+		"""
+		for uncertaintyType, arrayType in cls._arrayTypes.items():
+			if scalarType == arrayType._scalarType:
+				return cls(uncertaintyType)
+		raise TypeError("no measurement dtype exists for '{}'".format(scalarType))
+
+
+	## PROPERTIES ##
+	@property
+	def arrayType(self):
+		"""type: The `UncertaintyArray` subclass used for storage."""
+		return self._arrayTypes[self.uncertaintyType]
+
+	@property
+	def name(self):
+		return 'measurement[{}]'.format(self.uncertaintyType.lower())
+
+	@property
+	def type(self):
+		return self.arrayType._scalarType
+
+
+class MeasurementArray(ExtensionArray):
+	"""pandas ExtensionArray of measurements.
+
+	Storage is a 1-dimensional `UncertaintyArray`, so operations between
+	columns run as NumPy operations over whole arrays. Missing values are
+	measurements whose value is `nan`.
+
+	Supports `+ - * / **` (with other arrays, scalar measurements and
+	numbers), `take`, `concat`, `isna`, and the `sum`, `mean`, `min` and
+	`max` reductions (including in `groupby`), which propagate uncertainty.
+
+	"""
+
+	__array_priority__ = 1000
+
+	## CONSTRUCTOR ##
+	def __init__(self, data, copy = False):
+		"""Wrap a 1-dimensional `UncertaintyArray`.
+
+		Parameters
+		----------
+		data : UncertaintyArray
+		copy : :obj:`bool`, optional
+			Copy `data` first. Default `False`.
+
+		"""
+		if not isinstance(data, unc.UncertaintyArray) or type(data) == unc.UncertaintyArray:
+			raise TypeError("data must be a CoherentUncertaintyArray or IncoherentUncertaintyArray, not '{}'".format(type(data)))
+		if data.ndim != 1:
+			raise ValueError("data must be 1-dimensional")
+		self._data = data.copy() if copy else data
+		self._dtype = MeasurementDtype.fromScalarType(data._scalarType)
+		return
+
+
+	## CLASSMETHODS ##
+	@classmethod
+	def _from_sequence(cls, scalars, *, dtype = None, copy = False):
+		if isinstance(scalars, cls):
+			result = scalars
+			if dtype is not None and pd.api.types.pandas_dtype(dtype) != result.dtype:
+				raise TypeError("cannot convert '{0}' to '{1}'".format(result.dtype, dtype))
+			return result.copy() if copy else result
+		if isinstance(scalars, unc.UncertaintyArray):
+			return cls(scalars, copy=copy)
+
+		if dtype is not None:
+			dtype = pd.api.types.pandas_dtype(dtype)
+		scalars = list(scalars)
+		if dtype is None:
+			for s in scalars:
+				if isinstance(s, unc._Uncertainty_Prototype):
+					dtype = MeasurementDtype.fromScalarType(type(s))
+					break
+			else:
+				dtype = MeasurementDtype()
+		arrayType = dtype.arrayType
+		scalarType = arrayType._scalarType
+
+		val = np.empty(len(scalars))
+		uncs = np.empty(len(scalars))
+		for i, s in enumerate(scalars):
+			if isinstance(s, scalarType):
+				val[i], uncs[i] = s.val, s.unc
+			elif pd.api.types.is_scalar(s) and pd.isna(s):
+				val[i], uncs[i] = np.nan, np.nan
+			elif isinstance(s, numbers.Real):
+				val[i], uncs[i] = s, 0
+			else:
+				raise TypeError("cannot interpret '{0}' as '{1}'".format(type(s), dtype))
+		return cls(arrayType._fromArrays(val, uncs))
+
+	@classmethod
+	def _from_factorized(cls, values, original):
+		data = original.dtype.arrayType._fromArrays(values.real.copy(), values.imag.copy())
+		return cls(data)
+
+	@classmethod
+	def _concat_same_type(cls, to_concat):
+		to_concat = list(to_concat)
+		dtype = to_concat[0].dtype
+		for arr in to_concat:
+			if arr.dtype != dtype:
+				raise TypeError("cannot concatenate '{0}' and '{1}'".format(dtype, arr.dtype))
+		val = np.concatenate([arr._data.val for arr in to_concat])
+		uncs = np.concatenate([arr._data.unc for arr in to_concat])
+		return cls(dtype.arrayType._fromArrays(val, uncs))
+
+
+	## PROPERTIES ##
+	@property
+	def dtype(self):
+		return self._dtype
+
+	@property
+	def nbytes(self):
+		return self._data.val.nbytes + self._data.unc.nbytes
+
+	@property
+	def unc(self):
+		""":obj:`np.ndarray`: Uncertainties of the measurements."""
+		return self._data.unc
+
+	@property
+	def val(self):
+		""":obj:`np.ndarray`: Values of the measurements."""
+		return self._data.val
+
+
+	## CONTAINER METHODS ##
+	def __getitem__(self, item):
+		if isinstance(item, numbers.Integral):
+			if np.isnan(self._data.val[item]):
+				return self.dtype.na_value
+			return self._data[item]
+		item = check_array_indexer(self, item)
+		return type(self)(self._data._fromArrays(self._data.val[item], self._data.unc[item]))
+
+	def __setitem__(self, key, value):
+		if isinstance(key, tuple) or not isinstance(key, (numbers.Integral, slice)):
+			key = check_array_indexer(self, key)
+		if isinstance(value, MeasurementArray):
+			value = value._data
+		elif pd.api.types.is_scalar(value) and pd.isna(value):
+			self._data.val[key] = np.nan
+			self._data.unc[key] = np.nan
+			return
+		elif pd.api.types.is_list_like(value) and not isinstance(value, unc.UncertaintyArray):
+			value = type(self)._from_sequence(value, dtype=self.dtype)._data
+		self._data[key] = value
+		return
+
+	def __len__(self): return len(self._data)
+
+	def __array__(self, dtype = None, copy = None):
+		if dtype is not None and np.dtype(dtype).kind in 'fiu':
+			return np.array(self._data.val, dtype=dtype)
+		result = np.empty(len(self), dtype=object)
+		result[:] = [self[i] for i in range(len(self))]
+		return result
+
+	def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+		"""Apply NumPy's elementwise functions (e.g. `np.log`) through the
+		underlying `UncertaintyArray`."""
+		if any(isinstance(x, (pd.Series, pd.Index, pd.DataFrame)) for x in inputs):
+			return NotImplemented # pandas unboxes these, then calls again
+		inputs = tuple(x._data if isinstance(x, MeasurementArray) else x for x in inputs)
+		result = getattr(ufunc, method)(*inputs, **kwargs)
+		if isinstance(result, unc.UncertaintyArray):
+			return type(self)(result)
+		return result
+
+
+	## OPERATIONS ##
+	def _arith(self, other, op):
+		"""Apply `op` through the underlying `UncertaintyArray`."""
+		if isinstance(other, (pd.Series, pd.Index, pd.DataFrame)):
+			return NotImplemented
+		if isinstance(other, MeasurementArray):
+			other = other._data
+		elif isinstance(other, list):
+			other = np.asarray(other)
+		try:
+			result = op(self._data, other)
+		except TypeError:
+			return NotImplemented
+		if isinstance(result, unc.UncertaintyArray):
+			return type(self)(result)
+		return result
+
+	def __add__(self, other): return self._arith(other, operator.add)
+	def __radd__(self, other): return self._arith(other, lambda x, y: y + x)
+	def __sub__(self, other): return self._arith(other, operator.sub)
+	def __rsub__(self, other): return self._arith(other, lambda x, y: y - x)
+	def __mul__(self, other): return self._arith(other, operator.mul)
+	def __rmul__(self, other): return self._arith(other, lambda x, y: y * x)
+	def __truediv__(self, other): return self._arith(other, operator.truediv)
+	def __rtruediv__(self, other): return self._arith(other, lambda x, y: y / x)
+	def __pow__(self, other): return self._arith(other, operator.pow)
+	def __rpow__(self, other): return self._arith(other, lambda x, y: y ** x)
+
+	def __eq__(self, other):
+		if isinstance(other, (pd.Series, pd.Index, pd.DataFrame)):
+			return NotImplemented
+		if isinstance(other, MeasurementArray):
+			other = other._data
+		result = self._data == other
+		if result is NotImplemented:
+			return np.zeros(len(self), dtype=bool)
+		return result
+
+	def __ne__(self, other):
+		result = self == other
+		if result is NotImplemented: return result
+		return ~result
+
+	def __abs__(self): return type(self)(abs(self._data))
+
+	def __neg__(self): return type(self)(-self._data)
+
+	def __pos__(self): return self
+
+
+	## EXTENSIONARRAY INTERFACE ##
+	def _formatter(self, boxed = False):
+		return str
+
+	def _values_for_argsort(self):
+		return self._data.val
+
+	def _values_for_factorize(self):
+		return (self._data.val + 1j*self._data.unc, np.nan + 0j)
+
+	def copy(self):
+		return type(self)(self._data.copy())
+
+	def isna(self):
+		return np.isnan(self._data.val)
+
+	def take(self, indices, allow_fill = False, fill_value = None):
+		if allow_fill and fill_value is not None and not pd.isna(fill_value):
+			fill = type(self)._from_sequence([fill_value], dtype=self.dtype)
+			fillVal, fillUnc = fill._data.val[0], fill._data.unc[0]
+		else:
+			fillVal, fillUnc = np.nan, np.nan
+		val = take(self._data.val, indices, allow_fill=allow_fill, fill_value=fillVal)
+		uncs = take(self._data.unc, indices, allow_fill=allow_fill, fill_value=fillUnc)
+		return type(self)(self._data._fromArrays(val, uncs))
+
+
+	## REDUCTIONS ##
+	def _reduce(self, name, *, skipna = True, keepdims = False, **kwargs):
+		mask = self.isna()
+		if name in ('min', 'max'):
+			if mask.all() or (mask.any() and not skipna):
+				result = self.dtype.na_value
+			else:
+				val = np.where(mask, np.nan, self._data.val)
+				i = np.nanargmin(val) if name == 'min' else np.nanargmax(val)
+				result = self[int(i)]
+		elif name in ('sum', 'mean', 'sem'):
+			data = self._data[~mask]
+			if mask.any() and not skipna:
+				result = self.dtype.na_value
+			elif name == 'sum':
+				result = data.sum()
+			elif len(data) < (1 if name == 'mean' else 2):
+				return self.dtype.na_value
+			else:
+				result = data.mean() if name == 'mean' else data.standardError()
+		elif name in ('std', 'var'):
+			# The scatter of the values (as `sem`), a plain float
+			ddof = kwargs.get('ddof', 1)
+			val = self._data.val[~mask]
+			if (mask.any() and not skipna) or len(val) <= ddof:
+				result = np.nan
+			else:
+				result = float(np.std(val, ddof=ddof) if name == 'std' else np.var(val, ddof=ddof))
+			if keepdims:
+				return np.array([result])
+		else:
+			raise TypeError("'{0}' does not support reduction '{1}'".format(self.dtype, name))
+		if keepdims:
+			return type(self)._from_sequence([result], dtype=self.dtype)
+		return result
+
+	def _groupby_op(self, *, how, has_dropped_na, min_count, ngroups, ids, **kwargs):
+		"""Vectorised `groupby` `sum` and `mean`, propagating uncertainty, and
+		`std`/`var` of the values (as `_reduce`).
+
+		Other aggregations fall back to pandas' generic implementation.
+
+		"""
+		if how in ('std', 'var'):
+			return self._groupbyScatter(how, ngroups, ids, kwargs.get('ddof', 1))
+		if how not in ('sum', 'mean'):
+			return super()._groupby_op(how=how, has_dropped_na=has_dropped_na, min_count=min_count, ngroups=ngroups, ids=ids, **kwargs)
+		ids = np.asarray(ids)
+		keep = (ids >= 0) & ~self.isna()
+		groups = ids[keep]
+		val = self._data.val[keep]
+		uncs = self._data.unc[keep]
+		counts = np.bincount(groups, minlength=ngroups)
+		total = np.bincount(groups, weights=val, minlength=ngroups)
+		if self.dtype.uncertaintyType == 'Coherent':
+			totalUnc = np.bincount(groups, weights=uncs, minlength=ngroups)
+		else:
+			totalUnc = np.sqrt(np.bincount(groups, weights=uncs**2, minlength=ngroups))
+		if how == 'mean':
+			with np.errstate(invalid='ignore', divide='ignore'):
+				total, totalUnc = total/counts, totalUnc/counts
+		missing = counts < max(min_count, 1) if how == 'mean' else counts < min_count
+		total[missing] = np.nan
+		totalUnc[missing] = np.nan
+		return type(self)(self._data._fromArrays(total, totalUnc))
+
+	def _groupbyScatter(self, how, ngroups, ids, ddof):
+		"""Return the `std` or `var` of the values of each group, as floats."""
+		ids = np.asarray(ids)
+		keep = (ids >= 0) & ~self.isna()
+		groups = ids[keep]
+		val = self._data.val[keep]
+		counts = np.bincount(groups, minlength=ngroups)
+		with np.errstate(invalid='ignore', divide='ignore'):
+			means = np.bincount(groups, weights=val, minlength=ngroups) / counts
+			var = np.bincount(groups, weights=(val - means[groups])**2, minlength=ngroups) / (counts - ddof)
+		var[counts <= ddof] = np.nan
+		return np.sqrt(var) if how == 'std' else var
+
+
+
+################################## FUNCTIONS ##################################
+def formatWithPrefixes(column, prefix = None):
+	"""Format a whole column of measurements with their best prefixes (or
+	`prefix`) at once. See `UncertaintyArray.reprWithPrefix`.
+
+	Parameters
+	----------
+	column : pd.Series
+		`MeasurementDtype` column, or `object` column of measurement objects.
+	prefix : :obj:`str`, optional
+		If specified, use this prefix for every measurement.
+
+	Returns
+	-------
+	pd.Series
+		Strings, with the same index as `column`.
+
+	"""
+	if isinstance(column.dtype, MeasurementDtype):
+		data = column.array._data
+	else:
+		data = unc.UncertaintyArray.fromMeasurements(list(column))
+	return pd.Series(data.reprWithPrefix(prefix), index=column.index, name=column.name, dtype=object)
+
+def toMeasurementColumns(df, columns = None, uncertaintyType = None):
+	"""Convert `object` columns of measurement objects to `MeasurementDtype`.
+
+	Parameters
+	----------
+	df : pd.DataFrame
+		e.g. as returned by `FileHandler.load`.
+	columns : :obj:`list` of :obj:`str`, optional
+		Columns to convert. Default: every `object` column whose first
+		non-missing element is a measurement.
+	uncertaintyType : :obj:`str`, optional
+		Force `"Coherent"` or `"Incoherent"`. Default: inferred per column.
+
+	Returns
+	-------
+	pd.DataFrame
+		A new DataFrame with the converted columns.
+
+	"""
+	df = df.copy()
+	if columns is None:
+		columns = []
+		for name, col in df.items():
+			if col.dtype != object: continue
+			first = col.first_valid_index()
+			if first is not None and isinstance(col[first], (unc.CoherentUncertainty, unc.IncoherentUncertainty)):
+				columns.append(name)
+	for name in columns:
+		dtype = MeasurementDtype(uncertaintyType) if uncertaintyType else None
+		df[name] = pd.Series(MeasurementArray._from_sequence(df[name], dtype=dtype), index=df.index)
+	return df
@@ -0,0 +1,58 @@
+"""Tests for `benchmarks/benchmarkUncertainty.py`."""
+
+
+
+################################### MODULES ###################################
+import importlib.util
+import json
+import os
+import pytest
+
+
+
+################################## FUNCTIONS ##################################
+@pytest.fixture(scope='module')
+def benchmarks():
+	"""The benchmark script, imported as a module."""
+	path = os.path.join(os.path.dirname(__file__), '..', 'benchmarks', 'benchmarkUncertainty.py')
+	spec = importlib.util.spec_from_file_location('benchmarkUncertainty', path)
+	module = importlib.util.module_from_spec(spec)
+	spec.loader.exec_module(module)
+	return module
+
+
+
+#################################### TESTS ####################################
+def test_compareResultsReportsRegressions(benchmarks):
+	old = {'operations': {'Coherent': {'add': 1.0, 'mul': 1.0}}, 'fileHandler': [{'rows': 10, 'loadSeconds': 2.0, 'saveSeconds': 2.0}]}
+	new = {'operations': {'Coherent': {'add': 1.05, 'mul': 1.5}}, 'fileHandler': [{'rows': 10, 'loadSeconds': 1.0, 'saveSeconds': 3.0}],
+		   'estimateUncertainty': [{'inputs': 1, 'testDomainCorners': False, 'seconds': 1.0}]}
+	regressions = benchmarks.compareResults(old, new)
+	assert [line.split(':')[0] for line in regressions] == ['operations.Coherent.mul', 'fileHandler.save.10']
+	assert benchmarks.compareResults(old, new, threshold=2.0) == []
+	return
+
+def test_importTimeBenchmark(benchmarks):
+	results = benchmarks.benchmarkImportTime(('pythonutils', 'pythonutils.io'), repeat=1)
+	assert set(results) == {'pythonutils', 'pythonutils.io'}
+	assert all(seconds > 0 for seconds in results.values())
+	return
+
+def test_mainWritesAndComparesResults(benchmarks, tmp_path):
+	output = str(tmp_path / 'results.json')
+	argv = ['--only', 'fileHandler', 'estimateUncertainty', '--rows', '20', '--inputs', '1', '--repeat', '1',
+			'--tmpdir', str(tmp_path), '--output', output]
+	assert benchmarks.main(argv) == 0
+	with open(output) as f:
+		results = json.load(f)
+	assert set(results) == {'environment', 'fileHandler', 'estimateUncertainty'}
+	assert [r['rows'] for r in results['fileHandler']] == [20]
+	for r in results['fileHandler']:
+		assert r['loadSeconds'] > 0 and r['saveSeconds'] > 0
+	faster = json.loads(json.dumps(results)) # a run 100 times faster at loading
+	for r in faster['fileHandler']:
+		r['loadSeconds'] /= 100
+	with open(str(tmp_path / 'old.json'), 'w') as f:
+		json.dump(faster, f)
+	assert benchmarks.main(argv[:-1] + [str(tmp_path / 'new.json'), '--compare', str(tmp_path / 'old.json')]) == 1
+	return
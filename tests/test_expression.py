@@ -0,0 +1,60 @@
+"""Tests for `Expression` and `CompiledExpression`."""
+
+
+
+################################### MODULES ###################################
+import numpy as np
+import pytest
+from pythonutils import uncertainty as unc
+
+
+
+################################## FUNCTIONS ##################################
+@pytest.fixture
+def data():
+	return {'x': unc.IncoherentUncertaintyArray([1.0, 2.0, 3.0], [0.1, 0.2, 0.3]),
+			'y': unc.IncoherentUncertaintyArray([4.0, 5.0, 6.0], [0.4, 0.5, 0.6])}
+
+
+
+#################################### TESTS ####################################
+@pytest.mark.parametrize('uncertaintyType', ['Coherent', 'Incoherent'])
+def test_compiledMatchesArrayOperators(data, uncertaintyType):
+	x, y = unc.placeholders('x', 'y')
+	result = ((x*y + 2) / y - x**2).evaluate(data, uncertaintyType)
+	arrayType = {'Coherent': unc.CoherentUncertaintyArray, 'Incoherent': unc.IncoherentUncertaintyArray}[uncertaintyType]
+	a = arrayType._fromArrays(data['x'].val, data['x'].unc)
+	b = arrayType._fromArrays(data['y'].val, data['y'].unc)
+	expected = (a*b + 2) / b - a**2
+	assert type(result) == arrayType
+	np.testing.assert_allclose(result.val, expected.val)
+	np.testing.assert_allclose(result.unc, expected.unc)
+	return
+
+def test_correlatedCancelsRepeatedVariable(data):
+	x, y = unc.placeholders('x', 'y')
+	result = (x - x + y).evaluate(data, 'Correlated')
+	np.testing.assert_allclose(result.val, data['y'].val)
+	np.testing.assert_allclose(result.unc, data['y'].unc)
+	return
+
+def test_missingVariableRaises(data):
+	x, z = unc.placeholders('x', 'z')
+	with pytest.raises(KeyError):
+		(x + z).evaluate(data, 'Incoherent')
+	return
+
+def test_multipleOutputs(data):
+	x, y = unc.placeholders('x', 'y')
+	compiled = unc.CompiledExpression({'sum': x + y, 'diff': x - y}, 'Incoherent')
+	results = compiled(data)
+	np.testing.assert_allclose(results['sum'].val, [5.0, 7.0, 9.0])
+	np.testing.assert_allclose(results['diff'].val, [-3.0, -3.0, -3.0])
+	np.testing.assert_allclose(results['diff'].unc, np.hypot(data['x'].unc, data['y'].unc))
+	return
+
+def test_sharedSubexpressionsCompiledOnce():
+	x, y = unc.placeholders('x', 'y')
+	compiled = ((x*y) + (x*y)).compile('Incoherent')
+	assert [op for (op, _) in compiled.instructions].count('mul') == 1
+	return
@@ -0,0 +1,203 @@
+"""Tests for loading and saving measurement tables with `FileHandler`."""
+
+
+
+################################### MODULES ###################################
+import json
+import numpy as np
+import pytest
+from pythonutils import uncertainty as unc
+
+
+
+################################## FUNCTIONS ##################################
+def _assertSameMeasurements(a, b):
+	assert list(a.columns) == list(b.columns)
+	assert list(a['id']) == list(b['id']) and list(a['grp']) == list(b['grp'])
+	for variable in ('x', 'y'):
+		np.testing.assert_allclose([x.val for x in a[variable]], [x.val for x in b[variable]])
+		np.testing.assert_allclose([x.unc for x in a[variable]], [x.unc for x in b[variable]])
+	return
+
+@pytest.fixture
+def csvPath(tmp_path):
+	path = tmp_path / 'data.csv'
+	path.write_text('hdr,a\nid,grp,x,m,y,1\n1,A,1.0,0.1,2,0.2\n2,A,2.0,0.1,3,0.2\n3,B,3.0,0.2,4,0.1\n')
+	return str(path)
+
+@pytest.fixture
+def runDirectory(tmp_path):
+	for run in range(3):
+		directory = tmp_path / 'run{}'.format(run)
+		directory.mkdir()
+		rows = ''.join('{0},{1},0.1,{2},0.2\n'.format(i, run + i, 10*run) for i in range(run + 1))
+		(directory / 'data.csv').write_text('id,x,1,y,1\n' + rows)
+	return tmp_path
+
+
+
+#################################### TESTS ####################################
+@pytest.mark.parametrize('uncertaintyType', ['Coherent', 'Incoherent'])
+def test_binaryRoundTrip(csvPath, tmp_path, uncertaintyType):
+	df, extra_info = unc.FileHandler.load(csvPath, 2, 1, uncertaintyType)
+	binaryPath = str(tmp_path / 'data.npy')
+	unc.FileHandler.saveBinary(binaryPath, df, extra_info)
+	extra_cols, measurements, binaryInfo = unc.FileHandler.loadBinary(binaryPath)
+	assert binaryInfo == extra_info
+	assert list(extra_cols['grp']) == list(df['grp'])
+	assert list(measurements) == ['x', 'y']
+	for variable, arr in measurements.items():
+		assert arr._scalarType == type(df[variable][0])
+		assert isinstance(arr.val.base, np.memmap) or isinstance(arr.val, np.memmap)
+		np.testing.assert_array_equal(arr.val, [x.val for x in df[variable]])
+		np.testing.assert_array_equal(arr.unc, [x.unc for x in df[variable]])
+	return
+
+@pytest.mark.parametrize('chunkSize', [1, 2, 100])
+def test_csvToBinaryToCsv(csvPath, tmp_path, chunkSize):
+	df, extra_info = unc.FileHandler.load(csvPath, 2, 1)
+	unc.FileHandler.save(str(tmp_path / 'expected.csv'), df, extra_info)
+	binaryPath = str(tmp_path / 'data.npy')
+	unc.FileHandler.csvToBinary(csvPath, binaryPath, 2, 1, chunkSize=chunkSize)
+	_, measurements, _ = unc.FileHandler.loadBinary(binaryPath, extraColumns=False)
+	np.testing.assert_array_equal(measurements['x'].val, [0.001, 0.002, 0.003])
+	unc.FileHandler.binaryToCsv(binaryPath, str(tmp_path / 'out.csv'), chunkSize=chunkSize)
+	assert (tmp_path / 'out.csv').read_text() == (tmp_path / 'expected.csv').read_text()
+	return
+
+def test_loadAppliesScales(tmp_path):
+	path = tmp_path / 'scales.csv'
+	path.write_text('id,x,k,y,2\n1,2,0.1,inf,3\n')
+	df, extra_info = unc.FileHandler.load(str(path), 1, 0)
+	assert extra_info['col_scales'] == {'x': 'k', 'y': 2.0}
+	assert (df['x'][0].val, df['x'][0].unc) == pytest.approx((2000.0, 100.0))
+	assert df['y'][0].val == np.inf
+	assert df['y'][0].unc == 6.0
+	return
+
+def test_loadBinaryChecksVersion(csvPath, tmp_path):
+	binaryPath = str(tmp_path / 'data.npy')
+	unc.FileHandler.csvToBinary(csvPath, binaryPath, 2, 1)
+	sidecar = tmp_path / 'data.json'
+	meta = json.loads(sidecar.read_text())
+	meta['version'] = unc.FileHandler.BINARY_FORMAT_VERSION + 1
+	sidecar.write_text(json.dumps(meta))
+	with pytest.raises(ValueError):
+		unc.FileHandler.loadBinary(binaryPath)
+	return
+
+@pytest.mark.parametrize('chunkSize', [1, 2, 3, 100])
+def test_loadChunksMatchesLoad(csvPath, chunkSize):
+	df, extra_info = unc.FileHandler.load(csvPath, 2, 1)
+	chunks = []
+	with unc.FileHandler.loadChunks(csvPath, chunkSize, 2, 1) as reader:
+		assert reader.extra_info == extra_info
+		for extra_cols, measurements in reader:
+			assert set(measurements) == {'x', 'y'}
+			chunks.append((extra_cols, measurements))
+	assert len(chunks) == -(-3 // chunkSize)
+	for variable in ('x', 'y'):
+		val = np.concatenate([m[variable].val for (_, m) in chunks])
+		unc_ = np.concatenate([m[variable].unc for (_, m) in chunks])
+		np.testing.assert_allclose(val, [x.val for x in df[variable]])
+		np.testing.assert_allclose(unc_, [x.unc for x in df[variable]])
+	assert [list(e['grp']) for (e, _) in chunks][0] == list(df['grp'])[:len(chunks[0][0])]
+	return
+
+@pytest.mark.parametrize('chunkSize', [0, -1])
+def test_loadChunksRejectsBadChunkSize(csvPath, chunkSize):
+	with pytest.raises(ValueError):
+		unc.FileHandler.loadChunks(csvPath, chunkSize, 2, 1)
+	return
+
+def test_loadChunksWholeFile(csvPath):
+	with unc.FileHandler.loadChunks(csvPath, None, 2, 1) as reader:
+		chunks = list(reader)
+	assert len(chunks) == 1
+	assert list(chunks[0][0]['id']) == [1, 2, 3]
+	np.testing.assert_array_equal(chunks[0][1]['y'].val, [2.0, 3.0, 4.0])
+	return
+
+@pytest.mark.parametrize('processes', [1, 2])
+def test_loadManyConcatenatesFiles(runDirectory, processes):
+	df, extra_info = unc.FileHandler.loadMany(str(runDirectory), 1, 0, processes=processes)
+	assert list(df.columns) == ['source_file', 'id', 'x', 'y']
+	assert len(df) == 1 + 2 + 3
+	assert [p.split('run')[-1][0] for p in df['source_file']] == ['0', '1', '1', '2', '2', '2']
+	assert [x.val for x in df['x']] == [0, 1, 2, 2, 3, 4]
+	assert extra_info['columnOffset'] == 2
+	single = [unc.FileHandler.load(str(runDirectory / 'run{}'.format(run) / 'data.csv'), 1, 0)[0] for run in range(3)]
+	np.testing.assert_array_equal([x.unc for x in df['y']], [x.unc for s in single for x in s['y']])
+	return
+
+def test_loadManyGlobMatchesDirectory(runDirectory):
+	byDirectory, _ = unc.FileHandler.loadMany(str(runDirectory), 1, 0, processes=1)
+	byGlob, _ = unc.FileHandler.loadMany(str(runDirectory / '*' / 'data.csv'), 1, 0, processes=1, sourceColumn='file')
+	assert list(byGlob['file']) == list(byDirectory['source_file'])
+	return
+
+def test_loadManyRejectsMismatchedHeaders(runDirectory):
+	(runDirectory / 'run1' / 'data.csv').write_text('id,x,1,z,1\n0,1,0.1,2,0.2\n')
+	with pytest.raises(ValueError):
+		unc.FileHandler.loadMany(str(runDirectory), 1, 0, processes=1)
+	return
+
+def test_loadManyWithoutFiles(tmp_path):
+	with pytest.raises(FileNotFoundError):
+		unc.FileHandler.loadMany(str(tmp_path / '*.csv'), 1, 0)
+	return
+
+@pytest.mark.parametrize('line, message', [
+	('2,abc,0.1', "'abc' Cannot be interpreted as a float"),
+	('2,nan,0.1', "'nan' Cannot be interpreted as a float"),
+	('2,1,', "Cannot be interpreted as a float"),
+	('2,1,-0.1', 'uncertainty must be positive'),
+])
+def test_loadRejectsInvalidValues(tmp_path, line, message):
+	path = tmp_path / 'bad.csv'
+	path.write_text('id,x,1\n1,2,0.1\n' + line + '\n')
+	with pytest.raises(ValueError, match=message) as info:
+		unc.FileHandler.load(str(path), 1, 0)
+	assert 'line 3' in str(info.value)
+	return
+
+def test_missingFileReportedOnce(tmp_path, capsys):
+	with pytest.raises(FileNotFoundError):
+		unc.FileHandler.load(str(tmp_path / 'missing.csv'), 1, 0)
+	assert capsys.readouterr().out.count('does not exist') == 1
+	return
+
+def test_saveChunksMatchesSave(csvPath, tmp_path):
+	df, extra_info = unc.FileHandler.load(csvPath, 2, 1)
+	unc.FileHandler.save(str(tmp_path / 'whole.csv'), df, extra_info)
+	with unc.FileHandler.loadChunks(csvPath, 2, 2, 1) as reader, \
+			unc.FileHandler.saveChunks(str(tmp_path / 'chunked.csv'), reader.extra_info) as writer:
+		for extra_cols, measurements in reader:
+			writer.write(extra_cols, measurements)
+	assert (tmp_path / 'chunked.csv').read_text() == (tmp_path / 'whole.csv').read_text()
+	return
+
+@pytest.mark.parametrize('extensionDtype', [False, True])
+def test_saveRoundTrip(csvPath, tmp_path, extensionDtype):
+	df, extra_info = unc.FileHandler.load(csvPath, 2, 1, extensionDtype=extensionDtype)
+	outPath = str(tmp_path / 'out.csv')
+	unc.FileHandler.save(outPath, df, extra_info)
+	lines = open(outPath).read().splitlines()
+	assert lines[0] == 'hdr,a'
+	assert lines[1].startswith('id,grp,x,m,y,')
+	assert lines[2] == '1,A,1.0,0.1,2.0,0.2'
+	again, againInfo = unc.FileHandler.load(outPath, 2, 1)
+	assert againInfo['header_lines'] == extra_info['header_lines']
+	assert againInfo['col_scales']['x'] == 'm'
+	_assertSameMeasurements(unc.FileHandler.load(csvPath, 2, 1)[0], again)
+	return
+
+def test_saveUsesEditedPrefix(csvPath, tmp_path):
+	df, extra_info = unc.FileHandler.load(csvPath, 2, 1)
+	extra_info['col_scales']['x'] = 'u'
+	outPath = str(tmp_path / 'out.csv')
+	unc.FileHandler.save(outPath, df, extra_info)
+	row = open(outPath).read().splitlines()[2].split(',')
+	assert [float(x) for x in row[2:4]] == pytest.approx([1000.0, 100.0])
+	_assertSameMeasurements(df, unc.FileHandler.load(outPath, 2, 1)[0])
+	return
@@ -0,0 +1,221 @@
+"""Tests for the searches and interval arithmetic of `GeneralUncertainty`."""
+
+
+
+################################### MODULES ###################################
+import itertools
+import math
+import numpy as np
+import operator
+import pytest
+from pythonutils import uncertainty as unc
+
+
+
+################################## FUNCTIONS ##################################
+def _cornerBounds(op, a, b):
+	"""The bounds of `op` from the corners of the intervals, for operations
+	that are monotonic in each argument over them."""
+	corners = [op(x, y) for x, y in itertools.product(a.bounds(), b.bounds())]
+	return min(corners), max(corners)
+
+def _countingSquare(calls):
+	def f(x):
+		calls.append(x)
+		return x**2
+	return f
+
+def _dampedSine(x):
+	return np.sin(x) * np.exp(-x)
+
+def _interval(lower, upper):
+	"""A `GeneralUncertainty` spanning `[lower, upper]`."""
+	val = (lower + upper) / 2
+	return unc.GeneralUncertainty(val, (val - lower, upper - val))
+
+def _paraboloid(x, y):
+	return 1.0 - (x - 0.25)**2 - (y + 0.5)**2
+
+def _saddle(x, y):
+	return x * y + 0.1 * x
+
+@pytest.fixture
+def cache(monkeypatch):
+	cache = unc.EstimateCache(maxSize=2)
+	monkeypatch.setattr(unc.GeneralUncertainty, 'estimateCache', cache)
+	return cache
+
+
+
+#################################### TESTS ####################################
+def test_estimateCacheEvictsLeastRecentlyUsed(cache):
+	f = lambda x: x**2
+	estimate = lambda val: unc.GeneralUncertainty.estimateUncertainty(f, [unc.GeneralUncertainty(val, (0.1, 0.1))], 3)
+	estimate(1.0)
+	estimate(2.0)
+	estimate(1.0) # 1.0 is now the most recently used
+	estimate(3.0) # evicts 2.0
+	assert (cache.hits, cache.misses, cache.evictions, len(cache)) == (1, 3, 1, 2)
+	estimate(1.0)
+	estimate(2.0)
+	assert cache.info() == {'hits': 2, 'misses': 4, 'evictions': 2, 'size': 2, 'maxSize': 2}
+	cache.maxSize = 1
+	assert len(cache) == 1
+	cache.clear()
+	assert cache.info()['size'] == cache.info()['hits'] == 0
+	with pytest.raises(ValueError):
+		cache.maxSize = 0
+	return
+
+def test_estimateCacheHitSkipsEvaluation(cache):
+	calls = []
+	f = _countingSquare(calls)
+	x = unc.GeneralUncertainty(2.0, (0.1, 0.2))
+	uncached = unc.GeneralUncertainty.estimateUncertainty(f, [x], 3)
+	nCalls = len(calls)
+	cached = unc.GeneralUncertainty.estimateUncertainty(f, [unc.GeneralUncertainty(2.0 + 1e-15, (0.1, 0.2))], 3)
+	assert len(calls) == nCalls
+	assert (cache.hits, cache.misses) == (1, 1)
+	assert (cached.val, cached.unc) == (uncached.val, uncached.unc)
+	unc.GeneralUncertainty.estimateUncertainty(f, [x], 4)
+	assert cache.misses == 2
+	return
+
+def test_estimateCacheMatchesUncached(cache, monkeypatch):
+	f = lambda x, y: x * np.sin(y)
+	inputs = [unc.GeneralUncertainty(2.0, (0.1, 0.2)), unc.GeneralUncertainty(1.0, (0.3, 0.1))]
+	cached = unc.GeneralUncertainty.estimateUncertainty(f, inputs, 3)
+	monkeypatch.setattr(unc.GeneralUncertainty, 'estimateCache', None)
+	uncached = unc.GeneralUncertainty.estimateUncertainty(f, inputs, 3)
+	assert (cached.val, cached.unc) == (uncached.val, uncached.unc)
+	return
+
+def test_estimateCacheSkipsUnhashableArguments(cache):
+	f = lambda x, scale: x * scale[0]
+	unc.GeneralUncertainty.estimateUncertainty(f, [unc.GeneralUncertainty(2.0, (0.1, 0.1))], 3, scale=[2.0])
+	assert len(cache) == 0
+	return
+
+@pytest.mark.parametrize('useThreads', [True, False])
+def test_extremiseInParallel(useThreads):
+	domain = ((-1.0, 1.5), (-2.0, 1.0))
+	expected = unc.GeneralUncertainty.extremise(_saddle, (0.0, 0.0), domain, 3)
+	assert unc.GeneralUncertainty.extremise(_saddle, (0.0, 0.0), domain, 3, processes=2, useThreads=useThreads) == expected
+	return
+
+@pytest.mark.parametrize('f', [_paraboloid, _saddle])
+def test_extremiseMatchesMinimiseAndMaximise(f):
+	domain = ((-1.0, 1.5), (-2.0, 1.0))
+	minimum, maximum = unc.GeneralUncertainty.extremise(f, (0.0, 0.0), domain, 3)
+	assert minimum == unc.GeneralUncertainty.minimise(f, (0.0, 0.0), domain, 3)
+	assert maximum == unc.GeneralUncertainty.maximise(f, (0.0, 0.0), domain, 3)
+	return
+
+def test_extremiseSharesEvaluations():
+	points = []
+	def f(x, y):
+		points.append((x, y))
+		return _saddle(x, y)
+	domain = ((-1.0, 1.5), (-2.0, 1.0))
+	unc.GeneralUncertainty.extremise(f, (0.0, 0.0), domain, 3)
+	assert len(points) == len(set(points))
+	together = len(points)
+	unc.GeneralUncertainty.minimise(f, (0.0, 0.0), domain, 3)
+	unc.GeneralUncertainty.maximise(f, (0.0, 0.0), domain, 3)
+	assert together < len(points) - together
+	with pytest.raises(ValueError):
+		unc.GeneralUncertainty.extremise(f, (0.0, 0.0), domain, 3, maxEvaluations=0)
+	return
+
+def test_fullDomainExtremaOfDampedSine():
+	(minVal, minPoint), (maxVal, maxPoint) = unc.GeneralUncertainty.fullDomainExtrema(_dampedSine, ((0.0, 10.0),), 3, vectorized=True)
+	assert maxVal == pytest.approx(math.sin(math.pi/4) * math.exp(-math.pi/4), rel=1e-6)
+	assert minVal == pytest.approx(math.sin(5*math.pi/4) * math.exp(-5*math.pi/4), rel=1e-5)
+	assert np.ravel(maxPoint)[0] == pytest.approx(math.pi/4, abs=1e-2)
+	assert unc.GeneralUncertainty.maximise_fullDomainCheck(_dampedSine, ((0.0, 10.0),), 3, vectorized=True) == maxVal
+	return
+
+def test_fullDomainTilesMatchOneTile():
+	domain = ((0.0, 3.0), (-1.0, 1.0))
+	f = lambda x, y: np.sin(x) * y
+	whole = unc.GeneralUncertainty.fullDomainExtrema(f, domain, 2, vectorized=True)
+	tiled = unc.GeneralUncertainty.fullDomainExtrema(f, domain, 2, vectorized=True, tileSize=7)
+	scalar = unc.GeneralUncertainty.fullDomainExtrema(lambda x, y: math.sin(x) * y, domain, 2, tileSize=50)
+	assert whole[0][0] == tiled[0][0] == pytest.approx(scalar[0][0])
+	assert whole[1][0] == tiled[1][0] == pytest.approx(scalar[1][0])
+	return
+
+def test_intervalDivision():
+	assert (_interval(1.5, 2.5) / _interval(0.5, 2.0)).bounds() == pytest.approx((0.75, 5.0))
+	assert (_interval(1.5, 2.5) / _interval(-2.0, 1.0)).bounds() == (-math.inf, math.inf)
+	return
+
+def test_intervalPower():
+	assert (_interval(-1.0, 2.0)**2).bounds() == pytest.approx((0.0, 4.0))
+	assert (_interval(-2.0, -1.0)**3).bounds() == pytest.approx((-8.0, -1.0))
+	assert (_interval(1.5, 2.5)**_interval(-2.0, 1.0)).bounds() == pytest.approx((0.16, 2.5))
+	assert (2**_interval(-2.0, 1.0)).bounds() == pytest.approx((0.25, 2.0))
+	assert (_interval(-1.0, 2.0)**-1).bounds() == (-math.inf, math.inf)
+	with pytest.raises(ValueError):
+		_interval(-2.0, 1.0)**0.5
+	return
+
+@pytest.mark.parametrize('a, b, expected', [
+	((1.5, 2.5), (-2.0, 1.0), (-5.0, 2.5)),
+	((-3.0, -1.0), (-2.0, 4.0), (-12.0, 6.0)),
+	((0.0, 0.0), (-2.0, 3.0), (0.0, 0.0)),
+])
+def test_intervalProduct(a, b, expected):
+	assert (_interval(*a) * _interval(*b)).bounds() == pytest.approx(expected)
+	assert (_interval(*b) * _interval(*a)).bounds() == pytest.approx(expected)
+	return
+
+def test_intervalProductOfZeroAndInfinity():
+	unbounded = unc.GeneralUncertainty(1.0, (0.0, math.inf))
+	assert (_interval(0.0, 0.0) * unbounded).bounds() == (0.0, 0.0)
+	assert (_interval(-1.0, 2.0) * unbounded).bounds() == (-math.inf, math.inf)
+	return
+
+def test_maximiseFindsMaximum():
+	result = unc.GeneralUncertainty.maximise(_paraboloid, (0.0, 0.0), ((-2.0, 2.0), (-2.0, 2.0)), 4)
+	assert result == pytest.approx(1.0, abs=1e-6)
+	return
+
+def test_maximiseRespectsMaxEvaluations():
+	points = []
+	def f(x, y):
+		points.append((x, y))
+		return _paraboloid(x, y)
+	unc.GeneralUncertainty.maximise(f, (0.0, 0.0), ((-2.0, 2.0), (-2.0, 2.0)), 4, maxEvaluations=10)
+	assert 1 <= len(points) <= 10
+	with pytest.raises(ValueError):
+		unc.GeneralUncertainty.maximise(f, (0.0, 0.0), ((-2.0, 2.0), (-2.0, 2.0)), 4, maxEvaluations=0)
+	return
+
+def test_maximiseVectorizedMatchesScalar():
+	calls = []
+	def f(x, y):
+		calls.append(np.shape(x))
+		return _paraboloid(x, y)
+	domain = ((-2.0, 2.0), (-2.0, 2.0))
+	vectorized = unc.GeneralUncertainty.maximise(f, (1.0, 1.0), domain, 4, vectorized=True)
+	assert vectorized == unc.GeneralUncertainty.maximise(_paraboloid, (1.0, 1.0), domain, 4)
+	assert all(len(shape) == 1 for shape in calls) # one array of points per call
+	return
+
+@pytest.mark.parametrize('op', [operator.add, operator.sub, operator.mul, operator.truediv, operator.pow])
+def test_scalarMatchesArray(op):
+	rng = np.random.default_rng(1)
+	lower = rng.uniform(0.5, 3.0, (2, 50))
+	upper = lower + rng.uniform(0.0, 1.0, (2, 50))
+	if op is not operator.pow:
+		lower[1], upper[1] = lower[1] - 2.0, upper[1] - 2.0 # straddle zero
+	a = unc.GeneralUncertaintyArray((lower[0] + upper[0]) / 2, ((upper[0] - lower[0]) / 2,)*2)
+	b = unc.GeneralUncertaintyArray((lower[1] + upper[1]) / 2, ((upper[1] - lower[1]) / 2,)*2)
+	arrayLower, arrayUpper = op(a, b).bounds()
+	for i, (x, y) in enumerate(zip(a.toMeasurements(), b.toMeasurements())):
+		scalarLower, scalarUpper = op(x, y).bounds()
+		assert (arrayLower[i], arrayUpper[i]) == pytest.approx((scalarLower, scalarUpper), rel=1e-12)
+		if op is not operator.truediv or not scalarLower <= 0 <= scalarUpper:
+			assert (scalarLower, scalarUpper) == pytest.approx(_cornerBounds(op, x, y), rel=1e-12)
+	return
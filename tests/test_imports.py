@@ -0,0 +1,51 @@
+"""Tests for the lazy loading of the `pythonutils` submodules."""
+
+
+
+################################### MODULES ###################################
+import os
+import pytest
+import pythonutils
+import subprocess
+import sys
+
+
+
+################################## FUNCTIONS ##################################
+def _modulesAfter(code):
+	"""Return the names in `sys.modules` after running `code` in a fresh
+	interpreter."""
+	env = dict(os.environ)
+	src = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+	env['PYTHONPATH'] = os.pathsep.join([src] + ([env['PYTHONPATH']] if env.get('PYTHONPATH') else []))
+	out = subprocess.run([sys.executable, '-c', code + '\nimport sys\nprint("\\n".join(sys.modules))'],
+						 env=env, check=True, capture_output=True, text=True)
+	return set(out.stdout.split())
+
+
+
+#################################### TESTS ####################################
+def test_attributeAccessImportsSubmodule():
+	assert pythonutils.intmath is sys.modules['pythonutils.intmath']
+	assert 'intmath' in vars(pythonutils) # cached, so __getattr__ isn't called again
+	assert set(pythonutils.__all__) <= set(dir(pythonutils))
+	with pytest.raises(AttributeError):
+		pythonutils.notASubmodule
+	return
+
+@pytest.mark.parametrize('code, imported, notImported', [
+	('import pythonutils', {'pythonutils'}, {'numpy', 'pandas', 'pythonutils.uncertainty'}),
+	('import pythonutils.io', {'pythonutils.io'}, {'numpy', 'pandas'}),
+	('import pythonutils.uncertainty', {'numpy'}, {'pandas', 'pythonutils.uncertaintyPandas'}),
+	('import pythonutils; pythonutils.uncertaintyPandas', {'pandas', 'pythonutils.uncertainty'}, set()),
+])
+def test_importsAreLazy(code, imported, notImported):
+	modules = _modulesAfter(code)
+	assert imported <= modules
+	assert not notImported & modules
+	return
+
+def test_measurementDtypeRegisteredOnImport():
+	code = 'import pandas as pd\nimport pythonutils.uncertaintyPandas\npd.Series([], dtype="measurement[incoherent]")'
+	assert 'pythonutils.uncertaintyPandas' in _modulesAfter(code)
+	return
@@ -0,0 +1,185 @@
+"""Tests for the scalar measurement classes of `pythonutils.uncertainty`."""
+
+
+
+################################### MODULES ###################################
+import fractions
+import math
+import numpy as np
+import operator
+import pytest
+import warnings
+from pythonutils import uncertainty as unc
+
+
+
+################################## FUNCTIONS ##################################
+def _scanBestPrefix(val):
+	"""The best prefix of `val`, found by trying every prefix in turn."""
+	prefixes = sorted(unc.CoherentUncertainty.validPrefixes(), key=unc.CoherentUncertainty.prefixToScale)
+	differences = [(p, math.floor(math.log10(abs(val / unc.CoherentUncertainty.prefixToScale(p))))) for p in prefixes]
+	if differences[0][1] < -2 or differences[-1][1] > 2:
+		return ''
+	return min(differences, key=lambda x: abs(x[1]))[0]
+
+@pytest.fixture
+def reporter(monkeypatch):
+	"""A fresh reporter for the Coherent classes, which never repeats a
+	warning."""
+	reporter = unc.IncoherenceReporter(interval=1e9)
+	monkeypatch.setattr(unc.CoherentUncertainty, 'incoherenceReporter', reporter)
+	return reporter
+
+
+
+#################################### TESTS ####################################
+def test_bestPrefixMatchesScan():
+	vals = np.concatenate([np.logspace(-16, 16, 321), -np.logspace(-16, 16, 97), [1e-3, 999.9, 1000.0]])
+	expected = [_scanBestPrefix(v) for v in vals]
+	assert [unc.CoherentUncertainty(v, 0).findBestPrefix() for v in vals] == expected
+	assert list(unc.CoherentUncertainty.findBestPrefixes(vals)) == expected
+	assert list(unc.CoherentUncertainty.findBestPrefixes([0.0, np.inf, np.nan])) == ['', '', '']
+	return
+
+@pytest.mark.parametrize('prefix', [None, 'm', 'k'])
+def test_bulkReprWithPrefixMatchesScalar(prefix):
+	arr = unc.IncoherentUncertaintyArray([0.0012, 5.0, 12000.0, -3e-7], [0.0001, 0.5, 100.0, 1e-8])
+	expected = [x.reprWithPrefix(prefix) for x in arr.toMeasurements()]
+	assert list(arr.reprWithPrefix(prefix)) == expected
+	return
+
+def test_coherentIncoherenceWarnsInsteadOfPrinting(reporter, capsys):
+	a, b = unc.CoherentUncertainty(2, 0.1), unc.CoherentUncertainty(-1, 0.5)
+	with pytest.warns(unc.IncoherenceWarning, match=r'x\*y'):
+		a * b
+	with warnings.catch_warnings():
+		warnings.simplefilter('error')
+		for _ in range(10):
+			a * b
+	assert capsys.readouterr().out == ''
+	arr = unc.CoherentUncertaintyArray([2.0, 2.0, 2.0], [0.1, 0.1, 0.1])
+	with warnings.catch_warnings():
+		warnings.simplefilter('error')
+		arr * unc.CoherentUncertaintyArray([-1.0, 1.0, -1.0], [0.5, 0.5, 0.5])
+	assert reporter.counts() == {'x*y': 13}
+	return
+
+def test_constructorValidates():
+	with pytest.raises(ValueError):
+		unc.IncoherentUncertainty(1.0, -0.1)
+	with pytest.raises(TypeError):
+		unc.CoherentUncertainty('1', 0.1)
+	return
+
+def test_correlatedCovariance():
+	x = unc.CorrelatedUncertainty(2.0, 0.1)
+	y = unc.CorrelatedUncertainty(3.0, 0.2)
+	z = x + y
+	assert z.covariance(x) == pytest.approx(0.1**2)
+	assert z.covariance(y) == pytest.approx(0.2**2)
+	assert x.covariance(y) == 0
+	assert (2*x).correlation(x) == pytest.approx(1.0)
+	assert (x*y).derivative(x) == pytest.approx(3.0)
+	return
+
+def test_correlatedMatchesIncoherentForIndependentSources():
+	x, y = unc.CorrelatedUncertainty(2.0, 0.1), unc.CorrelatedUncertainty(3.0, 0.2)
+	a, b = unc.IncoherentUncertainty(2.0, 0.1), unc.IncoherentUncertainty(3.0, 0.2)
+	for (correlated, incoherent) in [(x + y, a + b), (x - y, a - b), (x * y, a * b), (x / y, a / b), (x ** y, a ** b)]:
+		assert correlated.val == pytest.approx(incoherent.val)
+		assert correlated.unc == pytest.approx(incoherent.unc)
+	return
+
+def test_correlatedReusedSource():
+	x = unc.CorrelatedUncertainty(2.0, 0.1)
+	assert (x - x).val == 0
+	assert (x - x).unc == 0
+	assert (x * x / x).unc == pytest.approx(0.1)
+	assert (x + x).unc == pytest.approx(0.2)
+	assert (x * x).unc == pytest.approx(2 * 2.0 * 0.1)
+	assert math.isnan(unc.CorrelatedUncertainty(1.0, 0).correlation(x))
+	return
+
+def test_inPlaceNumberFastPath():
+	x = unc.IncoherentUncertainty(2, 0.1)
+	x += 1
+	x *= 2
+	assert type(x) == unc.IncoherentUncertainty
+	assert (x.val, x.unc) == pytest.approx((6.0, 0.2))
+	with pytest.raises(TypeError):
+		x += 'a'
+	return
+
+@pytest.mark.parametrize('inplace', [operator.iadd, operator.isub, operator.imul, operator.itruediv, operator.ipow])
+@pytest.mark.parametrize('scalarType', [unc.CoherentUncertainty, unc.IncoherentUncertainty, unc.CorrelatedUncertainty])
+def test_inPlaceOperatorsRebind(scalarType, inplace):
+	x = scalarType(2, 0.1)
+	alias = x
+	key = scalarType(2, 0.1) if scalarType is not unc.CorrelatedUncertainty else x
+	table = {x: 'x'}
+	y = inplace(x, scalarType(3, 0.2))
+	assert y is not x
+	assert (alias.val, alias.unc) == (2, 0.1) # the alias still holds the old measurement
+	assert table[key] == 'x' # the hash of `x` is unchanged
+	return
+
+def test_incoherenceReporterAggregates():
+	reporter = unc.IncoherenceReporter(interval=1e9)
+	with pytest.warns(unc.IncoherenceWarning) as record:
+		for _ in range(5):
+			reporter.report('x*y', 'incoherent')
+		reporter.report('x/y', 'also incoherent', count=3)
+	assert [str(w.message) for w in record] == ['incoherent', 'also incoherent (3 occurrences of x/y since the last warning)']
+	assert reporter.counts() == {'x*y': 5, 'x/y': 3}
+	with pytest.warns(unc.IncoherenceWarning, match='4 occurrences of x'):
+		reporter.flush()
+	with warnings.catch_warnings():
+		warnings.simplefilter('error')
+		reporter.flush()
+	reporter.reset()
+	assert reporter.counts() == {}
+	with pytest.warns(unc.IncoherenceWarning):
+		reporter.report('x*y', 'incoherent')
+	return
+
+@pytest.mark.parametrize('scalarType, uncertainty', [
+	(unc.CoherentUncertainty, 0.1), (unc.IncoherentUncertainty, 0.1), (unc.GeneralUncertainty, (0.1, 0.2))])
+def test_measurementsHaveSlots(scalarType, uncertainty):
+	m = scalarType(1.0, uncertainty)
+	assert not hasattr(m, '__dict__')
+	with pytest.raises(AttributeError):
+		m.note = 'x'
+	return
+
+@pytest.mark.parametrize('other', [np.int64(2), np.float32(2.5), fractions.Fraction(1, 2)])
+def test_operationsStoreFloats(other):
+	x = unc.IncoherentUncertainty(1.0, 0.1)
+	for result in (x + other, x - other, x * other, x / other, other + x, other * x):
+		assert type(result.val) is float
+		assert type(result.unc) is float
+	return
+
+def test_reprWithPrefixRejectsInvalidPrefix():
+	with pytest.raises(ValueError):
+		unc.IncoherentUncertaintyArray([1.0], [0.1]).reprWithPrefix('q')
+	return
+
+def test_suppressedIncoherenceIsNotReported(reporter):
+	unc.CoherentUncertainty.suppress_IncoherenceMessages(True)
+	try:
+		with warnings.catch_warnings():
+			warnings.simplefilter('error')
+			unc.CoherentUncertainty(2, 0.1) * unc.CoherentUncertainty(-1, 0.5)
+	finally:
+		unc.CoherentUncertainty.suppress_IncoherenceMessages(False)
+	assert reporter.counts() == {}
+	return
+
+@pytest.mark.parametrize('scalarType, uncertainty', [
+	(unc.CoherentUncertainty, 0.1), (unc.IncoherentUncertainty, 0.1), (unc.GeneralUncertainty, (0.1, 0.2))])
+def test_trustedConstructorMatchesConstructor(scalarType, uncertainty):
+	trusted = scalarType._fromValUnc(2.0, uncertainty)
+	checked = scalarType(2.0, uncertainty)
+	assert type(trusted) is scalarType
+	assert (trusted.val, trusted.unc) == (checked.val, checked.unc)
+	return
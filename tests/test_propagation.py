@@ -0,0 +1,84 @@
+"""Tests for `monteCarlo` and `propagateCovariance`."""
+
+
+
+################################### MODULES ###################################
+import numpy as np
+import pytest
+from pythonutils import uncertainty as unc
+
+
+
+################################## FUNCTIONS ##################################
+def _product(x, y):
+	return x * y
+
+
+
+#################################### TESTS ####################################
+@pytest.mark.parametrize('method, rtol', [('complex', 1e-14), ('central', 1e-7)])
+def test_covarianceMatchesIncoherent(method, rtol):
+	x = unc.IncoherentUncertaintyArray([1.0, 2.0, 3.0], [0.1, 0.1, 0.2])
+	y = unc.IncoherentUncertainty(2, 0.2)
+	result = unc.propagateCovariance(lambda a, b: (a * b, a / b, a * np.exp(b)), [x, y], method=method)
+	assert result.val.shape == (3, 3) and result.cov.shape == (3, 3, 3)
+	for output, expected in zip(result.toIncoherent(), (x * y, x / y, x * unc.IncoherentUncertainty(np.exp(2), np.exp(2) * 0.2))):
+		assert type(output) == unc.IncoherentUncertaintyArray
+		np.testing.assert_allclose(output.val, expected.val, rtol=1e-14)
+		np.testing.assert_allclose(output.unc, expected.unc, rtol=rtol)
+	return
+
+def test_covarianceOfCorrelatedInputs():
+	c = unc.CorrelatedUncertainty(1, 0.1)
+	d = c * 2 + unc.CorrelatedUncertainty(3, 0.2)
+	result = unc.propagateCovariance(lambda a, b: (a - a, b - 2*a), [c, d])
+	np.testing.assert_allclose(result.unc, [0.0, 0.2], atol=1e-15)
+	explicit = unc.propagateCovariance(lambda a, b: a + b, [1.0, 2.0], cov=[[0.01, -0.01], [-0.01, 0.04]])
+	np.testing.assert_allclose(explicit.unc, [np.sqrt(0.03)])
+	with pytest.raises(ValueError):
+		unc.propagateCovariance(lambda a: a, [c], method='forward')
+	return
+
+def test_covarianceOfLinearFunction():
+	x, y = unc.IncoherentUncertainty(1, 0.1), unc.IncoherentUncertainty(2, 0.2)
+	result = unc.propagateCovariance(lambda a, b: (a + b, a - b), [x, y])
+	np.testing.assert_allclose(result.val, [3.0, -1.0])
+	np.testing.assert_allclose(result.jacobian, [[1, 1], [1, -1]])
+	np.testing.assert_allclose(result.cov, [[0.05, -0.03], [-0.03, 0.05]])
+	np.testing.assert_allclose(result.correlation(), [[1.0, -0.6], [-0.6, 1.0]])
+	return
+
+def test_monteCarloArrayInputs():
+	x = unc.IncoherentUncertaintyArray([1.0, 2.0, 3.0], [0.01, 0.02, 0.03])
+	result = unc.monteCarlo(_product, [x, 2.0], nSamples=20000, seed=0)
+	assert np.shape(result.mean) == (3,)
+	assert result.lower is None and result.upper is None # 'auto' skips them for arrays
+	np.testing.assert_allclose(result.mean, [2.0, 4.0, 6.0], rtol=1e-3)
+	np.testing.assert_allclose(result.std, [0.02, 0.04, 0.06], rtol=0.05)
+	return
+
+def test_monteCarloChunksMatchOneChunk():
+	inputs = [unc.IncoherentUncertainty(2.0, 0.1), unc.IncoherentUncertainty(3.0, 0.1)]
+	whole = unc.monteCarlo(_product, inputs, nSamples=40000, seed=1)
+	chunked = unc.monteCarlo(_product, inputs, nSamples=40000, seed=1, chunkSize=999)
+	assert chunked.nSamples == whole.nSamples == 40000
+	assert chunked.mean == pytest.approx(whole.mean, rel=1e-3)
+	assert chunked.std == pytest.approx(whole.std, rel=0.03)
+	return
+
+def test_monteCarloMatchesLinearPropagation():
+	x, y = unc.IncoherentUncertainty(2.0, 0.01), unc.IncoherentUncertainty(3.0, 0.02)
+	result = unc.monteCarlo(_product, [x, y], nSamples=100000, seed=2)
+	assert result.mean == pytest.approx((x*y).val, rel=1e-4)
+	assert result.std == pytest.approx((x*y).unc, rel=0.02)
+	assert result.lower < result.mean < result.upper
+	return
+
+def test_monteCarloSeedIsReproducible():
+	inputs = [unc.IncoherentUncertainty(2.0, 0.1), unc.CoherentUncertainty(3.0, 0.2)]
+	first = unc.monteCarlo(_product, inputs, nSamples=5000, seed=3)
+	second = unc.monteCarlo(_product, inputs, nSamples=5000, seed=3)
+	other = unc.monteCarlo(_product, inputs, nSamples=5000, seed=4)
+	assert (first.mean, first.std, first.lower, first.upper) == (second.mean, second.std, second.lower, second.upper)
+	assert first.mean != other.mean
+	return
@@ -0,0 +1,78 @@
+"""Tests for the reductions of `UncertaintyArray` and `RunningStatistics`."""
+
+
+
+################################### MODULES ###################################
+import functools
+import math
+import numpy as np
+import operator
+import pytest
+from pythonutils import uncertainty as unc
+
+
+
+################################## FUNCTIONS ##################################
+@pytest.fixture
+def measurements():
+	rng = np.random.default_rng(0)
+	return rng.normal(1e6, 3.0, 1000), rng.uniform(0.5, 2.0, 1000)
+
+
+
+#################################### TESTS ####################################
+@pytest.mark.parametrize('arrayType', [unc.CoherentUncertaintyArray, unc.IncoherentUncertaintyArray])
+def test_arrayReductionsMatchMeasurements(measurements, arrayType):
+	val, unc_ = measurements
+	arr = arrayType(val[:50], unc_[:50])
+	total = functools.reduce(operator.add, arr.toMeasurements())
+	assert (arr.sum().val, arr.sum().unc) == pytest.approx((total.val, total.unc))
+	assert (arr.mean().val, arr.mean().unc) == pytest.approx((total.val / 50, total.unc / 50))
+	assert arr.standardError() == pytest.approx(np.std(val[:50], ddof=1) / math.sqrt(50))
+	rows = arrayType(val[:50].reshape(5, 10), unc_[:50].reshape(5, 10)).sum(axis=1)
+	assert isinstance(rows, arrayType)
+	np.testing.assert_allclose(rows.val, val[:50].reshape(5, 10).sum(axis=1))
+	return
+
+def test_chiSquaredAndWeightedMean(measurements):
+	val, unc_ = measurements
+	arr = unc.IncoherentUncertaintyArray(val, unc_)
+	weight = unc_**-2
+	weightedMean = np.sum(weight * val) / np.sum(weight)
+	assert arr.weightedMean().val == pytest.approx(weightedMean, rel=1e-15)
+	assert arr.weightedMean().unc == pytest.approx(1 / math.sqrt(np.sum(weight)))
+	chiSquared, degreesOfFreedom = arr.chiSquared()
+	assert chiSquared == pytest.approx(np.sum(weight * (val - weightedMean)**2))
+	assert degreesOfFreedom == len(val) - 1
+	assert arr.chiSquared(1e6)[1] == len(val)
+	with pytest.raises(ValueError):
+		unc.IncoherentUncertaintyArray([1.0, 2.0], [0.0, 0.1]).weightedMean()
+	return
+
+@pytest.mark.parametrize('uncertaintyType', ['Coherent', 'Incoherent'])
+def test_runningStatisticsMatchesArray(measurements, uncertaintyType):
+	val, unc_ = measurements
+	arr = (unc.CoherentUncertaintyArray if uncertaintyType == 'Coherent' else unc.IncoherentUncertaintyArray)(val, unc_)
+	stats = unc.RunningStatistics(uncertaintyType)
+	for start in range(0, len(val), 137):
+		stats.update(arr[start:start+137])
+	assert stats.count == len(val)
+	for name in ('sum', 'mean', 'weightedMean'):
+		expected, result = getattr(arr, name)(), getattr(stats, name)()
+		assert type(result) == type(expected)
+		assert (result.val, result.unc) == pytest.approx((expected.val, expected.unc), rel=1e-12)
+	assert stats.standardError() == pytest.approx(arr.standardError(), rel=1e-9)
+	assert stats.chiSquared() == pytest.approx(arr.chiSquared(), rel=1e-9)
+	assert stats.chiSquared(1e6) == pytest.approx(arr.chiSquared(1e6), rel=1e-9)
+	return
+
+def test_runningStatisticsWithTooFewMeasurements():
+	stats = unc.RunningStatistics()
+	assert math.isnan(stats.mean().val)
+	assert math.isnan(stats.standardError())
+	with pytest.raises(ValueError):
+		stats.weightedMean()
+	stats.update(unc.IncoherentUncertainty(2.0, 0.1))
+	assert stats.mean().val == 2.0
+	assert math.isnan(stats.standardError())
+	return
@@ -0,0 +1,220 @@
+"""Tests for the `UncertaintyArray` classes of `pythonutils.uncertainty`."""
+
+
+
+################################### MODULES ###################################
+import decimal
+import fractions
+import numpy as np
+import operator
+import pytest
+from pythonutils import uncertainty as unc
+
+
+
+################################## FUNCTIONS ##################################
+def _assertMatchesMeasurements(result, expected):
+	"""Assert that the `UncertaintyArray` `result` holds the measurements
+	`expected`."""
+	assert result.shape == (len(expected),)
+	np.testing.assert_allclose(result.val, [m.val for m in expected], rtol=1e-12)
+	np.testing.assert_allclose(result.unc, [m.unc for m in expected], rtol=1e-12)
+	return
+
+
+
+#################################### TESTS ####################################
+def test_absoluteOfZero():
+	for x in (unc.IncoherentUncertainty(0, 0.1), unc.CoherentUncertainty(0, 0.1)):
+		result = np.abs(x)
+		assert (result.val, result.unc) == (0, 0.1)
+	result = np.abs(unc.CoherentUncertaintyArray([-1.0, 0.0], [0.1, 0.1]))
+	np.testing.assert_array_equal(result.val, [1.0, 0.0])
+	np.testing.assert_array_equal(result.unc, [0.1, 0.1])
+	return
+
+def test_arrayFunctions():
+	a = unc.IncoherentUncertaintyArray([1.0, 2.0], [0.1, 0.2])
+	joined = np.concatenate([a, a])
+	assert type(joined) == unc.IncoherentUncertaintyArray
+	np.testing.assert_array_equal(joined.unc, [0.1, 0.2, 0.1, 0.2])
+	assert np.stack([a, a]).shape == (2, 2)
+	total = np.sum(a)
+	assert (total.val, total.unc) == pytest.approx((3.0, np.hypot(0.1, 0.2)))
+	with pytest.raises(TypeError):
+		np.linalg.inv(np.stack([a, a]))
+	return
+
+@pytest.mark.parametrize('op', [operator.add, operator.sub, operator.mul, operator.truediv, operator.pow])
+@pytest.mark.parametrize('arrayType', [unc.CoherentUncertaintyArray, unc.IncoherentUncertaintyArray])
+def test_arrayOperationsMatchMeasurements(arrayType, op):
+	scalarType = arrayType._scalarType
+	x = arrayType([1.5, 2.0, 3.5], [0.1, 0.2, 0.3])
+	y = arrayType([0.5, 1.2, 2.5], [0.05, 0.1, 0.2])
+	xs, ys = x.toMeasurements(), y.toMeasurements()
+	assert all(type(m) is scalarType for m in xs)
+	_assertMatchesMeasurements(op(x, y), [op(a, b) for (a, b) in zip(xs, ys)])
+	_assertMatchesMeasurements(op(x, 2.5), [op(a, 2.5) for a in xs])
+	_assertMatchesMeasurements(op(2.5, x), [op(2.5, a) for a in xs])
+	_assertMatchesMeasurements(op(x, ys[0]), [op(a, ys[0]) for a in xs])
+	return
+
+@pytest.mark.parametrize('ufunc, op', [(np.add, operator.add), (np.subtract, operator.sub), (np.multiply, operator.mul), (np.true_divide, operator.truediv)])
+def test_binaryUfuncsMatchOperators(ufunc, op):
+	a = unc.IncoherentUncertaintyArray([1.0, 2.0], [0.1, 0.2])
+	b = unc.IncoherentUncertaintyArray([3.0, 5.0], [0.3, 0.1])
+	for x, y in ((a, b), (a, 2.0), (a.toMeasurements()[0], b)):
+		result, expected = ufunc(x, y), op(x, y)
+		np.testing.assert_allclose(result.val, expected.val)
+		np.testing.assert_allclose(result.unc, expected.unc)
+	return
+
+def test_broadcasting():
+	x = unc.IncoherentUncertaintyArray([[1.0], [2.0]], 0.1)
+	y = unc.IncoherentUncertaintyArray([1.0, 2.0, 3.0], 0.2)
+	z = x + y
+	assert z.shape == (2, 3)
+	np.testing.assert_allclose(z.val, [[2.0, 3.0, 4.0], [3.0, 4.0, 5.0]])
+	np.testing.assert_allclose(z.unc, np.full((2, 3), np.hypot(0.1, 0.2)))
+	return
+
+def test_exactDivisionByZero():
+	a = unc.CoherentUncertaintyArray([1, 0], [fractions.Fraction(1, 3), 1], dtype='exact')
+	with pytest.warns(RuntimeWarning):
+		result = a / unc.CoherentUncertaintyArray([0, 1], [0, 0], dtype='exact')
+	assert result.dtype == object
+	assert result.val[0] == np.inf and np.isnan(result.unc[0])
+	assert (result.val[1], result.unc[1]) == (0, 1)
+	return
+
+@pytest.mark.parametrize('op', [operator.add, operator.sub, operator.mul, operator.truediv, lambda x, y: x**2 / y])
+@pytest.mark.parametrize('arrayType', [unc.CoherentUncertaintyArray, unc.IncoherentUncertaintyArray])
+def test_exactMatchesFloat64(arrayType, op):
+	rng = np.random.default_rng(2)
+	a = arrayType(rng.uniform(1, 10, 20), rng.uniform(0, 1, 20))
+	b = arrayType(rng.uniform(1, 10, 20), rng.uniform(0, 1, 20))
+	exact = op(a.astype('exact'), b.astype('exact'))
+	expected = op(a, b)
+	assert exact.dtype == object
+	np.testing.assert_allclose(exact.astype('float64').val, expected.val, rtol=1e-14)
+	np.testing.assert_allclose(exact.astype('float64').unc, expected.unc, rtol=1e-14)
+	return
+
+def test_exactStorageStaysExact():
+	third = fractions.Fraction(1, 3)
+	a = unc.CoherentUncertaintyArray([1, 2], [third, decimal.Decimal('0.1')], dtype='exact')
+	assert a.dtype == object
+	assert list(a.unc) == [third, fractions.Fraction(1, 10)]
+	result = (a / 3 + a * fractions.Fraction(2, 3)) ** 2
+	assert all(type(x) == fractions.Fraction for x in np.concatenate([result.val, result.unc]))
+	assert list(result.val) == [1, 4]
+	assert list(result.unc) == [2 * third, fractions.Fraction(2, 5)]
+	assert type(a.toMeasurements()[0].val) == float
+	assert (a * np.array([1.0, 2.0])).dtype == np.float64 # exactness already lost
+	return
+
+def test_float32Storage():
+	a = unc.IncoherentUncertaintyArray([1.0, 2.0], [0.1, 0.2], dtype=np.float32)
+	assert a.dtype == np.float32 and a.val.dtype == a.unc.dtype == np.float32
+	assert (a * 2.5 + a).dtype == np.float32
+	assert (a * unc.IncoherentUncertainty(2, 0.1)).dtype == np.float32
+	assert (a + unc.IncoherentUncertaintyArray([1.0, 2.0], [0.1, 0.2])).dtype == np.float64
+	assert unc.IncoherentUncertaintyArray.fromMeasurements(a.toMeasurements(), 'float32').dtype == np.float32
+	np.testing.assert_allclose((a * a).unc, (a.astype('float64') * a.astype('float64')).unc, rtol=1e-6)
+	with pytest.raises(ValueError):
+		unc.IncoherentUncertaintyArray([1], [0], dtype='int32')
+	return
+
+def test_fromMeasurementsRoundTrip():
+	measurements = [unc.CoherentUncertainty(1.0, 0.1), unc.CoherentUncertainty(2.0, 0.3)]
+	x = unc.UncertaintyArray.fromMeasurements(measurements)
+	assert isinstance(x, unc.CoherentUncertaintyArray)
+	assert [(m.val, m.unc) for m in x.toMeasurements()] == [(1.0, 0.1), (2.0, 0.3)]
+	return
+
+def test_inPlaceKeepsDtype():
+	a = unc.IncoherentUncertaintyArray([1.0, 2.0], [0.1, 0.2], dtype=np.float32)
+	a += unc.IncoherentUncertaintyArray([1.0, 2.0], [0.1, 0.2])
+	assert a.dtype == np.float32
+	exact = unc.IncoherentUncertaintyArray([1, 2], [0, 0], dtype='exact')
+	exact *= 3
+	assert exact.dtype == object and list(exact.val) == [3, 6]
+	return
+
+@pytest.mark.parametrize('op, inplace', [
+	(operator.add, operator.iadd), (operator.sub, operator.isub), (operator.mul, operator.imul),
+	(operator.truediv, operator.itruediv), (operator.pow, operator.ipow),
+])
+@pytest.mark.parametrize('arrayType', [unc.CoherentUncertaintyArray, unc.IncoherentUncertaintyArray])
+def test_inPlaceMatchesOutOfPlace(arrayType, op, inplace):
+	for other in (arrayType([2.0, 3.0, 4.0], [0.2, 0.1, 0.3]), arrayType._scalarType(2, 0.1), 2, np.array([1.0, 2.0, 3.0])):
+		a = arrayType([1.5, 2.0, 3.0], [0.1, 0.2, 0.1])
+		val, original = a.val, a.copy()
+		result = inplace(a, other)
+		expected = op(original, other)
+		assert result is a and a.val is val # updated in place
+		np.testing.assert_allclose(a.val, expected.val)
+		np.testing.assert_allclose(a.unc, expected.unc)
+	return
+
+def test_inPlaceUpdatesViews():
+	a = unc.IncoherentUncertaintyArray([1.0, 2.0, 3.0], [0.1, 0.2, 0.3])
+	view = a[:2]
+	view += 1
+	np.testing.assert_array_equal(a.val, [2.0, 3.0, 3.0])
+	np.testing.assert_array_equal(a.unc, [0.1, 0.2, 0.3])
+	return
+
+@pytest.mark.parametrize('arrayType', [unc.CoherentUncertaintyArray, unc.IncoherentUncertaintyArray])
+def test_inPlaceWithItself(arrayType):
+	for op, inplace in ((operator.add, operator.iadd), (operator.mul, operator.imul), (operator.truediv, operator.itruediv)):
+		a = arrayType([1.0, 2.0], [0.1, 0.2])
+		expected = op(a.copy(), a.copy())
+		inplace(a, a)
+		np.testing.assert_allclose(a.val, expected.val)
+		np.testing.assert_allclose(a.unc, expected.unc)
+	a = arrayType([1.0, 2.0, 3.0], [0.1, 0.2, 0.3])
+	expected = a[1:] * a[:-1]
+	view = a[1:]
+	view *= a[:-1] # overlapping operands
+	np.testing.assert_allclose(a.val[1:], expected.val)
+	np.testing.assert_allclose(a.unc[1:], expected.unc)
+	return
+
+def test_indexing():
+	x = unc.IncoherentUncertaintyArray([1.0, 2.0, 3.0], [0.1, 0.2, 0.3])
+	m = x[1]
+	assert isinstance(m, unc.IncoherentUncertainty)
+	assert (m.val, m.unc) == (2.0, 0.2)
+	assert isinstance(x[1:], unc.IncoherentUncertaintyArray)
+	np.testing.assert_array_equal(x[1:].unc, [0.2, 0.3])
+	return
+
+def test_objectArraysOfMeasurements():
+	m = unc.IncoherentUncertainty(2.0, 0.1)
+	column = np.array([m, unc.IncoherentUncertainty(3.0, 0.2)], dtype=object)
+	for result in (column * m, np.multiply(column, m), np.add(column, m)):
+		assert result.dtype == object
+		assert all(isinstance(x, unc.IncoherentUncertainty) for x in result)
+	assert (column * m)[1].val == pytest.approx(6.0)
+	return
+
+@pytest.mark.parametrize('ufunc, derivative', [
+	(np.sqrt, lambda x: 0.5 / np.sqrt(x)),
+	(np.exp, np.exp),
+	(np.log, lambda x: 1 / x),
+	(np.sin, np.cos),
+	(np.square, lambda x: 2 * x),
+])
+@pytest.mark.parametrize('arrayType', [unc.CoherentUncertaintyArray, unc.IncoherentUncertaintyArray])
+def test_unaryUfuncsMatchScalars(arrayType, ufunc, derivative):
+	arr = arrayType([0.5, 1.0, 2.0], [0.01, 0.02, 0.05])
+	result = ufunc(arr)
+	assert type(result) == arrayType
+	np.testing.assert_allclose(result.val, ufunc(arr.val))
+	np.testing.assert_allclose(result.unc, np.abs(derivative(arr.val)) * arr.unc)
+	for x, r in zip(arr.toMeasurements(), result.toMeasurements()):
+		scalar = ufunc(x)
+		assert type(scalar) == arrayType._scalarType
+		assert (scalar.val, scalar.unc) == pytest.approx((r.val, r.unc))
+	return
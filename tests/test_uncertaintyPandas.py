@@ -0,0 +1,92 @@
+"""Tests for `pythonutils.uncertaintyPandas`."""
+
+
+
+################################### MODULES ###################################
+import functools
+import numpy as np
+import operator
+import pandas as pd
+import pytest
+from pythonutils import uncertaintyPandas as uncpd
+from pythonutils import uncertainty as unc
+
+
+
+################################## FUNCTIONS ##################################
+def _assertSameMeasurement(result, expected):
+	"""Assert that the measurements `result` and `expected` are equal (to
+	rounding)."""
+	assert type(result) is type(expected)
+	assert result.val == pytest.approx(expected.val, rel=1e-12)
+	assert result.unc == pytest.approx(expected.unc, rel=1e-12)
+	return
+
+@pytest.fixture
+def frame():
+	"""A DataFrame with a group column and an Incoherent measurement
+	column."""
+	x = unc.IncoherentUncertaintyArray([1.0, 2.0, 4.0, 8.0], [0.1, 0.2, 0.3, 0.4])
+	return pd.DataFrame({'g': ['a', 'a', 'b', 'b'], 'x': pd.Series(uncpd.MeasurementArray(x))})
+
+
+
+#################################### TESTS ####################################
+def test_concatKeepsDtype(frame):
+	result = pd.concat([frame['x'], frame['x']], ignore_index=True)
+	assert result.dtype == frame['x'].dtype
+	np.testing.assert_array_equal(result.array.val, np.tile(frame['x'].array.val, 2))
+	np.testing.assert_array_equal(result.array.unc, np.tile(frame['x'].array.unc, 2))
+	return
+
+def test_dtypeStrings():
+	assert pd.api.types.pandas_dtype('measurement[coherent]') == uncpd.MeasurementDtype('Coherent')
+	series = pd.Series(uncpd.MeasurementArray(unc.CoherentUncertaintyArray([1.0], [0.1])))
+	assert str(series.dtype) == 'measurement[coherent]'
+	return
+
+def test_formatWithPrefixes(frame):
+	expected = [x.reprWithPrefix() for x in frame['x']]
+	assert list(uncpd.formatWithPrefixes(frame['x'])) == expected
+	objectColumn = pd.Series(list(frame['x']), dtype=object, name='x')
+	formatted = uncpd.formatWithPrefixes(objectColumn, 'm')
+	assert formatted.name == 'x'
+	assert list(formatted) == [x.reprWithPrefix('m') for x in frame['x']]
+	return
+
+def test_groupbySumPropagates(frame):
+	result = frame.groupby('g')['x'].sum()
+	measurements = list(frame['x'])
+	_assertSameMeasurement(result['a'], measurements[0] + measurements[1])
+	_assertSameMeasurement(result['b'], measurements[2] + measurements[3])
+	return
+
+def test_loadWithExtensionDtype(tmp_path):
+	path = tmp_path / 'data.csv'
+	path.write_text('id,x,m\n1,1.0,0.1\n2,2.0,0.2\n')
+	df, _ = unc.FileHandler.load(str(path), 1, extensionDtype=True)
+	assert isinstance(df['x'].dtype, uncpd.MeasurementDtype)
+	np.testing.assert_allclose(df['x'].array.val, [1e-3, 2e-3])
+	return
+
+@pytest.mark.parametrize('ddof', [0, 1])
+def test_stdAndVarMatchValues(frame, ddof):
+	values = pd.Series(frame['x'].array.val, index=frame.index)
+	assert frame['x'].std(ddof=ddof) == pytest.approx(values.std(ddof=ddof))
+	assert frame['x'].var(ddof=ddof) == pytest.approx(values.var(ddof=ddof))
+	grouped = frame.groupby('g')['x'].std(ddof=ddof)
+	np.testing.assert_allclose(grouped, values.groupby(frame['g']).std(ddof=ddof))
+	return
+
+def test_sumPropagates(frame):
+	_assertSameMeasurement(frame['x'].sum(), functools.reduce(operator.add, list(frame['x'])))
+	return
+
+def test_toMeasurementColumns():
+	measurements = [unc.CoherentUncertainty(1.0, 0.1), unc.CoherentUncertainty(2.0, 0.2)]
+	df = pd.DataFrame({'id': [1, 2], 'x': pd.Series(measurements, dtype=object)})
+	result = uncpd.toMeasurementColumns(df)
+	assert str(result['x'].dtype) == 'measurement[coherent]'
+	assert result['id'].dtype == df['id'].dtype
+	assert [(m.val, m.unc) for m in result['x']] == [(1.0, 0.1), (2.0, 0.2)]
+	return